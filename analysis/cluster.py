@@ -0,0 +1,121 @@
+import re
+import zlib
+from itertools import chain
+from typing import Dict, List, Set, Tuple
+
+_NON_WORD = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def char_shingles(text: str, n: int = 3) -> Set[int]:
+    """
+    공백/문장부호를 없앤 뒤 문자 n-gram 을 crc32 로 해싱.
+    한국어 제목은 띄어쓰기/조사 차이가 커서 단어보다 문자 n-gram 이 잘 맞는다.
+    """
+    s = _NON_WORD.sub("", (text or "").lower())
+    if not s:
+        return set()
+    if len(s) <= n:
+        return {zlib.crc32(s.encode("utf-8"))}
+    return {zlib.crc32(s[i:i + n].encode("utf-8")) for i in range(len(s) - n + 1)}
+
+
+class MinHashLSH:
+    """
+    MinHash 시그니처 + 밴딩 LSH.
+    bands * rows 개의 해시 함수(multiply-shift, uint64 wrap-around)를 쓰며,
+    대략 (1 / bands) ** (1 / rows) 이상의 자카드 유사도부터 후보로 잡힌다.
+    시그니처는 여러 텍스트를 묶어 numpy 로 한 번에 계산한다.
+    """
+    def __init__(self, bands: int = 8, rows: int = 4, seed: int = 1):
+        import numpy as np  # 무거운 import 는 실제로 묶을 때만
+
+        rng = np.random.default_rng(seed)
+        k = bands * rows
+        self.bands = bands
+        self.rows = rows
+        self._a = rng.integers(1, 2 ** 63, size=k, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=k, dtype=np.uint64)
+
+    def signatures(self, shingle_sets: List[Set[int]], chunk: int = 4096) -> List[bytes | None]:
+        """텍스트별 시그니처(bytes). 빈 텍스트는 None."""
+        import numpy as np
+
+        out: List[bytes | None] = []
+        for start in range(0, len(shingle_sets), chunk):
+            part = shingle_sets[start:start + chunk]
+            lens = np.fromiter((len(s) for s in part), dtype=np.int64, count=len(part))
+            total = int(lens.sum())
+            if total == 0:
+                out.extend([None] * len(part))
+                continue
+            flat = np.fromiter(chain.from_iterable(part), dtype=np.uint64, count=total)
+            with np.errstate(over="ignore"):
+                hv = (flat[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+            nz = lens > 0
+            offsets = np.concatenate(([0], np.cumsum(lens)[:-1]))[nz]
+            sig = np.minimum.reduceat(hv, offsets, axis=0).astype(np.uint32)
+            rows = iter(sig)
+            out.extend(next(rows).tobytes() if ok else None for ok in nz)
+        return out
+
+    def band_keys(self, sig: bytes) -> List[Tuple[int, bytes]]:
+        w = self.rows * 4
+        return [(i, sig[i * w:(i + 1) * w]) for i in range(self.bands)]
+
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def cluster_near_duplicates(
+    texts: List[str],
+    threshold: float = 0.6,
+    bands: int = 8,
+    rows: int = 4,
+    max_bucket_checks: int = 20,
+) -> List[int]:
+    """
+    texts[i] 마다 소속 클러스터 대표 인덱스를 돌려준다(대표 = 클러스터에서 가장 앞선 인덱스).
+    LSH 버킷에서 나온 후보만 실제 자카드로 확인하므로 전체 쌍 비교 없이 거의 선형.
+    """
+    lsh = MinHashLSH(bands=bands, rows=rows)
+    parent = list(range(len(texts)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: int, b: int) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            if ra < rb:
+                parent[rb] = ra
+            else:
+                parent[ra] = rb
+
+    shingles = [char_shingles(t) for t in texts]
+    sigs = lsh.signatures(shingles)
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    for i, sh in enumerate(shingles):
+        sig = sigs[i]
+        if sig is None:
+            continue
+        checked: Set[int] = set()
+        for key in lsh.band_keys(sig):
+            members = buckets.setdefault(key, [])
+            for j in members[:max_bucket_checks]:
+                rj = find(j)
+                if rj in checked or rj == find(i):
+                    continue
+                checked.add(rj)
+                if _jaccard(sh, shingles[j]) >= threshold:
+                    union(i, j)
+            members.append(i)
+
+    return [find(i) for i in range(len(texts))]
@@ -0,0 +1,226 @@
+"""
+컬럼 기반(NumPy) 스코어링.
+문서 배치를 한 번만 훑어 (phrase id, 소스 id, 카테고리 id, raw 점수, kind, value, 경과 시간) 배열로 만든 뒤
+소스 가중치 / 트렌드 보너스 / 최신성 감쇠를 벡터 연산으로 계산하고 phrase id 별로 합산한다.
+점수 식과 합산/evidence/묶기 순서는 scorer.stream_top_issues 와 같다. 감쇠를 켜면 감쇠 기준 시각(now)이
+호출마다 달라 점수가 조금씩 다르므로, 두 경로를 비교할 때는 같은 now 를 넘긴다.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from sources.base import SignalDoc
+from .taxonomy import classify
+from .normalize import normalize_kw
+from .scorer import IssueItem, NEGATIVE_PHRASES, merge_near_duplicates, phrase_text
+
+NAVER_SOURCES = ("naver_cafearticle", "naver_blog", "naver_news")
+
+KIND_NONE, KIND_TOP, KIND_RISING = 0, 1, 2
+_KIND_CODES = {"top": KIND_TOP, "rising": KIND_RISING}
+
+
+@dataclass
+class DocBatch:
+    # 문서 단위 컬럼
+    phrase_id: np.ndarray
+    source_id: np.ndarray
+    cat_id: np.ndarray
+    raw: np.ndarray
+    kind: np.ndarray
+    value: np.ndarray      # 숫자 아니면 NaN
+    age_hours: np.ndarray  # published_at 없으면 NaN
+    evidence: List[str]
+    # 사전(id → 값)
+    phrases: List[str] = field(default_factory=list)
+    phrase_cat: List[int] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.evidence)
+
+
+def to_batch(
+    docs: Iterable[SignalDoc], now: Optional[float] = None, phrase_of: Optional[Callable[[str], str]] = None,
+) -> DocBatch:
+    """SignalDoc 들을 컬럼 배열로 변환. 빈/부정 phrase 문서는 여기서 빠진다. phrase_of 는 scorer.score_doc 과 같다."""
+    now = time.time() if now is None else now
+
+    phrase_ids: Dict[str, int] = {}
+    source_ids: Dict[str, int] = {}
+    cat_ids: Dict[str, int] = {}
+    phrase_cat: List[int] = []
+
+    pid, sid, cid, raw, kind, value, age, evidence = [], [], [], [], [], [], [], []
+
+    for d in docs:
+        text = normalize_kw(phrase_text(d))
+        if not text or any(n in text for n in NEGATIVE_PHRASES):
+            continue
+
+        # 카테고리/raw 는 문서 제목 기준, 이슈 키만 phrase_of 로 (같은 키에 다른 제목이 모일 수 있음)
+        cat, r = classify(text)
+        c = cat_ids.setdefault(cat, len(cat_ids))
+        key = phrase_of(text) if phrase_of is not None else text
+        p = phrase_ids.get(key)
+        if p is None:
+            p = phrase_ids[key] = len(phrase_ids)
+            phrase_cat.append(c)
+
+        s = source_ids.setdefault(d.source, len(source_ids))
+
+        k, v = KIND_NONE, np.nan
+        if d.source == "google_trends":
+            k = _KIND_CODES.get(d.meta.get("kind"), KIND_NONE)
+            mv = d.meta.get("value")
+            if isinstance(mv, (int, float)):
+                v = float(mv)
+
+        a = np.nan
+        if d.published_at is not None:
+            a = (now - d.published_at.timestamp()) / 3600.0
+
+        pid.append(p)
+        sid.append(s)
+        cid.append(c)
+        raw.append(r)
+        kind.append(k)
+        value.append(v)
+        age.append(a)
+        evidence.append(d.url or d.title)
+
+    return DocBatch(
+        phrase_id=np.asarray(pid, dtype=np.int64),
+        source_id=np.asarray(sid, dtype=np.int32),
+        cat_id=np.asarray(cid, dtype=np.int32),
+        raw=np.asarray(raw, dtype=np.float64),
+        kind=np.asarray(kind, dtype=np.int8),
+        value=np.asarray(value, dtype=np.float64),
+        age_hours=np.asarray(age, dtype=np.float64),
+        evidence=evidence,
+        phrases=list(phrase_ids),
+        phrase_cat=phrase_cat,
+        sources=list(source_ids),
+        categories=list(cat_ids),
+    )
+
+
+def score_batch(
+    batch: DocBatch,
+    taxonomy_boost: Dict[str, float],
+    source_weights: Dict[str, float],
+    half_life_hours: Optional[float] = None,
+) -> np.ndarray:
+    """문서별 점수 벡터."""
+    if len(batch) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    boost_tbl = np.array([taxonomy_boost.get(c, 1.0) for c in batch.categories], dtype=np.float64)
+    sw_tbl = np.array([source_weights.get(s, 1.0) for s in batch.sources], dtype=np.float64)
+    is_trends_tbl = np.array([s == "google_trends" for s in batch.sources])
+    is_naver_tbl = np.array([s in NAVER_SOURCES for s in batch.sources])
+
+    is_trends = is_trends_tbl[batch.source_id]
+
+    bonus = np.ones(len(batch), dtype=np.float64)
+    bonus = np.where(is_trends & (batch.kind == KIND_RISING), bonus * 1.35, bonus)
+    bonus = np.where(is_trends & (batch.kind == KIND_TOP), bonus * 1.05, bonus)
+    has_val = is_trends & ~np.isnan(batch.value)
+    val_factor = 1.0 + np.minimum(np.nan_to_num(batch.value), 100.0) / 600.0
+    bonus = np.where(has_val, bonus * val_factor, bonus)
+    bonus = np.where(is_naver_tbl[batch.source_id], bonus * 1.10, bonus)
+
+    raw_eff = np.where(batch.raw > 0, batch.raw, 0.6)
+    scores = raw_eff * boost_tbl[batch.cat_id] * sw_tbl[batch.source_id] * bonus
+
+    if half_life_hours:
+        age = np.clip(np.nan_to_num(batch.age_hours, nan=0.0), 0.0, None)
+        scores = scores * np.exp2(-age / half_life_hours)
+
+    return scores
+
+
+def build_issues_columnar(
+    docs: Iterable[SignalDoc],
+    taxonomy_boost: Dict[str, float],
+    source_weights: Dict[str, float],
+    half_life_hours: Optional[float] = None,
+    top_k: Optional[int] = None,
+    evidence_cap: Optional[int] = 20,
+    near_dup_threshold: Optional[float] = None,
+    now: Optional[float] = None,
+    phrase_of: Optional[Callable[[str], str]] = None,
+    carry: Optional[Iterable[Tuple[str, str, float, str]]] = None,
+) -> List[IssueItem]:
+    """carry(누적 상태의 예전 기여)는 이번 문서들 뒤에 더한다 (scorer.stream_top_issues 와 같은 순서)."""
+    batch = to_batch(docs, now=now, phrase_of=phrase_of)
+    carry = list(carry or ())
+    if len(batch) == 0 and not carry:
+        return []
+
+    scores = score_batch(batch, taxonomy_boost, source_weights, half_life_hours)
+    phrase_id, doc_evidence = batch.phrase_id, batch.evidence
+    if carry:
+        pid_of = {ph: i for i, ph in enumerate(batch.phrases)}
+        cid_of = {c: i for i, c in enumerate(batch.categories)}
+        extra_pid, extra_score = [], []
+        doc_evidence = list(doc_evidence)
+        for text, cat, base, ev in carry:
+            key = phrase_of(text) if phrase_of is not None else text
+            p = pid_of.get(key)
+            if p is None:
+                c = cid_of.get(cat)
+                if c is None:
+                    c = cid_of[cat] = len(batch.categories)
+                    batch.categories.append(cat)
+                p = pid_of[key] = len(batch.phrases)
+                batch.phrases.append(key)
+                batch.phrase_cat.append(c)
+            extra_pid.append(p)
+            extra_score.append(base * taxonomy_boost.get(cat, 1.0))
+            doc_evidence.append(ev)
+        phrase_id = np.concatenate([phrase_id, np.asarray(extra_pid, dtype=np.int64)])
+        scores = np.concatenate([scores, np.asarray(extra_score, dtype=np.float64)])
+
+    totals = np.bincount(phrase_id, weights=scores, minlength=len(batch.phrases))
+
+    if near_dup_threshold is None:
+        # 점수 내림차순, 동점이면 먼저 나온 phrase 먼저 (scorer 와 같은 순서)
+        order = np.lexsort((np.arange(len(totals)), -totals))
+        if top_k is not None:
+            order = order[:top_k]
+    else:
+        # 묶기 결과가 입력 순서에 따라 달라지므로 scorer 처럼 첫 등장 순서로 넘긴다
+        order = np.arange(len(totals))
+
+    # 선택된 phrase 의 evidence 만 문서 순서대로 모은다
+    wanted = np.zeros(len(totals), dtype=bool)
+    wanted[order] = True
+    evidence: Dict[int, Dict[str, None]] = {int(p): {} for p in order}
+    for i in np.flatnonzero(wanted[phrase_id]):
+        ev = doc_evidence[i]
+        bucket = evidence[int(phrase_id[i])]
+        if ev and (evidence_cap is None or len(bucket) < evidence_cap):
+            bucket[ev] = None
+
+    issues = [
+        IssueItem(
+            phrase=batch.phrases[p],
+            category=batch.categories[batch.phrase_cat[p]],
+            score=float(totals[p]),
+            evidence=list(evidence[p]),
+        )
+        for p in (int(x) for x in order)
+    ]
+
+    if near_dup_threshold is not None:
+        issues = merge_near_duplicates(issues, threshold=near_dup_threshold, evidence_cap=evidence_cap)
+        issues.sort(key=lambda x: x.score, reverse=True)
+        if top_k is not None:
+            issues = issues[:top_k]
+    return issues
@@ -0,0 +1,227 @@
+"""
+수집 ~ 스코어링 사이 문서 중복 제거.
+- URL 정규화: 트래킹 파라미터/프래그먼트 제거, 모바일 호스트 → 데스크톱, 네이버 리다이렉트/뷰어 형태 통일
+- 같은 기사/글이 Naver news(link/originallink), 여러 RSS 피드, 여러 쿼리 결과로 들어오면 하나만 남기고
+  남긴 문서 meta 에 어느 소스들에서 왔는지(dup_sources) 기록
+- 제목 지문은 뉴스형 소스(TITLE_KEY_SOURCES)에만: 카페/블로그는 같은 제목이어도 서로 다른 글(같은 고민의 반복)이라
+  빈도 신호이므로 URL 이 같을 때만 묶는다
+- 키(정규화 URL, 제목 지문)는 8바이트 해시로 SQLite 인덱스에 남겨 다음 실행에서 '이미 본 문서'를 싸게 판별
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit
+
+from sources.base import SignalDoc
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "referer", "share", "trackingcode", "cmpid", "nclick", "ntype",
+}
+_MOBILE_PREFIXES = ("m.", "mobile.", "amp.")
+
+# 네이버 뉴스 기사: n.news.naver.com/mnews/article/001/0012345678 , news.naver.com/main/read.naver?oid=001&aid=...
+_NAVER_NEWS_PATH = re.compile(r"^/(?:mnews/)?article/(\d+)/(\d+)")
+# 블로그: blog.naver.com/{id}/{logNo}
+_NAVER_BLOG_PATH = re.compile(r"^/([^/]+)/(\d+)$")
+
+_SLASHES = re.compile(r"/{2,}")
+_TITLE_JUNK = re.compile(r"[\W_]+", re.UNICODE)
+MIN_TITLE_FP_LEN = 15
+# 같은 기사가 다른 URL 로 퍼지는(신디케이션/여러 피드) 소스만 제목 지문으로 묶는다
+TITLE_KEY_SOURCES = frozenset({"naver_news", "rss_news"})  # 이보다 짧은 제목은 지문으로 묶지 않는다(일반적인 짧은 제목 오탐 방지)
+
+
+def canonical_url(url: str) -> str:
+    """스킴 없는 'host/path?정렬된쿼리' 형태. 빈 문자열이면 빈 문자열."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url if "://" in url else "http://" + url)
+    except ValueError:
+        return url
+    host = (parts.hostname or "").lower()
+    for p in _MOBILE_PREFIXES:
+        if host.startswith(p):
+            host = host[len(p):]
+            break
+    if host.startswith("www."):
+        host = host[4:]
+    path = _SLASHES.sub("/", parts.path or "/")
+    # 원문 'k=v' 조각 그대로 정렬 (디코드/재인코딩 없이)
+    params = []
+    for kv in parts.query.split("&") if parts.query else ():
+        k, _, v = kv.partition("=")
+        kl = k.lower()
+        if v and not kl.startswith("utm_") and kl not in TRACKING_PARAMS:
+            params.append((k, v))
+    q = dict(params)
+
+    # 네이버 형태 통일
+    if host.endswith("news.naver.com"):
+        m = _NAVER_NEWS_PATH.match(path)
+        if m:
+            return f"news.naver.com/article/{m.group(1)}/{m.group(2)}"
+        if "oid" in q and "aid" in q:
+            return f"news.naver.com/article/{q['oid']}/{q['aid']}"
+    if host == "blog.naver.com":
+        if "blogId" in q and "logNo" in q:
+            return f"blog.naver.com/{q['blogId']}/{q['logNo']}"
+        m = _NAVER_BLOG_PATH.match(path)
+        if m:
+            return f"blog.naver.com/{m.group(1)}/{m.group(2)}"
+    if host == "cafe.naver.com" and "articleid" in {k.lower() for k in q}:
+        q = {k.lower(): v for k, v in q.items()}
+        club = q.get("clubid", "")
+        return f"cafe.naver.com/{club}/{q['articleid']}"
+
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = "&".join(f"{k}={v}" for k, v in sorted(params))
+    return host + path + ("?" + query if query else "")
+
+
+def title_fingerprint(title: str) -> str:
+    """구두점/공백/대소문자 무시한 제목. 너무 짧으면 빈 문자열."""
+    t = _TITLE_JUNK.sub("", (title or "").lower())
+    return t if len(t) >= MIN_TITLE_FP_LEN else ""
+
+
+def _h64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def doc_keys(d: SignalDoc) -> List[int]:
+    """문서의 중복 판별 키(해시). URL 없는 문서(Trends 키워드 등)는 키 없음. 제목 지문은 뉴스형 소스만."""
+    if not d.url:
+        return []
+    keys = [_h64("u:" + canonical_url(d.url))]
+    orig = d.meta.get("originallink")
+    if orig:
+        keys.append(_h64("u:" + canonical_url(orig)))
+    fp = title_fingerprint(d.title) if d.source in TITLE_KEY_SOURCES else ""
+    if fp:
+        keys.append(_h64("t:" + fp))
+    return keys
+
+
+class DedupIndex:
+    """문서 키 해시 → (처음/마지막 본 시각). 실행 간 '이미 본 문서' 판별용."""
+    def __init__(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS doc_index ("
+                " h INTEGER PRIMARY KEY,"
+                " first_seen REAL NOT NULL,"
+                " last_seen REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def seen(self, hashes: Iterable[int]) -> Set[int]:
+        hs = list(set(hashes))
+        out: Set[int] = set()
+        with self._lock:
+            for i in range(0, len(hs), 500):
+                chunk = hs[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT h FROM doc_index WHERE h IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                out.update(r[0] for r in rows)
+        return out
+
+    def touch(self, hashes: Iterable[int]) -> None:
+        now = time.time()
+        rows = [(h, now, now) for h in set(hashes)]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO doc_index (h, first_seen, last_seen) VALUES (?, ?, ?)"
+                " ON CONFLICT(h) DO UPDATE SET last_seen=excluded.last_seen",
+                rows,
+            )
+            self._conn.commit()
+
+    def purge(self, older_than_s: float) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM doc_index WHERE last_seen<?", (time.time() - older_than_s,))
+            self._conn.commit()
+            return cur.rowcount
+
+
+def dedup_docs(
+    docs: List[SignalDoc],
+    source_weights: Optional[Dict[str, float]] = None,
+    index: Optional[DedupIndex] = None,
+    skip_seen: bool = False,
+) -> List[SignalDoc]:
+    """
+    키를 하나라도 공유하는 문서들을 한 그룹으로 묶어 하나만 남긴다(원래 순서 유지).
+    - 대표는 소스 가중치가 가장 큰 문서(같으면 먼저 들어온 문서)
+    - 묶인 게 있으면 대표의 사본에 meta.dup_sources(소스 목록), dup_count 추가 (입력 문서는 고치지 않는다)
+    - 대표가 아닌 증분 소스 엔트리(meta.entry)는 dup_entries 로 남겨 누적 상태가 대표의 기여를 그 키로도 보관하게
+    - index 가 있으면 키를 기록하고, skip_seen 이면 이전 실행에서 이미 본 그룹은 버린다
+    """
+    sw = source_weights or {}
+    parent: List[int] = list(range(len(docs)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[int, int] = {}
+    keys_of: List[List[int]] = []
+    for i, d in enumerate(docs):
+        ks = doc_keys(d)
+        keys_of.append(ks)
+        for k in ks:
+            j = owner.setdefault(k, i)
+            if j != i:
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(docs)):
+        groups.setdefault(find(i), []).append(i)
+
+    seen: Set[int] = set()
+    if index is not None:
+        all_keys = [k for ks in keys_of for k in ks]
+        if skip_seen:
+            seen = index.seen(all_keys)
+        index.touch(all_keys)
+
+    out: List[SignalDoc] = []
+    for root in sorted(groups):
+        members = groups[root]
+        if seen and any(k in seen for i in members for k in keys_of[i]):
+            continue
+        best = max(members, key=lambda i: (sw.get(docs[i].source, 1.0), -i))
+        rep = docs[best]
+        if len(members) > 1:
+            meta = dict(rep.meta)
+            meta["dup_sources"] = tuple(dict.fromkeys(docs[i].source for i in members))
+            meta["dup_count"] = len(members)
+            own = rep.meta.get("entry")
+            entries = tuple(dict.fromkeys(
+                e for e in (docs[i].meta.get("entry") for i in members) if e is not None and e != own
+            ))
+            if entries:
+                meta["dup_entries"] = entries
+            rep = rep.with_meta(meta)
+        out.append(rep)
+    return out
@@ -0,0 +1,187 @@
+"""
+이슈 히스토리: 실행마다 (프로필, phrase, category, score, 순위) 스냅샷을 SQLite 에 append 하고
+슬라이딩 윈도로 상승/하락 속도(velocity)와 신규 여부(novelty)를 계산한다.
+
+- 하루에 여러 번 돌면 (phrase, 일) 단위 최고 점수를 그 날의 값으로 본다
+- 최근 window_days 의 일평균 vs 그 이전 window_days 의 일평균 비율이 velocity
+- 직전 윈도에 없던 phrase 는 비율을 매기지 않는다(velocity 0): 처음 보면 new, 예전에 본 적 있으면 returning
+- (프로필, phrase, day) / (프로필, day) 인덱스로 1년치 × 여러 프로필도 윈도 조회만 읽는다
+- 히스토리가 직전 윈도 시작일까지 거슬러 올라가지 못하면(쌓기 시작한 지 2 윈도 미만) 비교할 기준이 없으므로
+  신규/상승/하락 표시 없이 steady 로 둔다
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from .scorer import IssueItem
+
+RISING, FALLING, NEW, RETURNING, STEADY = "rising", "falling", "new", "returning", "steady"
+# 리포트에 올리는 상태와 그 순서(신규 → 상승(velocity 순) → 재등장)
+EMERGING = (NEW, RISING, RETURNING)
+
+
+@dataclass
+class IssueTrend:
+    phrase: str
+    current: float         # 최근 윈도 일평균 점수
+    previous: float        # 직전 윈도 일평균 점수
+    velocity: float        # current / previous (직전 윈도에 없으면 0: 비율 없음)
+    first_seen: str        # YYYY-MM-DD
+    days_seen: int         # 최근 윈도에 등장한 일 수
+    status: str            # rising | falling | new | returning | steady
+
+
+def emerging_key(t: IssueTrend) -> tuple:
+    """EMERGING 상태 정렬 키(오름차순): 상태 순서, 그 안에서 velocity → 현재 점수 큰 순."""
+    return EMERGING.index(t.status), -t.velocity, -t.current
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+
+
+class IssueHistory:
+    def __init__(self, path: str, rising_ratio: float = 1.5, falling_ratio: float = 0.67):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.path = path
+        self.rising_ratio = rising_ratio
+        self.falling_ratio = falling_ratio
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS issue_runs ("
+                " run_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " profile TEXT NOT NULL,"
+                " ts REAL NOT NULL,"
+                " day TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS issue_snapshots ("
+                " run_id INTEGER NOT NULL,"
+                " profile TEXT NOT NULL,"
+                " day TEXT NOT NULL,"
+                " phrase TEXT NOT NULL,"
+                " category TEXT NOT NULL,"
+                " score REAL NOT NULL,"
+                " rank INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS ix_snap_phrase ON issue_snapshots (profile, phrase, day);"
+                "CREATE INDEX IF NOT EXISTS ix_snap_day ON issue_snapshots (profile, day);"
+            )
+            self._conn.commit()
+
+    def record(self, profile: str, issues: Iterable[IssueItem], ts: Optional[float] = None) -> int:
+        """실행 1회의 랭킹을 추가한다(append-only). run_id 반환."""
+        ts = time.time() if ts is None else ts
+        day = _day(ts)
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO issue_runs (profile, ts, day) VALUES (?, ?, ?)", (profile, ts, day)
+            )
+            run_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO issue_snapshots (run_id, profile, day, phrase, category, score, rank)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, profile, day, it.phrase, it.category, it.score, i)
+                 for i, it in enumerate(issues, 1)],
+            )
+            self._conn.commit()
+        return run_id
+
+    def trends(
+        self,
+        profile: str,
+        phrases: Optional[Iterable[str]] = None,
+        window_days: int = 7,
+        now: Optional[float] = None,
+    ) -> Dict[str, IssueTrend]:
+        """
+        phrase 별 velocity/novelty. phrases 를 주면 그 phrase 만, 없으면 최근 윈도에 등장한 전부.
+        """
+        now = time.time() if now is None else now
+        today = datetime.fromtimestamp(now)
+        cur_start = (today - timedelta(days=window_days - 1)).strftime("%Y-%m-%d")
+        prev_start = (today - timedelta(days=2 * window_days - 1)).strftime("%Y-%m-%d")
+        end = today.strftime("%Y-%m-%d")
+
+        with self._lock:
+            self._conn.execute("DROP TABLE IF EXISTS temp._want")
+            if phrases is not None:
+                self._conn.execute("CREATE TEMP TABLE _want (phrase TEXT PRIMARY KEY)")
+                self._conn.executemany("INSERT OR IGNORE INTO temp._want VALUES (?)",
+                                       [(p,) for p in phrases])
+            else:
+                self._conn.execute(
+                    "CREATE TEMP TABLE _want AS SELECT DISTINCT phrase FROM issue_snapshots"
+                    " WHERE profile=? AND day BETWEEN ? AND ?", (profile, cur_start, end))
+
+            # (phrase, 일) 최고 점수를 윈도별로 합산
+            rows = self._conn.execute(
+                "SELECT phrase,"
+                " SUM(CASE WHEN day>=? THEN s ELSE 0 END),"
+                " SUM(CASE WHEN day<? THEN s ELSE 0 END),"
+                " SUM(CASE WHEN day>=? THEN 1 ELSE 0 END)"
+                " FROM (SELECT phrase, day, MAX(score) AS s FROM issue_snapshots"
+                "       WHERE profile=? AND day BETWEEN ? AND ?"
+                "       AND phrase IN (SELECT phrase FROM temp._want)"
+                "       GROUP BY phrase, day)"
+                " GROUP BY phrase",
+                (cur_start, cur_start, cur_start, profile, prev_start, end),
+            ).fetchall()
+            oldest = self._conn.execute(
+                "SELECT MIN(day) FROM issue_runs WHERE profile=?", (profile,)
+            ).fetchone()[0]
+            first_seen = dict(self._conn.execute(
+                "SELECT phrase, MIN(day) FROM issue_snapshots"
+                " WHERE profile=? AND phrase IN (SELECT phrase FROM temp._want) GROUP BY phrase",
+                (profile,),
+            ).fetchall())
+            self._conn.execute("DROP TABLE temp._want")
+
+        # 직전 윈도 전체가 기록돼 있어야 '처음 등장'/속도 비교가 의미 있다
+        covered = oldest is not None and oldest <= prev_start
+
+        out: Dict[str, IssueTrend] = {}
+        for phrase, cur_sum, prev_sum, days_seen in rows:
+            current = cur_sum / window_days
+            previous = prev_sum / window_days
+            velocity = current / previous if previous > 0 else 0.0
+            first = first_seen.get(phrase, end)
+            if not covered:
+                status = STEADY
+            elif first >= cur_start:
+                status = NEW
+            elif previous <= 0:
+                status = RETURNING
+            elif velocity >= self.rising_ratio:
+                status = RISING
+            elif velocity <= self.falling_ratio:
+                status = FALLING
+            else:
+                status = STEADY
+            out[phrase] = IssueTrend(phrase, current, previous, velocity, first, int(days_seen), status)
+        return out
+
+    def rising(
+        self, profile: str, window_days: int = 7, limit: int = 20, now: Optional[float] = None
+    ) -> List[IssueTrend]:
+        """최근 윈도의 신규/상승/재등장 이슈 (emerging_key 순)."""
+        trends = self.trends(profile, window_days=window_days, now=now).values()
+        picked = [t for t in trends if t.status in EMERGING]
+        picked.sort(key=emerging_key)
+        return picked[:limit]
+
+    def purge(self, keep_days: int) -> int:
+        cutoff = _day(time.time() - keep_days * 86400)
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM issue_snapshots WHERE day<?", (cutoff,))
+            self._conn.execute("DELETE FROM issue_runs WHERE day<?", (cutoff,))
+            self._conn.commit()
+            return cur.rowcount
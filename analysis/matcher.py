@@ -0,0 +1,89 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 다중 키워드 매처.
+    label(카테고리) -> 키워드 목록으로 한 번 빌드해 두고,
+    텍스트를 한 번만 훑어서 label별 '매칭된 서로 다른 키워드 수'를 돌려준다.
+    키워드/텍스트는 소문자로 비교한다.
+    """
+    def __init__(self, rules: Dict[str, Iterable[str]]):
+        self.labels: List[str] = list(rules.keys())
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]   # state -> keyword ids
+        self._kw_labels: List[List[int]] = []  # keyword id -> label idx 목록
+
+        kw_ids: Dict[str, int] = {}
+        for li, label in enumerate(self.labels):
+            for kw in rules[label]:
+                kw = (kw or "").lower()
+                if not kw:
+                    continue
+                if kw not in kw_ids:
+                    kw_ids[kw] = len(self._kw_labels)
+                    self._kw_labels.append([])
+                    self._insert(kw, kw_ids[kw])
+                if li not in self._kw_labels[kw_ids[kw]]:
+                    self._kw_labels[kw_ids[kw]].append(li)
+
+        self._build_fail()
+
+    def _insert(self, kw: str, kid: int) -> None:
+        s = 0
+        for ch in kw:
+            nxt = self._goto[s].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[s][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            s = nxt
+        self._out[s].append(kid)
+
+    def _build_fail(self) -> None:
+        q = deque(self._goto[0].values())
+        while q:
+            s = q.popleft()
+            for ch, nxt in self._goto[s].items():
+                q.append(nxt)
+                f = self._fail[s]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                # 출력 링크를 미리 합쳐 둬서 매칭 시 fail 체인을 따라갈 필요 없게
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def matched_keywords(self, text: str) -> Set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        s = 0
+        for ch in (text or "").lower():
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]:
+                found.update(out[s])
+        return found
+
+    def count_by_label(self, text: str) -> Dict[str, int]:
+        counts = [0] * len(self.labels)
+        for kid in self.matched_keywords(text):
+            for li in self._kw_labels[kid]:
+                counts[li] += 1
+        return {self.labels[i]: c for i, c in enumerate(counts) if c}
+
+    def contains_any(self, text: str) -> bool:
+        goto, fail, out = self._goto, self._fail, self._out
+        s = 0
+        for ch in (text or "").lower():
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]:
+                return True
+        return False
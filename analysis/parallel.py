@@ -0,0 +1,157 @@
+"""
+프로세스 풀 샤딩 스코어링 (멀티 브랜드/몇 달치 백필처럼 CPU 가 병목일 때).
+- 문서를 연속 구간(샤드)으로 나눠, 샤드마다 스코어링에 필요한 필드만 컬럼 튜플로 한 번에 보낸다
+  (SignalDoc 을 한 건씩 피클하지 않음)
+- 워커는 normalize / 부정어 필터 / classify / 점수 계산 후 phrase 버킷 조각을 돌려준다
+  (점수는 문서 순서대로의 배열, evidence 는 순서 유지 중복 제거 + cap)
+- 부모는 샤드 순서대로 IssueAccumulator.add_partial 로 합친다 → 직렬(stream_top_issues, max_buckets 없음)과 결과 동일
+"""
+from __future__ import annotations
+
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sources.base import SignalDoc
+from .scorer import IssueAccumulator, IssueItem, phrase_text, score_doc, stream_top_issues
+
+MIN_SHARD_DOCS = 2000   # 이보다 작은 샤드는 보내는 비용이 더 크다
+SHARDS_PER_WORKER = 4   # 샤드 크기 편차를 풀이 흡수하도록 워커보다 잘게
+
+# (source, phrase text, evidence, published ts(없으면 None), trends kind, trends value)
+Columns = Tuple[List[str], List[str], List[str], List[Optional[float]], List[Any], List[Any]]
+Partial = List[Tuple[str, str, array, List[str]]]
+
+
+class _At:
+    """published_at 대용: 부모에서 계산한 timestamp 를 그대로 돌려줘 감쇠 계산이 직렬과 같다."""
+    __slots__ = ("ts",)
+
+    def __init__(self, ts: float):
+        self.ts = ts
+
+    def timestamp(self) -> float:
+        return self.ts
+
+
+class _Doc:
+    """워커 쪽 문서: score_doc 이 보는 속성만 (SignalDoc 생성/intern/meta 공유 비용 없이)."""
+    __slots__ = ("source", "title", "text", "url", "published_at", "meta")
+
+    def __init__(self, source, title, text, url, published_at, meta):
+        self.source = source
+        self.title = title
+        self.text = text
+        self.url = url
+        self.published_at = published_at
+        self.meta = meta
+
+
+_NO_META: Dict[str, Any] = {}
+
+
+def to_columns(docs: List[SignalDoc]) -> Columns:
+    sources, texts, evidence, published, kinds, values = [], [], [], [], [], []
+    for d in docs:
+        sources.append(d.source)
+        texts.append(phrase_text(d))
+        evidence.append(d.url or d.title)
+        published.append(d.published_at.timestamp() if d.published_at is not None else None)
+        if d.source == "google_trends":
+            kinds.append(d.meta.get("kind"))
+            values.append(d.meta.get("value"))
+        else:
+            kinds.append(None)
+            values.append(None)
+    return sources, texts, evidence, published, kinds, values
+
+
+def _from_columns(cols: Columns) -> List[_Doc]:
+    """
+    score_doc 이 보는 필드만 되살린다. phrase_text(d) 와 (d.url or d.title) 이 원본과 같도록
+    title/text 는 phrase text, url 은 evidence (evidence 가 비었으면 title 도 비운다).
+    """
+    return [
+        _Doc(src, text if ev else "", text, ev,
+             _At(ts) if ts is not None else None,
+             {"kind": kind, "value": value} if src == "google_trends" else _NO_META)
+        for src, text, ev, ts, kind, value in zip(*cols)
+    ]
+
+
+def _score_shard(
+    cols: Columns,
+    taxonomy_boost: Dict[str, float],
+    source_weights: Dict[str, float],
+    half_life_hours: Optional[float],
+    now: float,
+    evidence_cap: Optional[int],
+    phrase_of: Optional[Callable[[str], str]],
+) -> Partial:
+    buckets: Dict[str, Tuple[str, str, array, Dict[str, None]]] = {}
+    for d in _from_columns(cols):
+        scored = score_doc(d, taxonomy_boost, source_weights, half_life_hours, now, phrase_of)
+        if scored is None:
+            continue
+        phrase, cat, score, ev = scored
+        b = buckets.get(phrase)
+        if b is None:
+            b = buckets[phrase] = (phrase, cat, array("d"), {})
+        b[2].append(score)
+        if ev and (evidence_cap is None or len(b[3]) < evidence_cap):
+            b[3][ev] = None
+    return [(p, c, scores, list(evs)) for p, c, scores, evs in buckets.values()]
+
+
+def shard_bounds(n: int, workers: int) -> List[Tuple[int, int]]:
+    if n <= 0:
+        return []
+    shards = max(1, min(workers * SHARDS_PER_WORKER, n // MIN_SHARD_DOCS))
+    step = -(-n // shards)
+    return [(i, min(n, i + step)) for i in range(0, n, step)]
+
+
+def build_issues_parallel(
+    docs: List[SignalDoc],
+    taxonomy_boost: Dict[str, float],
+    source_weights: Dict[str, float],
+    workers: Optional[int] = None,
+    top_k: int = 30,
+    evidence_cap: Optional[int] = 20,
+    near_dup_threshold: Optional[float] = None,
+    half_life_hours: Optional[float] = None,
+    phrase_of: Optional[Callable[[str], str]] = None,
+    now: Optional[float] = None,
+    carry: Optional[Iterable[Tuple[str, str, float, str]]] = None,
+) -> List[IssueItem]:
+    """
+    stream_top_issues(max_buckets=None) 와 같은 결과를 프로세스 풀로.
+    phrase_of 는 피클 가능해야 한다(PhraseMiner.phrase_of 는 가능). 문서가 적으면 그냥 직렬로.
+    """
+    workers = workers or os.cpu_count() or 1
+    bounds = shard_bounds(len(docs), workers)
+    if workers <= 1 or len(bounds) <= 1:
+        return stream_top_issues(docs, taxonomy_boost, source_weights, top_k=top_k,
+                                 evidence_cap=evidence_cap, near_dup_threshold=near_dup_threshold,
+                                 half_life_hours=half_life_hours, phrase_of=phrase_of, carry=carry, now=now)
+
+    acc = IssueAccumulator(taxonomy_boost, source_weights, evidence_cap=evidence_cap,
+                           half_life_hours=half_life_hours, phrase_of=phrase_of)
+    acc.now = time.time() if now is None else now
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as ex:
+        futures = [
+            ex.submit(_score_shard, to_columns(docs[lo:hi]), taxonomy_boost, source_weights,
+                      half_life_hours, acc.now, evidence_cap, phrase_of)
+            for lo, hi in bounds
+        ]
+        # 끝나는 순서가 아니라 샤드 순서대로 합쳐야 직렬과 같다
+        for fut in futures:
+            for phrase, cat, scores, evidence in fut.result():
+                acc.add_partial(phrase, cat, scores, evidence)
+    if carry:
+        acc.add_carry(carry)
+
+    return acc.top(top_k, near_dup_threshold)
@@ -0,0 +1,184 @@
+"""
+n-gram 구(phrase) 마이닝: 제목 전체 대신 여러 문서에 반복해서 나오는 구를 이슈 키로 쓴다.
+- 토큰: 한글/영문/숫자 연속, 흔한 조사 떼기("등원을" → "등원"), 1~max_n 단어 n-gram
+- 1차: 해시 카운터(count-min, 2행) 로 문서 빈도(df) 근사 → 메모리는 고정 크기
+- 2차: 근사 df 가 min_df 이상인 n-gram 만 정확히 센다
+- 현저성: sqrt(df) * log(N/df) 에 긴 구 가산 (너무 흔한 구보다 구체적인 구). 짧은 구가 대부분 긴 구 안에서만
+  나오면 긴 구로 흡수
+- 문서 배정: 문서 안의 현저한 구 중 점수 최고(없으면 원래 제목 그대로)
+문서 수에 선형(문서당 n-gram 수 * 2패스).
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[0-9a-z가-힣]+")
+# 긴 것부터. 떼고 남는 게 2글자 이상일 때만 뗀다("아이가" → "아이", "잠을" 은 그대로)
+_PARTICLES = (
+    "에서는", "으로는", "에게서", "에서", "으로", "에게", "한테", "까지", "부터", "처럼", "보다", "이랑",
+    "은", "는", "을", "를", "이", "가", "의", "에", "도", "만", "로",
+)
+# 구 후보의 처음/끝에 올 수 없는 단어(기사 머리말/일반어/질문형 어미)
+STOP_WORDS = frozenset({
+    "속보", "단독", "종합", "사진", "영상", "포토", "기자", "뉴스", "오늘", "관련", "이번", "지난", "올해",
+    "위해", "대한", "통해", "있는", "없는", "하는", "했다", "한다", "있다", "없다", "그리고", "the", "and",
+    "너무", "정말", "진짜", "어떻게", "할까요", "뭘까요", "하셨나요", "있나요", "없나요", "부탁드려요",
+    "공유합니다", "해보세요", "궁금해요", "힘들어요",
+})
+
+
+@lru_cache(maxsize=1 << 16)
+def _stem(tok: str) -> str:
+    for p in _PARTICLES:
+        if tok.endswith(p) and len(tok) - len(p) >= 2:
+            return tok[: -len(p)]
+    return tok
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(t) for t in _TOKEN.findall((text or "").lower())]
+
+
+def _ok(t: str) -> bool:
+    return len(t) >= 2 and t not in STOP_WORDS and not t.isdigit()
+
+
+def ngrams(tokens: List[str], max_n: int) -> List[Tuple[int, str]]:
+    """(n, 'w1 w2 ..') 목록. 불용어/숫자/1글자로 시작하거나 끝나는 구는 뺀다."""
+    ok = [_ok(t) for t in tokens]
+    m = len(tokens)
+    out = []
+    for i in range(m):
+        if not ok[i]:
+            continue
+        out.append((1, tokens[i]))
+        for j in range(i + 1, min(m, i + max_n)):
+            if ok[j]:
+                out.append((j - i + 1, " ".join(tokens[i:j + 1])))
+    return out
+
+
+MEMO_SIZE = 1 << 16
+
+
+class _Sketch:
+    """
+    count-min(2행). 해시 충돌은 과대 추정만 하므로 2차 패스 후보 거르기에 안전
+    (실행마다 hash() 가 달라도 최종 df 는 2차 패스에서 정확히 센다).
+    """
+    def __init__(self, width_bits: int):
+        self.bits = width_bits
+        self.mask = (1 << width_bits) - 1
+        self.rows = (array("I", bytes(4 << width_bits)), array("I", bytes(4 << width_bits)))
+
+    def add_all(self, grams: Iterable[str], w: int = 1) -> None:
+        r0, r1, mask, bits = self.rows[0], self.rows[1], self.mask, self.bits
+        for s in grams:
+            h = hash(s)
+            r0[h & mask] += w
+            r1[(h >> bits) & mask] += w
+
+    def estimate(self, s: str) -> int:
+        h = hash(s)
+        return min(self.rows[0][h & self.mask], self.rows[1][(h >> self.bits) & self.mask])
+
+
+class PhraseMiner:
+    def __init__(
+        self,
+        max_n: int = 3,
+        min_df: int = 3,
+        max_df_ratio: float = 0.3,
+        subsume_ratio: float = 0.6,
+        max_phrases: int = 5000,
+        sketch_bits: int = 20,
+    ):
+        self.max_n = max_n
+        self.min_df = min_df
+        self.max_df_ratio = max_df_ratio
+        self.subsume_ratio = subsume_ratio
+        self.max_phrases = max_phrases
+        self.sketch_bits = sketch_bits
+        self.n_docs = 0
+        self.salience: Dict[str, float] = {}
+        self._memo: Dict[str, str] = {}
+
+    def __getstate__(self) -> dict:
+        # 프로세스 풀로 보낼 때 배정 캐시는 빼고 (받은 쪽에서 다시 채운다)
+        state = self.__dict__.copy()
+        state["_memo"] = {}
+        return state
+
+    def fit(self, texts: Iterable[str]) -> "PhraseMiner":
+        # 같은 제목(Trends 키워드, 신디케이션)은 한 번만 토큰화하고 개수로 센다
+        counts = Counter(texts)
+        self.n_docs = sum(counts.values())
+        self._memo = {}
+
+        # 1차: 근사 df (문서 안 중복은 1회)
+        sketch = _Sketch(self.sketch_bits)
+        for t, w in counts.items():
+            sketch.add_all({g for _, g in ngrams(tokenize(t), self.max_n)}, w)
+
+        # 2차: 후보만 정확히
+        df: Dict[str, int] = {}
+        size: Dict[str, int] = {}
+        for t, w in counts.items():
+            for n, g in set(ngrams(tokenize(t), self.max_n)):
+                if g in df:
+                    df[g] += w
+                elif sketch.estimate(g) >= self.min_df:
+                    df[g] = w
+                    size[g] = n
+        self.salience = self._select(df, size)
+        return self
+
+    def _select(self, df: Dict[str, int], size: Dict[str, int]) -> Dict[str, float]:
+        n_docs = max(1, self.n_docs)
+        max_df = max(self.min_df, self.max_df_ratio * n_docs)
+        cand = {g: c for g, c in df.items() if self.min_df <= c <= max_df}
+
+        # 긴 구가 짧은 구 등장의 대부분을 차지하면 짧은 구는 긴 구로 흡수
+        absorbed = set()
+        for g, c in cand.items():
+            n = size[g]
+            if n < 2:
+                continue
+            words = g.split(" ")
+            for k in range(1, n):
+                for i in range(n - k + 1):
+                    sub = " ".join(words[i:i + k])
+                    sc = cand.get(sub)
+                    if sc and c >= self.subsume_ratio * sc:
+                        absorbed.add(sub)
+
+        scored = (
+            (math.sqrt(c) * math.log(1.0 + n_docs / c) * (1.0 + 0.5 * (size[g] - 1)), g)
+            for g, c in cand.items() if g not in absorbed
+        )
+        return {g: s for s, g in heapq.nlargest(self.max_phrases, scored)}
+
+    def phrase_of(self, text: str) -> str:
+        """text 가 속할 구. 현저한 구가 없으면 text 그대로(제목 단위 키로 되돌아감)."""
+        key = self._memo.get(text)
+        if key is not None:
+            return key
+        best: Optional[Tuple[float, int, str]] = None
+        for n, g in ngrams(tokenize(text), self.max_n):
+            s = self.salience.get(g)
+            if s is not None and (best is None or (s, n) > best[:2]):
+                best = (s, n, g)
+        key = best[2] if best else text
+        if len(self._memo) < MEMO_SIZE:
+            self._memo[text] = key
+        return key
+
+
+def mine_phrases(texts: Iterable[str], max_n: int = 3, min_df: int = 3) -> PhraseMiner:
+    return PhraseMiner(max_n=max_n, min_df=min_df).fit(texts)
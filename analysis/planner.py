@@ -0,0 +1,174 @@
+"""
+쿼리 예산 플래너: 쿼리별 수확(새 문서 수, 점수 기여)을 실행마다 기록하고,
+정해진 호출 예산 안에서 대부분은 수확이 좋은 쿼리에, 일부는 아직 안 써 본 쿼리에 쓴다.
+
+- 수확은 호출 1회당 값의 EWMA (최근 실행에 가중)
+- exploit: EWMA + UCB 보너스(오래 안 뽑힌/적게 뽑힌 쿼리도 가끔 다시 시도)
+- explore: 안 써 본 후보를 후보 순서(기존 길이 휴리스틱)대로 explore_share 만큼
+- "새 문서" 판단용으로 쿼리별 최근 링크 해시(crc32) 일부를 같이 저장
+"""
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+SEEN_KEEP = 500  # 쿼리별로 기억할 링크 해시 개수
+
+
+@dataclass
+class QueryStats:
+    query: str
+    runs: int = 0
+    calls: int = 0
+    new_docs: int = 0
+    last_calls: int = 0
+    ewma_new: float = 0.0    # 호출당 새 문서
+    ewma_score: float = 0.0  # 호출당 점수 기여
+    updated_at: float = 0.0
+
+
+class QueryPlanner:
+    def __init__(
+        self,
+        path: str,
+        explore_share: float = 0.2,
+        alpha: float = 0.3,
+        score_weight: float = 0.5,
+        ucb_c: float = 0.3,
+    ):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.explore_share = explore_share
+        self.alpha = alpha
+        self.score_weight = score_weight
+        self.ucb_c = ucb_c
+        self._lock = threading.Lock()
+        self._observed: Dict[str, set] = {}  # 이번 실행에서 observe 된 (source → 쿼리들)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_yield ("
+                " source TEXT NOT NULL,"
+                " query TEXT NOT NULL,"
+                " runs INTEGER NOT NULL,"
+                " calls INTEGER NOT NULL,"
+                " new_docs INTEGER NOT NULL,"
+                " last_calls INTEGER NOT NULL,"
+                " ewma_new REAL NOT NULL,"
+                " ewma_score REAL NOT NULL,"
+                " seen BLOB,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (source, query))"
+            )
+            self._conn.commit()
+
+    # -----------------
+    # 조회
+    # -----------------
+    def stats(self, source: str, queries: Optional[Iterable[str]] = None) -> Dict[str, QueryStats]:
+        cols = "query, runs, calls, new_docs, last_calls, ewma_new, ewma_score, updated_at"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {cols} FROM query_yield WHERE source=?", (source,)
+            ).fetchall()
+        want = None if queries is None else set(queries)
+        return {r[0]: QueryStats(*r) for r in rows if want is None or r[0] in want}
+
+    def value(self, st: QueryStats) -> float:
+        return st.ewma_new + self.score_weight * st.ewma_score
+
+    # -----------------
+    # 계획
+    # -----------------
+    def plan(self, source: str, candidates: List[str], n: int) -> List[str]:
+        """candidates(우선순위 순) 중 n 개를 고른다."""
+        candidates = list(dict.fromkeys(candidates))
+        if n >= len(candidates):
+            return candidates
+        stats = self.stats(source, candidates)
+        tried = [q for q in candidates if q in stats]
+        fresh = [q for q in candidates if q not in stats]
+
+        n_explore = min(len(fresh), max(1 if fresh else 0, round(n * self.explore_share)))
+        # 써 본 쿼리가 모자라면 남는 자리는 새 쿼리로
+        n_explore = max(n_explore, min(len(fresh), n - len(tried)))
+        n_exploit = n - n_explore
+
+        total_runs = sum(st.runs for st in stats.values()) or 1
+
+        def ucb(q: str) -> float:
+            st = stats[q]
+            return self.value(st) + self.ucb_c * math.sqrt(math.log(1 + total_runs) / max(1, st.runs))
+
+        # 동점은 후보 순서 유지 (sorted 는 안정 정렬)
+        exploit = sorted(tried, key=ucb, reverse=True)[:n_exploit]
+        picked = set(exploit) | set(fresh[:n_explore])
+        return [q for q in candidates if q in picked]
+
+    # -----------------
+    # 기록
+    # -----------------
+    def observe(self, source: str, query: str, calls: int, links: Iterable[str]) -> int:
+        """이번 실행의 호출 수와 받은 링크들을 기록하고, 처음 본 링크 수를 돌려준다."""
+        hashes = [zlib.crc32(l.encode("utf-8")) for l in links if l]
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT runs, calls, new_docs, ewma_new, seen FROM query_yield WHERE source=? AND query=?",
+                (source, query),
+            ).fetchone()
+            runs, tot_calls, tot_new, ewma_new, seen_blob = row or (0, 0, 0, 0.0, None)
+            seen = array("I")
+            if seen_blob:
+                seen.frombytes(seen_blob)
+            seen_set = set(seen)
+            new = [h for h in dict.fromkeys(hashes) if h not in seen_set]
+
+            per_call = len(new) / max(1, calls)
+            ewma_new = per_call if runs == 0 else self.alpha * per_call + (1 - self.alpha) * ewma_new
+            seen.extend(new)
+            if len(seen) > SEEN_KEEP:
+                seen = seen[-SEEN_KEEP:]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_yield"
+                " (source, query, runs, calls, new_docs, last_calls, ewma_new, ewma_score, seen, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?,"
+                "  COALESCE((SELECT ewma_score FROM query_yield WHERE source=? AND query=?), 0.0), ?, ?)",
+                (source, query, runs + 1, tot_calls + calls, tot_new + len(new), calls, ewma_new,
+                 source, query, seen.tobytes(), time.time()),
+            )
+            self._conn.commit()
+            self._observed.setdefault(source, set()).add(query)
+        return len(new)
+
+    def credit(self, source: str, scores: Dict[str, float]) -> None:
+        """
+        스코어링 후 쿼리별 점수 기여를 반영 (직전 observe 의 호출 수로 나눈다).
+        이번 실행에서 실제로 호출(observe)한 쿼리만 반영한다. 캐시로 끝난 쿼리는 호출 비용이 없었으므로 제외.
+        """
+        with self._lock:
+            observed = self._observed.pop(source, set())
+            for q in observed:
+                score = scores.get(q, 0.0)
+                row = self._conn.execute(
+                    "SELECT runs, last_calls, ewma_score FROM query_yield WHERE source=? AND query=?",
+                    (source, q),
+                ).fetchone()
+                if row is None:
+                    continue
+                runs, last_calls, ewma = row
+                per_call = score / max(1, last_calls)
+                ewma = per_call if runs <= 1 else self.alpha * per_call + (1 - self.alpha) * ewma
+                self._conn.execute(
+                    "UPDATE query_yield SET ewma_score=? WHERE source=? AND query=?", (ewma, source, q)
+                )
+            self._conn.commit()
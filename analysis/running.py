@@ -0,0 +1,125 @@
+"""
+증분 수집 소스(RSS)의 누적 이슈 상태.
+소스가 새/바뀐 엔트리만 내보내므로, 예전 엔트리의 점수 기여는 여기 SQLite 에 남겨 두고 매 실행 랭킹에 더한다.
+- 엔트리당 1행: (phrase 텍스트, category, 부스트/감쇠 전 점수, 발행 시각, evidence, URL 키)
+  → 프로필 부스트는 합칠 때 곱하므로 프로필이 여러 개여도 상태는 하나
+  → issue_key_mode=ngram 이어도 제목 텍스트를 저장해 두고 합칠 때 phrase_of 로 키를 정한다
+- 내용이 바뀐 엔트리는 같은 키로 덮어써 두 번 세지 않는다
+- 중복 제거로 다른 문서에 묶인 엔트리(meta.dup_entries)도 대표의 기여를 같은 URL 키로 기록해 두고,
+  합칠 때 URL 키당 한 행만 → 대표 쪽 문서가 다음 실행에 안 들어와도 기여가 남고 두 번 세지 않는다
+- 발행(없으면 처음 본) 시각이 보관 기간을 넘은 행은 정리
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sources.base import SignalDoc
+from .dedup import doc_keys
+from .scorer import score_doc
+
+# (phrase 텍스트, category, 프로필 부스트 전 점수(감쇠 적용), evidence)
+CarryRow = Tuple[str, str, float, str]
+
+
+class IssueState:
+    def __init__(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS issue_state ("
+                " h INTEGER PRIMARY KEY,"
+                " source TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " category TEXT NOT NULL,"
+                " base REAL NOT NULL,"
+                " published REAL,"
+                " evidence TEXT NOT NULL,"
+                " ukey INTEGER,"
+                " seen_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS idx_issue_state_age ON issue_state (COALESCE(published, seen_at));"
+            )
+            self._conn.commit()
+
+    def absorb(self, docs: Iterable[SignalDoc], source_weights: Dict[str, float]) -> int:
+        """
+        meta.entry / meta.dup_entries 가 있는(증분 소스 엔트리가 걸린) 문서의 기여를 엔트리마다 기록.
+        부정어 등으로 버려지는 문서는 건너뜀.
+        """
+        now = time.time()
+        rows = []
+        for d in docs:
+            entries = d.meta.get("dup_entries", ())
+            if d.meta.get("entry") is not None:
+                entries = (d.meta["entry"],) + tuple(entries)
+            if not entries:
+                continue
+            # 부스트 없이(=1.0), 감쇠 없이 → 합칠 때 프로필 부스트/현재 시각 기준 감쇠
+            scored = score_doc(d, {}, source_weights)
+            if scored is None:
+                continue
+            text, cat, base, ev = scored
+            keys = doc_keys(d)
+            published = d.published_at.timestamp() if d.published_at is not None else None
+            for h in entries:
+                rows.append((h, d.source, text, cat, base, published, ev, keys[0] if keys else None, now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO issue_state"
+                " (h, source, text, category, base, published, evidence, ukey, seen_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def carry(
+        self,
+        max_age_s: float,
+        half_life_hours: Optional[float] = None,
+        exclude: Optional[Set[int]] = None,
+        now: Optional[float] = None,
+    ) -> List[CarryRow]:
+        """
+        보관 중인 기여(최근 본 순). exclude 에 엔트리 키나 URL 키가 든 행은 뺀다
+        (이번 실행에서 새로 스코어링하는 엔트리, 다른 소스로 들어온 같은 기사).
+        같은 URL 키의 행(중복 제거로 묶였던 엔트리들)은 가장 최근 것 하나만.
+        """
+        now = time.time() if now is None else now
+        exclude = exclude or set()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT h, text, category, base, published, evidence, ukey FROM issue_state"
+                " WHERE COALESCE(published, seen_at)>=? ORDER BY seen_at DESC, h",
+                (now - max_age_s,),
+            ).fetchall()
+        out: List[CarryRow] = []
+        emitted: Set[int] = set()
+        for h, text, cat, base, published, ev, ukey in rows:
+            if h in exclude or (ukey is not None and ukey in exclude):
+                continue
+            if ukey is not None:
+                if ukey in emitted:
+                    continue
+                emitted.add(ukey)
+            if half_life_hours and published is not None:
+                age_h = max(0.0, (now - published) / 3600.0)
+                base *= 2.0 ** (-age_h / half_life_hours)
+            out.append((text, cat, base, ev))
+        return out
+
+    def purge(self, max_age_s: float) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM issue_state WHERE COALESCE(published, seen_at)<?", (time.time() - max_age_s,)
+            )
+            self._conn.commit()
+            return cur.rowcount
@@ -1,9 +1,12 @@
+import heapq
+import time
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Callable, List, Dict, Iterable, Optional, Tuple
 
 from sources.base import SignalDoc
 from .taxonomy import classify
 from .normalize import normalize_kw
+from .cluster import cluster_near_duplicates
 
 NEGATIVE_PHRASES = [
     "고양이", "강아지", "신생아", "성인", "군대", "연애", "직장",
@@ -17,69 +20,269 @@ class IssueItem:
     score: float
     evidence: List[str]  # URL 또는 타이틀(중복 제거됨)
 
+def phrase_text(d: SignalDoc) -> str:
+    """
+    문서에서 “관심사 후보 phrase”를 뽑는 규칙:
+    - RSS: title
+    - Trends: text(키워드)
+    - Naver: title 우선(없으면 text)
+    """
+    if d.source == "rss_news":
+        return d.title
+    if d.source == "google_trends":
+        return d.text
+    return d.title or d.text
+
+
+def score_doc(
+    d: SignalDoc,
+    taxonomy_boost: Dict[str, float],
+    source_weights: Dict[str, float],
+    half_life_hours: Optional[float] = None,
+    now: Optional[float] = None,
+    phrase_of: Optional[Callable[[str], str]] = None,
+) -> Optional[Tuple[str, str, float, str]]:
+    """
+    문서 1개 → (phrase, category, score, evidence). 버릴 문서면 None.
+    half_life_hours 를 주면 published_at 기준 지수 감쇠(반감기)를 곱한다. 발행 시각이 없으면 감쇠 없음.
+    phrase_of 를 주면 이슈 키를 제목 전체 대신 그 결과로(예: PhraseMiner.phrase_of). 점수/카테고리는 제목 기준.
+    """
+    text = normalize_kw(phrase_text(d))
+
+    if not text:
+        return None
+    if any(n in text for n in NEGATIVE_PHRASES):
+        return None
+
+    cat, raw = classify(text)
+    boost = taxonomy_boost.get(cat, 1.0)
+    sw = source_weights.get(d.source, 1.0)
+
+    trend_bonus = 1.0
+
+    # Trends는 rising/value 반영
+    if d.source == "google_trends":
+        kind = d.meta.get("kind")
+        val = d.meta.get("value")
+        if kind == "rising":
+            trend_bonus *= 1.35
+        elif kind == "top":
+            trend_bonus *= 1.05
+        if isinstance(val, (int, float)):
+            trend_bonus *= (1.0 + min(float(val), 100.0) / 600.0)
+
+    # Naver는 최신 정렬(date)을 쓰므로 약간 가산
+    if d.source in ("naver_cafearticle", "naver_blog", "naver_news"):
+        trend_bonus *= 1.10
+
+    base_score = (raw if raw > 0 else 0.6) * boost * sw * trend_bonus
+
+    if half_life_hours and d.published_at is not None:
+        now = time.time() if now is None else now
+        age_h = max(0.0, (now - d.published_at.timestamp()) / 3600.0)
+        base_score *= 2.0 ** (-age_h / half_life_hours)
+
+    key = phrase_of(text) if phrase_of is not None else text
+    return key, cat, base_score, (d.url or d.title)
+
+
+class _Bucket:
+    __slots__ = ("phrase", "category", "score", "evidence")
+
+    def __init__(self, phrase: str, category: str, score: float):
+        self.phrase = phrase
+        self.category = category
+        self.score = score
+        self.evidence: Dict[str, None] = {}  # 순서 유지 set
+
+    def to_item(self) -> IssueItem:
+        return IssueItem(phrase=self.phrase, category=self.category, score=self.score,
+                         evidence=list(self.evidence))
+
+
+class IssueAccumulator:
+    """
+    문서를 하나씩 받아 phrase 버킷에 점수를 누적하는 스트리밍 스코어러.
+    - evidence 는 순서 유지 set(dict) 으로 O(1) 중복 제거, 이슈당 evidence_cap 개까지만 보관
+    - max_buckets 를 넘으면 점수 낮은 버킷 절반을 버려 메모리를 묶어 둔다(근사)
+    """
+    def __init__(
+        self,
+        taxonomy_boost: Dict[str, float],
+        source_weights: Dict[str, float],
+        evidence_cap: Optional[int] = None,
+        max_buckets: Optional[int] = None,
+        half_life_hours: Optional[float] = None,
+        phrase_of: Optional[Callable[[str], str]] = None,
+    ):
+        self.taxonomy_boost = taxonomy_boost
+        self.source_weights = source_weights
+        self.half_life_hours = half_life_hours
+        self.phrase_of = phrase_of
+        self.now = time.time()  # 감쇠 기준 시각 (누적기 단위로 고정)
+        self.evidence_cap = evidence_cap
+        self.max_buckets = max_buckets
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def add(self, d: SignalDoc) -> None:
+        scored = score_doc(d, self.taxonomy_boost, self.source_weights,
+                           self.half_life_hours, self.now, self.phrase_of)
+        if scored is not None:
+            self.add_scored(*scored)
+
+    def add_many(self, docs: Iterable[SignalDoc]) -> "IssueAccumulator":
+        for d in docs:
+            self.add(d)
+        return self
+
+    def add_scored(self, phrase: str, category: str, score: float, ev: str) -> None:
+        b = self._buckets.get(phrase)
+        if b is None:
+            b = self._buckets[phrase] = _Bucket(phrase, category, score)
+            if self.max_buckets and len(self._buckets) > self.max_buckets:
+                self._prune()
+        else:
+            b.score += score
+
+        # ✅ evidence는 중복 제거해서 저장
+        if ev and (self.evidence_cap is None or len(b.evidence) < self.evidence_cap):
+            b.evidence[ev] = None
+
+    def add_carry(self, rows: Iterable[Tuple[str, str, float, str]]) -> "IssueAccumulator":
+        """
+        누적 상태(analysis.running.IssueState.carry)의 (텍스트, category, 부스트 전 점수, evidence) 를 더한다.
+        프로필 부스트와 이슈 키(phrase_of)는 여기서 적용.
+        """
+        for text, cat, base, ev in rows:
+            key = self.phrase_of(text) if self.phrase_of is not None else text
+            self.add_scored(key, cat, base * self.taxonomy_boost.get(cat, 1.0), ev)
+        return self
+
+    def merge(self, other: "IssueAccumulator") -> "IssueAccumulator":
+        """다른 누적기(예: 다른 소스/샤드)의 버킷을 합친다. 점수 합산, evidence 순서 유지 합집합."""
+        for ob in other._buckets.values():
+            b = self._buckets.get(ob.phrase)
+            if b is None:
+                b = self._buckets[ob.phrase] = _Bucket(ob.phrase, ob.category, ob.score)
+            else:
+                b.score += ob.score
+            for ev in ob.evidence:
+                if self.evidence_cap is not None and len(b.evidence) >= self.evidence_cap:
+                    break
+                b.evidence[ev] = None
+        if self.max_buckets and len(self._buckets) > self.max_buckets:
+            self._prune()
+        return self
+
+    def add_partial(self, phrase: str, category: str, scores: Iterable[float], evidence: Iterable[str]) -> None:
+        """
+        다른 프로세스가 만든 버킷 조각을 합친다. 점수를 문서 순서대로 하나씩 더해
+        (합계를 더하는 merge 와 달리) 직렬 누적과 부동소수 결과까지 같다.
+        """
+        b = self._buckets.get(phrase)
+        it = iter(scores)
+        if b is None:
+            b = self._buckets[phrase] = _Bucket(phrase, category, next(it))
+            if self.max_buckets and len(self._buckets) > self.max_buckets:
+                self._prune()
+        for sc in it:
+            b.score += sc
+        for ev in evidence:
+            if self.evidence_cap is not None and len(b.evidence) >= self.evidence_cap:
+                break
+            b.evidence[ev] = None
+
+    def _prune(self) -> None:
+        keep = heapq.nlargest(self.max_buckets // 2, self._buckets.values(), key=lambda b: b.score)
+        self._buckets = {b.phrase: b for b in keep}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def issues(self, near_dup_threshold: Optional[float] = None) -> List[IssueItem]:
+        issues = [b.to_item() for b in self._buckets.values()]
+        if near_dup_threshold is not None:
+            issues = merge_near_duplicates(issues, threshold=near_dup_threshold, evidence_cap=self.evidence_cap)
+        return issues
+
+    def top(self, k: int, near_dup_threshold: Optional[float] = None) -> List[IssueItem]:
+        if near_dup_threshold is None:
+            best = heapq.nlargest(k, self._buckets.values(), key=lambda b: b.score)
+            return [b.to_item() for b in best]
+        return heapq.nlargest(k, self.issues(near_dup_threshold), key=lambda x: x.score)
+
+
 def build_issues_from_docs(
     docs: List[SignalDoc],
     taxonomy_boost: Dict[str, float],
-    source_weights: Dict[str, float]
+    source_weights: Dict[str, float],
+    near_dup_threshold: Optional[float] = None,
 ) -> List[IssueItem]:
-    bucket: Dict[str, IssueItem] = {}
-
-    for d in docs:
-        # 문서에서 “관심사 후보 phrase”를 뽑는 규칙:
-        # - RSS: title
-        # - Trends: text(키워드)
-        # - Naver: title 우선(없으면 text)
-        if d.source == "rss_news":
-            text = d.title
-        elif d.source == "google_trends":
-            text = d.text
-        else:
-            text = d.title or d.text
+    acc = IssueAccumulator(taxonomy_boost, source_weights).add_many(docs)
+    issues = acc.issues(near_dup_threshold)
+    return sorted(issues, key=lambda x: x.score, reverse=True)
 
-        text = normalize_kw(text)
 
-        if not text:
-            continue
-        if any(n in text for n in NEGATIVE_PHRASES):
-            continue
+def stream_top_issues(
+    docs: Iterable[SignalDoc],
+    taxonomy_boost: Dict[str, float],
+    source_weights: Dict[str, float],
+    top_k: int = 30,
+    evidence_cap: Optional[int] = 20,
+    max_buckets: Optional[int] = None,
+    near_dup_threshold: Optional[float] = None,
+    half_life_hours: Optional[float] = None,
+    phrase_of: Optional[Callable[[str], str]] = None,
+    carry: Optional[Iterable[Tuple[str, str, float, str]]] = None,
+    now: Optional[float] = None,
+) -> List[IssueItem]:
+    """
+    SignalDoc 이터레이터를 그대로 받아(리스트로 모으지 않음) 상위 top_k 이슈만 힙으로 뽑는다.
+    carry(누적 상태의 예전 기여)는 이번 문서들 뒤에 더한다(evidence 는 새 문서 먼저).
+    now 는 감쇠 기준 시각(없으면 지금).
+    """
+    acc = IssueAccumulator(taxonomy_boost, source_weights,
+                           evidence_cap=evidence_cap, max_buckets=max_buckets,
+                           half_life_hours=half_life_hours, phrase_of=phrase_of)
+    if now is not None:
+        acc.now = now
+    acc.add_many(docs)
+    if carry:
+        acc.add_carry(carry)
+    return acc.top(top_k, near_dup_threshold)
 
-        cat, raw = classify(text)
-        boost = taxonomy_boost.get(cat, 1.0)
-        sw = source_weights.get(d.source, 1.0)
-
-        trend_bonus = 1.0
-
-        # Trends는 rising/value 반영
-        if d.source == "google_trends":
-            kind = d.meta.get("kind")
-            val = d.meta.get("value")
-            if kind == "rising":
-                trend_bonus *= 1.35
-            elif kind == "top":
-                trend_bonus *= 1.05
-            if isinstance(val, (int, float)):
-                trend_bonus *= (1.0 + min(float(val), 100.0) / 600.0)
-
-        # Naver는 최신 정렬(date)을 쓰므로 약간 가산
-        if d.source in ("naver_cafearticle", "naver_blog", "naver_news"):
-            trend_bonus *= 1.10
-
-        base_score = (raw if raw > 0 else 0.6) * boost * sw * trend_bonus
-
-        key = text
-        if key not in bucket:
-            bucket[key] = IssueItem(
-                phrase=key,
-                category=cat,
-                score=base_score,
-                evidence=[]
-            )
-        else:
-            bucket[key].score += base_score
 
-        # ✅ evidence는 중복 제거해서 저장
-        ev = d.url or d.title
-        if ev and ev not in bucket[key].evidence:
-            bucket[key].evidence.append(ev)
+def merge_near_duplicates(
+    issues: List[IssueItem], threshold: float = 0.6, evidence_cap: Optional[int] = None,
+) -> List[IssueItem]:
+    """
+    제목이 조금씩 다른 같은 기사/글(신디케이션, 리포스트)을 하나의 IssueItem 으로 합친다.
+    - 문자 n-gram MinHash LSH 로 후보만 비교 (전체 쌍 비교 X)
+    - 대표 phrase/category 는 그룹 내 최고 점수 항목, score 는 합산, evidence 는 순서 유지 합집합
+      (evidence_cap 을 주면 합친 뒤에도 그 개수까지만)
+    """
+    if len(issues) < 2:
+        return issues
+
+    roots = cluster_near_duplicates([it.phrase for it in issues], threshold=threshold)
 
-    return sorted(bucket.values(), key=lambda x: x.score, reverse=True)
+    groups: Dict[int, List[IssueItem]] = {}
+    for it, r in zip(issues, roots):
+        groups.setdefault(r, []).append(it)
+
+    merged: List[IssueItem] = []
+    for members in groups.values():
+        if len(members) == 1:
+            merged.append(members[0])
+            continue
+        rep = max(members, key=lambda x: x.score)
+        evidence = list(dict.fromkeys(ev for it in members for ev in it.evidence))
+        if evidence_cap is not None:
+            evidence = evidence[:evidence_cap]
+        merged.append(IssueItem(
+            phrase=rep.phrase,
+            category=rep.category,
+            score=sum(it.score for it in members),
+            evidence=evidence,
+        ))
+    return merged
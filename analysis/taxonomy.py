@@ -1,6 +1,8 @@
-import re
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
+from .matcher import KeywordMatcher
+
 TAXONOMY_RULES: Dict[str, List[str]] = {
     "집중/주의": ["집중", "산만", "주의력", "ADHD", "충동", "과잉행동"],
     "정서/예민": ["예민", "짜증", "분노", "불안", "감정조절", "떼쓰기", "분리불안"],
@@ -11,14 +13,21 @@ TAXONOMY_RULES: Dict[str, List[str]] = {
     "건강/면역": ["감기", "면역", "비염", "알레르기", "아토피", "기침"],
 }
 
+# TAXONOMY_RULES 전체를 한 번에 매칭하는 오토마톤 (모듈 로드 시 1회 빌드)
+_MATCHER = KeywordMatcher(TAXONOMY_RULES)
+
+
+@lru_cache(maxsize=65536)
 def classify(text: str) -> Tuple[str, float]:
-    t = (text or "").lower()
+    counts = _MATCHER.count_by_label(text)
     best_cat, best_score = "기타", 0.0
-    for cat, kws in TAXONOMY_RULES.items():
-        score = 0
-        for kw in kws:
-            if re.search(re.escape(kw.lower()), t):
-                score += 1
+    for cat in TAXONOMY_RULES:
+        score = counts.get(cat, 0)
         if score > best_score:
             best_cat, best_score = cat, float(score)
     return best_cat, best_score
+
+
+def has_taxonomy_keyword(text: str) -> bool:
+    """RSS gate 용: 택소노미 키워드가 하나라도 들어 있는지."""
+    return _MATCHER.contains_any(text)
@@ -1,29 +1,74 @@
 from config import AppConfig
-from profiles.brainology_newton import PROFILE
+from metrics import METRICS
+from profiles.registry import load_profiles
 
 from sources.google_trends import GoogleTrendsSource
 from sources.rss_news import RssNewsSource
 from sources.naver_search import NaverSearchSource
+from sources.base import SignalSource, SignalDoc
+from sources.collector import collect_concurrently, SourceResult
+from sources.deadline import Deadline
+from sources.transport import HttpTransport, RetryPolicy, get_transport, set_transport
 
 from analysis.expander import expand_queries
-from analysis.taxonomy import TAXONOMY_RULES
-from analysis.scorer import build_issues_from_docs
+from analysis.taxonomy import has_taxonomy_keyword
+from analysis.normalize import normalize_kw
+from analysis.scorer import stream_top_issues, score_doc, phrase_text, IssueItem
+from analysis.phrases import mine_phrases
+from analysis.planner import QueryPlanner
+from analysis.dedup import DedupIndex, dedup_docs, doc_keys
+from analysis.history import IssueHistory, IssueTrend, EMERGING, RISING, NEW, RETURNING, emerging_key
+from analysis.running import CarryRow, IssueState
 
-import requests
+from itertools import zip_longest
+from typing import Callable, Dict, Iterable, List, Optional
 
+SLACK_RETRY = RetryPolicy(max_attempts=3, backoff_base_s=1.0, backoff_max_s=5.0)
 
-def build_slack_message_top7(profile, issues, top_n: int = 7, link_n: int = 5) -> str:
+
+def trend_mark(trend: Optional[IssueTrend]) -> str:
+    """상승/신규/재등장 이슈 표시 (히스토리 없으면 빈 문자열)."""
+    if trend is None:
+        return ""
+    if trend.status == NEW:
+        return " 🆕"
+    if trend.status == RISING:
+        return f" 🔺x{trend.velocity:.1f}"
+    if trend.status == RETURNING:
+        return " 🔁"
+    return ""
+
+
+def partial_note(partial_sources: Optional[List[str]]) -> str:
+    """시간 예산 때문에 일부만 수집된 소스 안내 (없으면 빈 문자열)."""
+    if not partial_sources:
+        return ""
+    return f"⚠️ 시간 예산 초과로 일부만 수집된 소스: {', '.join(partial_sources)}"
+
+
+def build_slack_message_top7(
+    profile, issues, top_n: int = 7, link_n: int = 5,
+    trends: Optional[Dict[str, IssueTrend]] = None, rising_n: int = 3,
+    partial_sources: Optional[List[str]] = None,
+) -> str:
     """
     Slack에는 '상위 7개 이슈 + 관련 링크'만 보내기.
+    히스토리가 있으면 상승/신규 이슈를 표시하고, TOP 7 밖의 급상승 이슈를 몇 개 덧붙인다.
+    예산 초과로 덜 모은 소스가 있으면 머리에 표시한다.
     """
+    trends = trends or {}
     lines = []
     lines.append(f"✅ *{profile.product}*와 관련된 최근 이슈입니다! 콘텐츠 기획에 참고하셔도 좋습니다!")
+    note = partial_note(partial_sources)
+    if note:
+        lines.append(note)
     lines.append(f"*상위 {top_n}개 이슈 + 관련 링크(최대 {link_n}개)*")
     lines.append("")
 
     top_items = issues[:top_n]
     for i, it in enumerate(top_items, 1):
-        lines.append(f"*[{i}]* ({it.category}) {it.phrase}  | score={it.score:.2f}")
+        mark = trend_mark(trends.get(it.phrase))
+        lines.append(f"*[{i}]* ({it.category}) {it.phrase}{mark}  | score={it.score:.2f}")
 
         links = []
         for ev in it.evidence:
@@ -40,77 +85,381 @@ def build_slack_message_top7(profile, issues, top_n: int = 7, link_n: int = 5) -
 
         lines.append("")
 
+    rising = rising_outside_top(issues, trends, top_n)[:rising_n]
+    if rising:
+        lines.append("*급상승 이슈 (TOP 밖)*")
+        for it in rising:
+            lines.append(f"   • ({it.category}) {it.phrase}{trend_mark(trends.get(it.phrase))}")
+        lines.append("")
+
     return "\n".join(lines)
 
 
-def post_to_slack(webhook_url: str, text: str) -> bool:
+def rising_outside_top(issues: List[IssueItem], trends: Dict[str, IssueTrend], top_n: int) -> List[IssueItem]:
+    """TOP n 밖에 있는 신규/상승/재등장 이슈 (emerging_key 순)."""
+    out = [it for it in issues[top_n:]
+           if it.phrase in trends and trends[it.phrase].status in EMERGING]
+    out.sort(key=lambda it: emerging_key(trends[it.phrase]))
+    return out
+
+
+def post_to_slack(webhook_url: str, text: str, transport: Optional[HttpTransport] = None) -> bool:
     payload = {"text": text}
-    try:
-        r = requests.post(webhook_url, json=payload, timeout=10)
-        return 200 <= r.status_code < 300
-    except requests.RequestException:
-        return False
+    transport = transport or get_transport()
+    with METRICS.span("slack"):
+        r = transport.request("POST", webhook_url, retry=SLACK_RETRY, json=payload, timeout=10)
+        ok = r is not None and 200 <= r.status_code < 300
+    METRICS.inc("slack_posts", ok=ok)
+    return ok
 
 
 def main():
     cfg = AppConfig()
+    try:
+        run(cfg)
+    finally:
+        # 실행 리포트(JSON + Prometheus textfile)
+        if cfg.metrics_dir:
+            json_path, prom_path = METRICS.write(cfg.metrics_dir)
+            if cfg.debug:
+                print(f"[DEBUG] metrics: {json_path} | {prom_path}")
+
+
+def run(cfg: AppConfig) -> None:
+    # 0) 프로필 로드 (여러 브랜드면 수집은 한 번, 스코어링/리포트만 프로필별로)
+    profiles = load_profiles(cfg.active_profiles or [cfg.active_profile])
+
+    # 1) 소스 초기화
+    sources = build_sources(cfg)
+
+    # 2) 쿼리 확장(롱테일). 플래너가 있을 때만 후보 풀을 넓힌다
+    expanded = expand_for_profiles(profiles, max_out=query_pool_size(cfg, sources))
+
+    # 3) 수집 (소스 동시 실행, 가장 느린 소스만큼만 걸림 / 전체 예산 안에서)
+    with METRICS.span("collect"):
+        docs, results = collect_concurrently(
+            sources, expanded, cfg.recency_days,
+            timeout_s=cfg.source_timeout_s,
+            timeouts=cfg.source_timeouts,
+            run_deadline=Deadline.after(cfg.run_budget_s),
+            grace_s=cfg.source_grace_s,
+        )
+    log_source_results(cfg, results)
+    partial = degraded_sources(results)
+
+    # 4) 중복 제거 + RSS gate (노이즈 줄이기)
+    docs = dedup_stage(cfg, docs, open_dedup_index(cfg))
+    filtered_docs = gate_docs(docs)
+    credit_query_yield(cfg, sources, filtered_docs, profiles)
+
+    # 4-1) 증분 RSS: 새 엔트리 기여를 누적 상태에 쌓고, 예전 엔트리 기여를 꺼내 온다
+    carry = carry_stage(cfg, open_issue_state(cfg), sources, results, filtered_docs)
+
+    if cfg.debug:
+        by_src = {}
+        for d in docs:
+            by_src[d.source] = by_src.get(d.source, 0) + 1
+        print(f"[DEBUG] expanded_queries={len(expanded)}")
+        print(f"[DEBUG] docs_total={len(docs)} | docs_after_filter={len(filtered_docs)}")
+        print(f"[DEBUG] docs_by_source={by_src}")
+        print("[DEBUG] sample_titles:", [x.title for x in filtered_docs[:8]])
+
+    # 5) 프로필별 이슈 생성 + 히스토리 기록 + 리포트 (구 마이닝은 프로필 공통으로 한 번)
+    phrase_of = issue_key_fn(cfg, filtered_docs, extra_texts=(row[0] for row in carry))
+    history = open_history(cfg)
+    for pname, profile in profiles.items():
+        report_profile(cfg, profile, filtered_docs, history=history, profile_key=pname,
+                       partial_sources=partial, phrase_of=phrase_of, carry=carry)
+
+
+def expand_for_profiles(profiles, max_out: int = 80) -> List[str]:
+    """
+    프로필별 확장 결과의 합집합. 프로필 순서대로 이어 붙이면 앞에서부터 자르는 소스(Trends 앞 40개 등)가
+    첫 프로필 쿼리만 쓰게 되므로, 프로필별 목록을 한 개씩 번갈아(round-robin) 섞는다.
+    """
+    with METRICS.span("expand"):
+        per_profile = [expand_queries(p.seed_queries, max_out=max_out) for p in profiles.values()]
+        expanded = list(dict.fromkeys(
+            q for rnd in zip_longest(*per_profile) for q in rnd if q is not None
+        ))
+    METRICS.set("expanded_queries", len(expanded))
+    return expanded
+
+
+def query_pool_size(cfg: AppConfig, sources: List[SignalSource]) -> int:
+    """
+    확장 쿼리 후보 수. 플래너 없는 소스는 후보를 길이 순으로 잘라 쓰므로 풀을 넓히면 선택이 달라진다
+    → 플래너가 있을 때만 planner_pool_size 로 넓힌다.
+    """
+    if any(getattr(s, "planner", None) is not None for s in sources):
+        return max(cfg.expand_max_out, cfg.planner_pool_size)
+    return cfg.expand_max_out
+
 
-    # 1) 쿼리 확장(롱테일)
-    expanded = expand_queries(PROFILE.seed_queries, max_out=80)
+def build_transport(cfg: AppConfig) -> HttpTransport:
+    """모든 소스와 Slack 전송이 함께 쓰는 HTTP 전송 계층 (프로세스 기본값으로도 등록)."""
+    transport = HttpTransport(
+        pool_size=cfg.http_pool_size,
+        default_concurrency=cfg.http_default_concurrency,
+        host_concurrency=cfg.http_host_concurrency,
+        host_qps=cfg.http_host_qps,
+        breaker_threshold=cfg.http_breaker_threshold,
+        breaker_cooldown_s=cfg.http_breaker_cooldown_s,
+    )
+    set_transport(transport)
+    return transport
 
-    # 2) 소스 초기화
-    sources = []
+
+def build_sources(cfg: AppConfig, transport: Optional[HttpTransport] = None) -> List[SignalSource]:
+    sources: List[SignalSource] = []
+    transport = transport or build_transport(cfg)
 
     if cfg.naver_client_id and cfg.naver_client_secret:
         sources.append(NaverSearchSource(
             client_id=cfg.naver_client_id,
             client_secret=cfg.naver_client_secret,
             display=cfg.naver_display,
-            max_queries=cfg.naver_max_queries
+            max_queries=cfg.naver_max_queries,
+            workers=cfg.naver_workers,
+            qps=cfg.naver_qps,
+            cache_ttl_s=cfg.cache_ttl_hours.get("naver_search", 6.0) * 3600,
+            max_pages=cfg.naver_max_pages,
+            planner=(QueryPlanner(cfg.query_planner_path, explore_share=cfg.planner_explore_share)
+                     if cfg.query_planner_path else None),
+            transport=transport,
         ))
     else:
         print("[WARN] NAVER_CLIENT_ID / NAVER_CLIENT_SECRET 환경변수가 없어 네이버 검색 API를 스킵합니다.")
 
-    sources.append(GoogleTrendsSource())
-    sources.append(RssNewsSource(feeds=cfg.rss_feeds))
+    sources.append(GoogleTrendsSource(
+        cache_ttl_s=cfg.cache_ttl_hours.get("google_trends", 24.0) * 3600,
+        batch_size=cfg.trends_batch_size,
+        transport=transport,
+    ))
+    sources.append(RssNewsSource(
+        feeds=cfg.rss_feeds,
+        workers=cfg.rss_workers,
+        transport=transport,
+        incremental=cfg.rss_incremental and bool(cfg.issue_state_path),
+    ))
+    return sources
 
-    # 3) 수집
-    docs = []
-    for src in sources:
-        try:
-            docs.extend(src.fetch(expanded, cfg.recency_days))
-        except Exception as e:
-            print(f"[WARN] source failed: {getattr(src, 'name', 'unknown')} -> {e}")
 
-    # 4) RSS gate (노이즈 줄이기)
-    rss_gate_words = set()
-    for kws in TAXONOMY_RULES.values():
-        for kw in kws:
-            rss_gate_words.add(kw)
+def log_source_results(cfg: AppConfig, results: List[SourceResult]) -> None:
+    for res in results:
+        if res.timed_out:
+            print(f"[WARN] source timeout: {res.name} ({res.elapsed_s:.1f}s)")
+        elif res.error:
+            print(f"[WARN] source failed: {res.name} -> {res.error}")
+        elif res.truncated:
+            print(f"[WARN] source truncated: {res.name} docs={len(res.docs)} ({res.elapsed_s:.1f}s, 예산 초과)")
+        elif cfg.debug:
+            print(f"[DEBUG] source done: {res.name} docs={len(res.docs)} ({res.elapsed_s:.1f}s)")
 
-    filtered_docs = []
+
+def degraded_sources(results: List[SourceResult]) -> List[str]:
+    """예산 때문에 덜 모았거나(truncated) 아예 못 받은(timed_out) 소스 이름."""
+    return [res.name for res in results if res.truncated or res.timed_out]
+
+
+def credit_query_yield(cfg: AppConfig, sources: List[SignalSource], docs: List[SignalDoc], profiles) -> None:
+    """쿼리 플래너가 있는 소스에 이번 실행의 쿼리별 점수 기여(전 프로필 합)를 알려 준다."""
+    planned = [s for s in sources if getattr(s, "planner", None) is not None]
+    if not planned:
+        return
+    scores: Dict[str, float] = {}
     for d in docs:
-        if d.source == "rss_news":
-            joined = (d.title + " " + d.text)
-            if any(w in joined for w in rss_gate_words):
-                filtered_docs.append(d)
-        else:
-            filtered_docs.append(d)
+        q = d.meta.get("query")
+        if q is None or not d.source.startswith("naver_"):
+            continue
+        for profile in profiles.values():
+            scored = score_doc(d, profile.taxonomy_boost, cfg.source_weights)
+            if scored is not None:
+                scores[q] = scores.get(q, 0.0) + scored[2]
+    for src in planned:
+        src.planner.credit(src.name, scores)
 
-    if cfg.debug:
-        by_src = {}
+
+def open_dedup_index(cfg: AppConfig) -> Optional[DedupIndex]:
+    if not (cfg.dedup_enabled and cfg.dedup_index_path):
+        return None
+    index = DedupIndex(cfg.dedup_index_path)
+    index.purge(cfg.dedup_keep_days * 86400)
+    return index
+
+
+def dedup_stage(
+    cfg: AppConfig, docs: List[SignalDoc], index: Optional[DedupIndex], skip_seen: Optional[bool] = None,
+) -> List[SignalDoc]:
+    """같은 기사/글의 사본(소스 간, 피드 간, 쿼리 간)을 하나로. skip_seen 이 None 이면 설정값."""
+    if not cfg.dedup_enabled:
+        return docs
+    if skip_seen is None:
+        skip_seen = cfg.dedup_skip_seen
+    with METRICS.span("dedup"):
+        out = dedup_docs(docs, cfg.source_weights, index=index, skip_seen=skip_seen)
+    METRICS.set("docs_before_dedup", len(docs))
+    METRICS.set("dedup_dropped", len(docs) - len(out))
+    return out
+
+
+def open_issue_state(cfg: AppConfig) -> Optional[IssueState]:
+    if not (cfg.rss_incremental and cfg.issue_state_path):
+        return None
+    state = IssueState(cfg.issue_state_path)
+    state.purge(cfg.recency_days * 86400)
+    return state
+
+
+def carry_stage(
+    cfg: AppConfig, state: Optional[IssueState], sources: List[SignalSource],
+    results: List[SourceResult], docs: List[SignalDoc],
+) -> List[CarryRow]:
+    """
+    증분 소스의 이번 문서(gate/중복 제거 통과분)를 누적 상태에 기록하고 엔트리를 '본 것'으로 표시한 뒤,
+    이번에 새로 스코어링하지 않는 예전 기여를 돌려준다. 실패/타임아웃 난 소스는 표시하지 않는다(다음에 다시).
+    """
+    if state is None:
+        return []
+    ok = {res.name for res in results if not (res.error or res.timed_out)}
+    with METRICS.span("issue_state"):
+        METRICS.set("issue_state_absorbed", state.absorb(docs, cfg.source_weights))
+        for src in sources:
+            if src.name in ok and hasattr(src, "commit_seen"):
+                src.commit_seen()
+        # 이번 문서로 다시 세는 엔트리, 다른 소스로 들어온 같은 기사는 빼고
+        exclude = {d.meta["entry"] for d in docs if "entry" in d.meta}
+        exclude.update(e for d in docs for e in d.meta.get("dup_entries", ()))
+        exclude.update(k for d in docs for k in doc_keys(d)[:1])
+        carry = state.carry(cfg.recency_days * 86400, half_life_hours=cfg.recency_half_life_hours,
+                            exclude=exclude)
+    METRICS.set("issue_state_carried", len(carry))
+    return carry
+
+
+def gate_docs(docs: List[SignalDoc]) -> List[SignalDoc]:
+    """RSS 는 택소노미 키워드가 있는 문서만 통과 (오토마톤 1-pass)."""
+    filtered_docs = []
+    with METRICS.span("gate"):
         for d in docs:
-            by_src[d.source] = by_src.get(d.source, 0) + 1
-        print(f"[DEBUG] expanded_queries={len(expanded)}")
-        print(f"[DEBUG] docs_total={len(docs)} | docs_after_filter={len(filtered_docs)}")
-        print(f"[DEBUG] docs_by_source={by_src}")
-        print("[DEBUG] sample_titles:", [x.title for x in filtered_docs[:8]])
+            if d.source == "rss_news":
+                if has_taxonomy_keyword(d.title + " " + d.text):
+                    filtered_docs.append(d)
+            else:
+                filtered_docs.append(d)
+    METRICS.set("docs_total", len(docs))
+    METRICS.set("docs_after_gate", len(filtered_docs))
+    METRICS.set("rss_gate_dropped", len(docs) - len(filtered_docs))
+    return filtered_docs
+
+
+def report_profile(
+    cfg: AppConfig, profile, filtered_docs,
+    history: Optional[IssueHistory] = None, profile_key: Optional[str] = None,
+    partial_sources: Optional[List[str]] = None, phrase_of: Optional[Callable[[str], str]] = None,
+    carry: Optional[List[CarryRow]] = None,
+) -> None:
+    with METRICS.span("score", profile=profile.product, mode=cfg.scoring_mode):
+        issues = score_issues(cfg, profile, filtered_docs, phrase_of=phrase_of, carry=carry)
+    METRICS.set("issues", len(issues), profile=profile.product)
+    trends = track_history(cfg, history, profile_key or profile.product, issues)
+    report_issues(cfg, profile, issues, trends=trends, partial_sources=partial_sources)
+
+
+def open_history(cfg: AppConfig) -> Optional[IssueHistory]:
+    if not cfg.history_path:
+        return None
+    history = IssueHistory(cfg.history_path, rising_ratio=cfg.history_rising_ratio)
+    history.purge(max(cfg.history_keep_days, 2 * cfg.history_window_days))
+    return history
 
-    # 5) 이슈 생성
-    issues = build_issues_from_docs(filtered_docs, PROFILE.taxonomy_boost, cfg.source_weights)
 
-    print(f"\n[{PROFILE.brand} - {PROFILE.product}] {PROFILE.target} / {PROFILE.age_range}")
+def track_history(
+    cfg: AppConfig, history: Optional[IssueHistory], profile_key: str, issues: List[IssueItem],
+    record: bool = True,
+) -> Dict[str, IssueTrend]:
+    """이번 랭킹을 스냅샷으로 남기고(record), 랭킹에 있는 phrase 들의 주간 추세를 돌려준다."""
+    if history is None or not issues:
+        return {}
+    with METRICS.span("history", profile=profile_key):
+        if record:
+            history.record(profile_key, issues)
+        trends = history.trends(profile_key, [it.phrase for it in issues],
+                                window_days=cfg.history_window_days)
+    METRICS.set("issues_rising", sum(t.status == RISING for t in trends.values()), profile=profile_key)
+    METRICS.set("issues_new", sum(t.status == NEW for t in trends.values()), profile=profile_key)
+    METRICS.set("issues_returning", sum(t.status == RETURNING for t in trends.values()), profile=profile_key)
+    return trends
+
+
+def issue_key_fn(
+    cfg: AppConfig, docs: List[SignalDoc], extra_texts: Iterable[str] = (),
+) -> Optional[Callable[[str], str]]:
+    """
+    issue_key_mode == "ngram" 이면 이번 문서들(+ 누적 상태의 제목 텍스트)에서 구를 뽑아
+    '제목 → 구' 함수를, 아니면 None(제목 그대로).
+    """
+    if cfg.issue_key_mode != "ngram":
+        return None
+    texts = [normalize_kw(phrase_text(d)) for d in docs]
+    texts.extend(extra_texts)
+    with METRICS.span("phrases"):
+        miner = mine_phrases(texts, max_n=cfg.phrase_max_n, min_df=cfg.phrase_min_df)
+    METRICS.set("salient_phrases", len(miner.salience))
+    return miner.phrase_of
+
+
+def score_issues(
+    cfg: AppConfig, profile, docs, top_k: int = 30, phrase_of: Optional[Callable[[str], str]] = None,
+    carry: Optional[List[CarryRow]] = None,
+) -> List[IssueItem]:
+    if cfg.scoring_mode == "columnar":
+        # numpy 는 여기서만 로드 (import 비용)
+        from analysis.columnar import build_issues_columnar
+        return build_issues_columnar(
+            docs, profile.taxonomy_boost, cfg.source_weights,
+            half_life_hours=cfg.recency_half_life_hours,
+            top_k=top_k,
+            evidence_cap=cfg.issue_evidence_cap,
+            near_dup_threshold=cfg.near_dup_threshold,
+            phrase_of=phrase_of,
+            carry=carry,
+        )
+    if cfg.scoring_mode == "parallel":
+        # 샤드를 프로세스 풀로 (issue_max_buckets 근사 없이 직렬 stream 과 같은 결과)
+        from analysis.parallel import build_issues_parallel
+        return build_issues_parallel(
+            docs, profile.taxonomy_boost, cfg.source_weights,
+            workers=cfg.analysis_workers,
+            top_k=top_k,
+            evidence_cap=cfg.issue_evidence_cap,
+            near_dup_threshold=cfg.near_dup_threshold,
+            half_life_hours=cfg.recency_half_life_hours,
+            phrase_of=phrase_of,
+            carry=carry,
+        )
+    # 스트리밍 누적 + 힙으로 TOP k 만
+    return stream_top_issues(
+        docs, profile.taxonomy_boost, cfg.source_weights,
+        top_k=top_k,
+        evidence_cap=cfg.issue_evidence_cap,
+        max_buckets=cfg.issue_max_buckets,
+        near_dup_threshold=cfg.near_dup_threshold,
+        half_life_hours=cfg.recency_half_life_hours,
+        phrase_of=phrase_of,
+        carry=carry,
+    )
+
+
+def report_issues(
+    cfg: AppConfig, profile, issues: List[IssueItem], post_slack: bool = True,
+    trends: Optional[Dict[str, IssueTrend]] = None, partial_sources: Optional[List[str]] = None,
+) -> None:
+    trends = trends or {}
+    print(f"\n[{profile.brand} - {profile.product}] {profile.target} / {profile.age_range}")
     print("최근 관심사/걱정/문제 후보 TOP 30\n")
+    if partial_sources:
+        print(f"[WARN] {partial_note(partial_sources)}\n")
 
     if not issues:
         print("[WARN] 추출된 이슈가 0개입니다.")
@@ -120,13 +469,13 @@ def main():
 
     # 콘솔에는 TOP 30 유지
     for i, it in enumerate(issues[:30], 1):
-        print(f"{i:02d}. ({it.category}) {it.phrase}  | score={it.score:.2f}")
+        print(f"{i:02d}. ({it.category}) {it.phrase}{trend_mark(trends.get(it.phrase))}  | score={it.score:.2f}")
 
     # 콘솔에는 상위 7개 링크도 출력
     print("\n상위 7개 이슈 + 관련 링크(중복 제거)\n")
     top7 = issues[:7]
     for i, it in enumerate(top7, 1):
-        print(f"[{i}] ({it.category}) {it.phrase}  | score={it.score:.2f}")
+        print(f"[{i}] ({it.category}) {it.phrase}{trend_mark(trends.get(it.phrase))}  | score={it.score:.2f}")
         links = [ev for ev in it.evidence if isinstance(ev, str) and ev.startswith("http")]
         if links:
             for j, url in enumerate(links[:5], 1):
@@ -137,8 +486,11 @@ def main():
         print()
 
     # ✅ Slack에는 TOP 7만 전송
+    if not post_slack:
+        return
     if cfg.slack_webhook_url:
-        slack_text = build_slack_message_top7(PROFILE, issues, top_n=7, link_n=5)
+        slack_text = build_slack_message_top7(profile, issues, top_n=7, link_n=5, trends=trends,
+                                              partial_sources=partial_sources)
         ok = post_to_slack(cfg.slack_webhook_url, slack_text)
         if ok:
             print("[INFO] Slack 전송 완료 (상위 7개만)")
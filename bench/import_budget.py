@@ -0,0 +1,91 @@
+"""
+시작 비용 점검: `import app` + 소스 생성까지의 import 시간이 예산 안인지,
+그리고 무거운 라이브러리(pandas/pytrends/numpy/feedparser)가 실제 fetch 전에 로드되지 않는지 확인한다.
+새 프로세스에서 `python -X importtime` 으로 잰다. 네트워크를 쓰지 않는다.
+
+    python -m bench.import_budget                # 기본 예산 300ms
+    python -m bench.import_budget --budget-ms 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "pytrends", "numpy", "feedparser"]
+
+_PROBE = """
+import json, sys
+import app
+from config import AppConfig
+cfg = AppConfig()
+cfg.naver_client_id = cfg.naver_client_id or "probe"
+cfg.naver_client_secret = cfg.naver_client_secret or "probe"
+app.build_sources(cfg)
+print("@@" + json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """`-X importtime` 출력 → {모듈: cumulative us}."""
+    out: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        out[parts[2]] = int(parts[1])
+    return out
+
+
+def measure() -> tuple[Dict[str, int], List[str]]:
+    probe = _PROBE.format(heavy=HEAVY_MODULES)
+    with tempfile.TemporaryDirectory() as cwd:
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        r = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", probe],
+            cwd=cwd, env=env, capture_output=True, text=True, timeout=120,
+        )
+    if r.returncode != 0:
+        raise RuntimeError(r.stderr[-2000:])
+    loaded: List[str] = []
+    for line in r.stdout.splitlines():
+        if line.startswith("@@"):
+            loaded = json.loads(line[2:])
+    return parse_importtime(r.stderr), loaded
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="import-time 예산 점검")
+    ap.add_argument("--budget-ms", type=float, default=300.0)
+    ap.add_argument("--top", type=int, default=10, help="느린 모듈 상위 N개 출력")
+    args = ap.parse_args(argv)
+
+    times, loaded = measure()
+    total_ms = times.get("app", 0) / 1000.0
+
+    print(f"import app: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in sorted(times.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {us / 1000.0:8.1f} ms  {name}")
+
+    ok = True
+    if total_ms > args.budget_ms:
+        print(f"[FAIL] import time {total_ms:.1f} ms > budget {args.budget_ms:.0f} ms")
+        ok = False
+    if loaded:
+        print(f"[FAIL] heavy modules loaded before any fetch: {loaded}")
+        ok = False
+    if ok:
+        print("[OK] import budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
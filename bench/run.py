@@ -0,0 +1,357 @@
+"""
+오프라인 벤치마크: 녹화된 Naver JSON / RSS XML / Trends 응답을 원하는 규모로 복제해
+파이프라인 단계별 처리 시간, 처리량, 피크 메모리를 잰다. 네트워크를 쓰지 않는다.
+
+    python -m bench.run --scale 1000 --scale 100000
+    python -m bench.run --scale 10000 --save-baseline      # 기준선 저장
+    python -m bench.run --scale 10000 --check              # 기준선 대비 회귀면 exit 1
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from sources.base import SignalDoc
+from sources.naver_search import NaverSearchSource, ENDPOINTS
+from sources.google_trends import GoogleTrendsSource
+from sources.rss_news import RssNewsSource
+
+from analysis.expander import expand_queries
+from analysis.normalize import normalize_kw
+from analysis.taxonomy import classify, has_taxonomy_keyword
+from analysis.scorer import build_issues_from_docs, stream_top_issues, merge_near_duplicates, phrase_text
+from analysis.columnar import build_issues_columnar
+from analysis.parallel import build_issues_parallel
+from analysis.dedup import dedup_docs
+from analysis.phrases import PhraseMiner
+from profiles.registry import load_profiles
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# 복제본 제목 변형용 접미어(같은 phrase 가 무한정 늘지 않도록 유한 개)
+VARIANTS = [
+    "", "후기", "질문", "고민", "경험", "조언", "정리", "공유", "문의", "걱정",
+    "방법", "원인", "해결", "상담", "추천", "비교", "체크", "루틴", "습관", "이야기",
+]
+
+SOURCE_WEIGHTS = {
+    "naver_cafearticle": 1.35,
+    "naver_blog": 1.10,
+    "naver_news": 1.05,
+    "google_trends": 0.85,
+    "rss_news": 0.70,
+}
+
+
+def _load_fixture(name: str) -> Any:
+    p = os.path.join(FIXTURE_DIR, name)
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f) if name.endswith(".json") else f.read()
+
+
+def _variant(s: str, k: int) -> str:
+    v = VARIANTS[k % len(VARIANTS)]
+    return f"{s} {v}" if v else s
+
+
+def _bare(cls):
+    # 네트워크/캐시 초기화 없이 파싱 메서드만 쓰기 위한 인스턴스
+    return cls.__new__(cls)
+
+
+# -----------------
+# 입력 준비 (측정 대상 아님)
+# -----------------
+def prepare(scale: int) -> Dict[str, Any]:
+    naver_fx = _load_fixture("naver_search.json")
+    trends_fx = _load_fixture("trends_related.json")
+    rss_xml = _load_fixture("rss_allArticle.xml")
+
+    n_naver = int(scale * 0.6)
+    n_rss = int(scale * 0.3)
+    n_trends = max(1, scale - n_naver - n_rss)
+
+    naver_items: Dict[str, List[Dict[str, Any]]] = {}
+    per_ep = max(1, n_naver // len(ENDPOINTS))
+    for endpoint, _ in ENDPOINTS:
+        src = naver_fx[endpoint]["items"]
+        items = []
+        for i in range(per_ep):
+            it = dict(src[i % len(src)])
+            it["title"] = _variant(it["title"], i // len(src))
+            items.append(it)
+        naver_items[endpoint] = items
+
+    head, _, rest = rss_xml.partition("<item>")
+    body, _, tail = ("<item>" + rest).rpartition("</item>")
+    item_blocks = [b + "</item>" for b in (body + "</item>").split("</item>") if b.strip()]
+    feeds: List[str] = []
+    made = 0
+    while made < n_rss:
+        n = min(300, n_rss - made)
+        blocks = []
+        for i in range(n):
+            k = made + i
+            blk = item_blocks[k % len(item_blocks)]
+            blk = blk.replace("<title>", "<title>" + VARIANTS[(k // len(item_blocks)) % len(VARIANTS)] + " ", 1)
+            blocks.append(blk)
+        feeds.append(head + "".join(blocks) + tail)
+        made += n
+
+    trends_cached: Dict[str, Any] = {}
+    per_seed = sum(len(v["top"]) + len(v["rising"]) for v in trends_fx.values()) / max(1, len(trends_fx))
+    n_seeds = max(1, int(n_trends / max(per_seed, 1)))
+    seeds = list(trends_fx)
+    for i in range(n_seeds):
+        seed = seeds[i % len(seeds)]
+        trends_cached[_variant(seed, i // len(seeds)) + f" {i}"] = trends_fx[seed]
+
+    profiles = load_profiles(["*"])
+    return {
+        "naver_items": naver_items,
+        "rss_feeds": feeds,
+        "trends_cached": trends_cached,
+        "seed_queries": [q for p in profiles.values() for q in p.seed_queries],
+        "taxonomy_boost": next(iter(profiles.values())).taxonomy_boost,
+    }
+
+
+# -----------------
+# 단계 정의: (이름, fn(ctx) -> 처리 건수)
+# -----------------
+def stage_expand(ctx):
+    n = 0
+    for _ in range(200):
+        n += len(expand_queries(ctx["seed_queries"], max_out=80))
+    return n
+
+
+def stage_naver_parse(ctx):
+    src = _bare(NaverSearchSource)
+    docs: List[SignalDoc] = []
+    for endpoint, source_name in ENDPOINTS:
+        records = src._records_from_items(endpoint, "bench", ctx["naver_items"][endpoint])
+        docs.extend(src._docs_from_cached(source_name, records))
+    ctx["naver_docs"] = docs
+    return sum(len(v) for v in ctx["naver_items"].values())
+
+
+def stage_rss_parse(ctx):
+    src = _bare(RssNewsSource)
+    docs: List[SignalDoc] = []
+    for i, xml in enumerate(ctx["rss_feeds"]):
+        st = src._parse_feed(xml) or {}
+        docs.extend(src._docs_from_entries(f"bench://feed/{i}", st.get("entries", [])))
+    ctx["rss_docs"] = docs
+    return len(docs)
+
+
+def stage_trends_parse(ctx):
+    src = _bare(GoogleTrendsSource)
+    docs = src._docs_from_cached(ctx["trends_cached"], "today 1-m")
+    ctx["trends_docs"] = docs
+    return len(docs)
+
+
+def _all_docs(ctx) -> List[SignalDoc]:
+    return ctx["naver_docs"] + ctx["trends_docs"] + ctx["rss_docs"]
+
+
+def stage_normalize(ctx):
+    docs = _all_docs(ctx)
+    for d in docs:
+        normalize_kw(d.title)
+    return len(docs)
+
+
+def stage_classify(ctx):
+    classify.cache_clear()
+    docs = _all_docs(ctx)
+    for d in docs:
+        classify(normalize_kw(d.title))
+    return len(docs)
+
+
+def stage_gate(ctx):
+    kept = [d for d in ctx["rss_docs"] if has_taxonomy_keyword(d.title + " " + d.text)]
+    ctx["gated_docs"] = ctx["naver_docs"] + ctx["trends_docs"] + kept
+    return len(ctx["rss_docs"])
+
+
+def stage_dedup(ctx):
+    dedup_docs(_all_docs(ctx), SOURCE_WEIGHTS)
+    return len(_all_docs(ctx))
+
+
+def stage_build_issues(ctx):
+    classify.cache_clear()
+    ctx["issues"] = build_issues_from_docs(ctx["gated_docs"], ctx["taxonomy_boost"], SOURCE_WEIGHTS)
+    return len(ctx["gated_docs"])
+
+
+def stage_stream_top(ctx):
+    classify.cache_clear()
+    stream_top_issues(iter(ctx["gated_docs"]), ctx["taxonomy_boost"], SOURCE_WEIGHTS, top_k=30)
+    return len(ctx["gated_docs"])
+
+
+def stage_columnar(ctx):
+    classify.cache_clear()
+    build_issues_columnar(ctx["gated_docs"], ctx["taxonomy_boost"], SOURCE_WEIGHTS,
+                          half_life_hours=72.0, top_k=30)
+    return len(ctx["gated_docs"])
+
+
+def stage_parallel(ctx):
+    classify.cache_clear()
+    build_issues_parallel(ctx["gated_docs"], ctx["taxonomy_boost"], SOURCE_WEIGHTS, top_k=30)
+    return len(ctx["gated_docs"])
+
+
+def stage_phrase_mining(ctx):
+    docs = ctx["gated_docs"]
+    miner = PhraseMiner().fit([normalize_kw(phrase_text(d)) for d in docs])
+    for d in docs:
+        miner.phrase_of(normalize_kw(phrase_text(d)))
+    return len(docs)
+
+
+def stage_near_dup(ctx):
+    merge_near_duplicates(ctx["issues"], threshold=0.6)
+    return len(ctx["issues"])
+
+
+STAGES: List[Tuple[str, Callable[[Dict[str, Any]], int]]] = [
+    ("expand_queries", stage_expand),
+    ("naver_parse", stage_naver_parse),
+    ("rss_parse", stage_rss_parse),
+    ("trends_parse", stage_trends_parse),
+    ("normalize_kw", stage_normalize),
+    ("classify", stage_classify),
+    ("dedup", stage_dedup),
+    ("rss_gate", stage_gate),
+    ("build_issues", stage_build_issues),
+    ("stream_top_issues", stage_stream_top),
+    ("columnar_scoring", stage_columnar),
+    ("parallel_scoring", stage_parallel),
+    ("phrase_mining", stage_phrase_mining),
+    ("near_dup_merge", stage_near_dup),
+]
+
+
+def run_scale(scale: int, repeat: int, memory: bool) -> Dict[str, Dict[str, float]]:
+    ctx = prepare(scale)
+    out: Dict[str, Dict[str, float]] = {}
+    for name, fn in STAGES:
+        best = float("inf")
+        n = 0
+        for _ in range(repeat):
+            gc.collect()
+            t0 = time.perf_counter()
+            n = fn(ctx)
+            best = min(best, time.perf_counter() - t0)
+
+        peak_kb = None
+        if memory:
+            gc.collect()
+            tracemalloc.start()
+            fn(ctx)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_kb = peak / 1024
+
+        out[name] = {
+            "items": n,
+            "seconds": best,
+            "items_per_s": (n / best) if best > 0 else 0.0,
+            "peak_kb": peak_kb,
+        }
+    return out
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for scale, stages in results.items():
+        base = baseline.get("results", {}).get(scale)
+        if not base:
+            continue
+        for name, r in stages.items():
+            b = base.get(name)
+            if not b or not b.get("seconds"):
+                continue
+            ratio = r["seconds"] / b["seconds"]
+            if ratio > 1.0 + tolerance:
+                regressions.append(f"scale={scale} {name}: {b['seconds']:.4f}s -> {r['seconds']:.4f}s (x{ratio:.2f})")
+    return regressions
+
+
+def _print_table(scale: str, stages: Dict[str, Dict[str, float]], base: Dict[str, Any] | None) -> None:
+    print(f"\n== scale={scale} ==")
+    print(f"{'stage':<20}{'items':>10}{'seconds':>11}{'items/s':>13}{'peak_kb':>11}{'vs_base':>9}")
+    for name, r in stages.items():
+        peak = f"{r['peak_kb']:.0f}" if r["peak_kb"] is not None else "-"
+        vs = "-"
+        if base and base.get(name, {}).get("seconds"):
+            vs = f"x{r['seconds'] / base[name]['seconds']:.2f}"
+        print(f"{name:<20}{int(r['items']):>10}{r['seconds']:>11.4f}{r['items_per_s']:>13.0f}{peak:>11}{vs:>9}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="trend_messenger 오프라인 단계별 벤치마크")
+    ap.add_argument("--scale", type=int, action="append", help="총 문서 수 (여러 번 지정 가능)")
+    ap.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수(최소 시간 사용)")
+    ap.add_argument("--no-memory", action="store_true", help="tracemalloc 피크 메모리 측정 생략")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--check", action="store_true", help="기준선 대비 회귀가 있으면 exit 1")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="허용 지연 비율(0.25 = 25%%)")
+    ap.add_argument("--json", help="결과 JSON 저장 경로")
+    args = ap.parse_args(argv)
+
+    scales = args.scale or [1000, 10000]
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results: Dict[str, Any] = {}
+    for scale in scales:
+        results[str(scale)] = run_scale(scale, args.repeat, memory=not args.no_memory)
+        _print_table(str(scale), results[str(scale)], baseline.get("results", {}).get(str(scale)))
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        merged = dict(baseline.get("results", {}))
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**report, "results": merged}, f, ensure_ascii=False, indent=2)
+        print(f"\n[INFO] baseline saved: {args.baseline}")
+
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+    if regressions:
+        print("\n[WARN] regressions vs baseline:")
+        for r in regressions:
+            print("  - " + r)
+    return 1 if (args.check and regressions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
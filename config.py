@@ -19,6 +19,9 @@ class AppConfig:
     language: str = "ko"
     recency_days: int = 30
     active_profile: str = "brainology_newton"
+    # 여러 프로필을 한 번에 돌릴 때(수집 1회 → 프로필별 스코어링). "*" 는 profiles/ 전체.
+    # 비어 있으면 active_profile 하나만 사용
+    active_profiles: List[str] = field(default_factory=list)
     debug: bool = True
 
     # -----------------
@@ -49,6 +52,42 @@ class AppConfig:
         "rss_news": 0.70,
     })
 
+    # -----------------
+    # 이슈 묶기: 거의 같은 제목(문자 n-gram 자카드 >= 값)은 하나로 합침. None 이면 끔
+    # -----------------
+    near_dup_threshold: float | None = 0.6
+    issue_evidence_cap: int = 20           # 이슈당 보관할 evidence 최대 개수
+    issue_max_buckets: int | None = None   # phrase 버킷 상한(넘으면 저점수 버킷 정리), None 이면 무제한
+    # 이슈 키: "title"(정규화한 제목 전체) | "ngram"(여러 문서에 반복되는 1~phrase_max_n 단어 구)
+    issue_key_mode: str = "title"
+    phrase_max_n: int = 3
+    phrase_min_df: int = 3                 # 구로 인정할 최소 문서 수
+
+    # -----------------
+    # 스코어링: "stream"(문서 단위 누적) | "columnar"(NumPy 배치 벡터 연산) | "parallel"(프로세스 풀 샤딩)
+    # 최신성 감쇠 반감기(시간). None 이면 감쇠 없음
+    # -----------------
+    scoring_mode: str = "stream"
+    analysis_workers: int | None = None    # parallel 모드 프로세스 수, None 이면 CPU 수
+    recency_half_life_hours: float | None = None
+
+    # -----------------
+    # 문서 중복 제거(정규화 URL/제목 지문). 인덱스 경로 None 이면 실행 간 기록 없이 실행 내에서만
+    # dedup_skip_seen 이면 이전 실행에서 이미 본 문서는 스코어링에서 뺀다
+    # -----------------
+    dedup_enabled: bool = True
+    dedup_index_path: str | None = ".cache/doc_index.sqlite3"
+    dedup_skip_seen: bool = False
+    dedup_keep_days: int = 90
+
+    # -----------------
+    # 이슈 히스토리(실행별 랭킹 스냅샷) → 주간 상승/신규 표시. None 이면 끔
+    # -----------------
+    history_path: str | None = ".cache/issue_history.sqlite3"
+    history_window_days: int = 7
+    history_rising_ratio: float = 1.5  # 최근/직전 윈도 일평균 비율이 이 이상이면 상승
+    history_keep_days: int = 365       # 이보다 오래된 스냅샷은 정리 (최소 2 윈도는 남긴다)
+
     # -----------------
     # RSS 피드 (육아/교육/정책)
     # -----------------
@@ -87,8 +126,85 @@ class AppConfig:
         "https://www.korea.kr/rss/dept_mogef.xml",
     ])
 
+    rss_workers: int = 8
+    # RSS 증분 수집: 이미 본 엔트리(link/guid + 내용 해시)는 다시 내보내지 않고, 예전 엔트리의 점수 기여
+    # (프로필 부스트 전)는 issue_state_path 에 남겨 매 실행 랭킹에 더한다. 경로가 None 이면 증분 끔
+    rss_incremental: bool = True
+    issue_state_path: str | None = ".cache/issue_state.sqlite3"
+
+    # -----------------
+    # 문서 캐시 TTL (소스별, 시간 단위)
+    # -----------------
+    cache_ttl_hours: Dict[str, float] = field(default_factory=lambda: {
+        "naver_search": 6.0,
+        "google_trends": 24.0,
+    })
+
     # -----------------
     # Naver API 호출 옵션
     # -----------------
     naver_max_queries: int = 25
     naver_display: int = 10
+    naver_workers: int = 8
+    naver_qps: float = 10.0  # 네이버 검색 API 초당 호출 한도
+    naver_max_pages: int = 5  # recency_days 안의 결과가 이어질 때 넘겨 볼 최대 페이지 수
+
+    # -----------------
+    # 쿼리 예산 플래너: 쿼리별 수확(새 문서/점수 기여) 기록으로 naver_max_queries 개를 고른다
+    # None 이면 끄고 기존 길이 순 선택
+    # -----------------
+    query_planner_path: str | None = ".cache/query_planner.sqlite3"
+    planner_explore_share: float = 0.2  # 예산 중 안 써 본 쿼리에 쓰는 비율
+    expand_max_out: int = 80            # 확장 쿼리 후보 수 (플래너 없을 때, 기존 길이 순 선택의 대상)
+    planner_pool_size: int = 160        # 플래너가 있을 때 넓히는 후보 풀 크기 (플래너가 고르는 대상)
+
+    # -----------------
+    # Google Trends 호출 옵션
+    # -----------------
+    trends_batch_size: int = 5
+
+    # -----------------
+    # 공용 HTTP 전송 계층: 커넥션 풀, 호스트별 동시 요청/초당 요청 상한, 서킷 브레이커
+    # naver_workers / naver_qps 는 openapi.naver.com 한도로 따로 적용된다
+    # -----------------
+    http_pool_size: int = 32
+    http_default_concurrency: int = 4
+    http_host_concurrency: Dict[str, int] = field(default_factory=lambda: {
+        "trends.google.com": 1,
+    })
+    http_host_qps: Dict[str, float] = field(default_factory=lambda: {
+        "trends.google.com": 0.5,
+    })
+    http_breaker_threshold: int = 5            # 연속 실패(네트워크 오류/5xx) 횟수
+    http_breaker_cooldown_s: float = float("inf")  # 기본: 이번 실행 동안 차단 (데몬은 tick 마다 해제)
+
+    # -----------------
+    # 실행 리포트(JSON + Prometheus textfile) 출력 디렉터리, None 이면 끔
+    # -----------------
+    metrics_dir: str | None = ".metrics"
+
+    # -----------------
+    # 수집 단계 (소스 동시 실행)
+    # -----------------
+    source_timeout_s: float = 600.0
+    source_timeouts: Dict[str, float] = field(default_factory=lambda: {
+        "google_trends": 900.0,
+        "rss_news": 180.0,
+    })
+    # 실행 전체 예산(초). 소스 예산은 이보다 늦지 않게 잘리고, 예산이 끝난 소스는 모은 만큼만 돌려준다.
+    run_budget_s: float | None = 1200.0
+    # 예산이 끝난 뒤 소스가 정리(캐시 기록 등)하고 돌아올 때까지 기다려 주는 시간
+    source_grace_s: float = 30.0
+
+    # -----------------
+    # 상주(daemon) 모드: 소스별 갱신 주기(초), Slack 전송 주기
+    # -----------------
+    daemon_intervals_s: Dict[str, float] = field(default_factory=lambda: {
+        "rss_news": 15 * 60,
+        "naver_search": 60 * 60,
+        "google_trends": 24 * 60 * 60,
+    })
+    daemon_default_interval_s: float = 60 * 60
+    daemon_slack_interval_s: float = 6 * 60 * 60
+    # 시작 직후 첫 갱신(전체 소스 수집)이 끝나면 바로 한 번 보낸다. 재시작이 잦은 배포라면 False 로 주기를 기다림
+    daemon_slack_on_start: bool = True
@@ -0,0 +1,198 @@
+"""
+상주(daemon) 모드: 프로세스를 띄워 둔 채 소스별 주기로 갱신한다.
+- 세션/TrendReq/택소노미 매처/classify 캐시를 계속 재사용 (cron 처럼 매번 콜드 스타트 X)
+- 소스마다 다른 주기(RSS 15분, Naver 1시간, Trends 1일 등)로 해당 소스만 다시 수집
+- 소스별 최근 수집 문서를 들고 있다가 갱신 때마다 그 합집합에서 중복 제거(같은 기사가 Naver 와 RSS 로 와도 한 번)
+- 이슈 랭킹은 (프로필, 소스) 단위 부분 누적기를 갱신됐거나 중복 제거 결과가 바뀐 소스만 다시 만들고 합쳐서 유지
+  (issue_key_mode=ngram 이면 구 마이닝을 전 소스 문서로 한 번 하고, 키가 바뀌므로 부분 누적기를 모두 다시 만든다)
+- Slack 은 설정한 주기로만 전송
+
+    python daemon.py
+"""
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from typing import Dict, List, Set
+
+from config import AppConfig
+from metrics import METRICS
+from profiles.registry import load_profiles
+
+from sources.base import SignalDoc, SignalSource
+from sources.collector import collect_concurrently
+from sources.deadline import Deadline
+
+from analysis.running import CarryRow
+from analysis.scorer import IssueAccumulator, IssueItem
+
+from app import (
+    build_sources, build_transport, carry_stage, credit_query_yield, dedup_stage, expand_for_profiles, gate_docs,
+    issue_key_fn, log_source_results, open_dedup_index, open_history, open_issue_state, query_pool_size,
+    report_issues, track_history,
+)
+
+
+class TrendDaemon:
+    def __init__(self, cfg: AppConfig):
+        self.cfg = cfg
+        self.profiles = load_profiles(cfg.active_profiles or [cfg.active_profile])
+        self.transport = build_transport(cfg)
+        self.sources: List[SignalSource] = build_sources(cfg, self.transport)
+        self.expanded = expand_for_profiles(self.profiles, max_out=query_pool_size(cfg, self.sources))
+
+        self.intervals: Dict[str, float] = {}
+        for src in self.sources:
+            name = src.name
+            interval = float(cfg.daemon_intervals_s.get(name, cfg.daemon_default_interval_s))
+            self.intervals[name] = interval
+            # 캐시 TTL 이 갱신 주기보다 길면 캐시 히트로 새 데이터가 안 들어온다
+            if hasattr(src, "cache_ttl_s"):
+                src.cache_ttl_s = min(src.cache_ttl_s, interval * 0.9)
+
+        self.next_due: Dict[str, float] = {src.name: 0.0 for src in self.sources}
+        # 첫 tick 은 모든 소스가 갱신 대상이라 랭킹이 완성돼 있다 → 설정에 따라 바로 전송
+        self.next_slack = time.monotonic() + (0.0 if cfg.daemon_slack_on_start else cfg.daemon_slack_interval_s)
+        # 소스 → 최근 수집 문서(중복 제거 전) / 스코어링에 넣는 문서(중복 제거·gate 후)와 그 지문
+        self.latest: Dict[str, List[SignalDoc]] = {}
+        self.docs: Dict[str, List[SignalDoc]] = {}
+        self.kept: Dict[str, int] = {}
+        # (프로필, 소스) → 부분 누적기
+        self.partials: Dict[str, Dict[str, IssueAccumulator]] = {p: {} for p in self.profiles}
+        # 누적 상태(증분 RSS 의 예전 엔트리) 기여: 최근 carry 행, 프로필 → 누적기
+        self.carry: List[CarryRow] = []
+        self.carried: Dict[str, IssueAccumulator] = {}
+        self.history = open_history(cfg)
+        self.dedup_index = open_dedup_index(cfg)
+        self.issue_state = open_issue_state(cfg)
+        self.degraded: Set[str] = set()  # 최근 갱신이 예산 초과로 덜 받은 소스
+        self._stop = threading.Event()
+
+    def stop(self, *_args) -> None:
+        self._stop.set()
+
+    def _new_acc(self, profile, phrase_of=None) -> IssueAccumulator:
+        return IssueAccumulator(
+            profile.taxonomy_boost, self.cfg.source_weights,
+            evidence_cap=self.cfg.issue_evidence_cap,
+            max_buckets=self.cfg.issue_max_buckets,
+            half_life_hours=self.cfg.recency_half_life_hours,
+            phrase_of=phrase_of,
+        )
+
+    def refresh(self, due: List[SignalSource]) -> None:
+        with METRICS.span("collect"):
+            _, results = collect_concurrently(
+                due, self.expanded, self.cfg.recency_days,
+                timeout_s=self.cfg.source_timeout_s,
+                timeouts=self.cfg.source_timeouts,
+                run_deadline=Deadline.after(self.cfg.run_budget_s),
+                grace_s=self.cfg.source_grace_s,
+            )
+        log_source_results(self.cfg, results)
+
+        fresh: Set[str] = set()
+        for res in results:
+            # 예산 때문에 덜 받은 소스는 다음 갱신에서 제대로 받을 때까지 리포트에 표시
+            if res.truncated or res.timed_out:
+                self.degraded.add(res.name)
+            else:
+                self.degraded.discard(res.name)
+            if res.error or res.timed_out:
+                # 실패한 소스는 직전 결과를 유지
+                continue
+            self.latest[res.name] = res.docs
+            fresh.add(res.name)
+        if not fresh:
+            return
+        refreshed = [s for s in due if s.name in fresh]
+
+        # 중복 제거는 소스별이 아니라 최근 문서 전체(합집합)에서: 다른 소스의 같은 기사도 한 번만 센다.
+        # 같은 문서를 갱신마다 다시 합치므로 '이전 실행에서 본 문서 건너뛰기'는 쓰지 않는다
+        union = [d for src in self.sources for d in self.latest.get(src.name, ())]
+        docs = gate_docs(dedup_stage(self.cfg, union, self.dedup_index, skip_seen=False))
+        credit_query_yield(self.cfg, refreshed, docs, self.profiles)
+        # 증분 소스(RSS)는 새 엔트리만 오므로 예전 엔트리 기여는 누적 상태에서
+        # (다른 소스의 최근 문서와 같은 기사는 빼야 하므로 갱신마다 다시 꺼낸다)
+        self.carry = carry_stage(self.cfg, self.issue_state, refreshed,
+                                 [res for res in results if res.name in fresh], docs)
+
+        # 문서 소스(naver_news 등) → 수집 소스(naver_search)
+        owner = {d.source: name for name, ds in self.latest.items() for d in ds}
+        by_src: Dict[str, List[SignalDoc]] = {name: [] for name in self.latest}
+        for d in docs:
+            by_src[owner[d.source]].append(d)
+        changed = set(fresh)
+        for name, part in by_src.items():
+            sig = hash(tuple((d.source, d.url, d.title) for d in part))
+            if self.kept.get(name) != sig:
+                self.kept[name] = sig
+                changed.add(name)
+        self.docs = by_src
+
+        # 구 마이닝은 전 소스의 최근 문서 + 누적 상태 텍스트로 한 번 (소스마다 따로 뽑으면 같은 관심사가
+        # 소스별로 다른 키가 되어 합쳐지지 않는다). 키가 바뀌므로 이때는 모든 부분 누적기를 다시 만든다
+        phrase_of = issue_key_fn(self.cfg, docs, extra_texts=(row[0] for row in self.carry))
+        rebuild = set(self.docs) if phrase_of is not None else changed
+        for name in rebuild:
+            for pname, profile in self.profiles.items():
+                with METRICS.span("score", profile=profile.product, source=name):
+                    self.partials[pname][name] = self._new_acc(profile, phrase_of).add_many(self.docs[name])
+        for pname, profile in self.profiles.items():
+            self.carried[pname] = self._new_acc(profile, phrase_of).add_carry(self.carry)
+
+    def ranking(self, pname: str, top_k: int = 30) -> List[IssueItem]:
+        acc = self._new_acc(self.profiles[pname])
+        for src in self.sources:
+            part = self.partials[pname].get(src.name)
+            if part is not None:
+                acc.merge(part)
+        carried = self.carried.get(pname)
+        if carried is not None:
+            acc.merge(carried)
+        return acc.top(top_k, self.cfg.near_dup_threshold)
+
+    def tick(self) -> None:
+        now = time.monotonic()
+        due = [s for s in self.sources if self.next_due[s.name] <= now]
+        if due:
+            METRICS.reset()
+            # 브레이커는 '한 번의 갱신' 단위로: 다음 갱신에서는 죽었던 호스트도 다시 시도
+            self.transport.reset_breakers()
+            self.refresh(due)
+            for s in due:
+                self.next_due[s.name] = time.monotonic() + self.intervals[s.name]
+
+        post = time.monotonic() >= self.next_slack
+        if due or post:
+            for pname, profile in self.profiles.items():
+                issues = self.ranking(pname)
+                # 히스토리 스냅샷은 Slack 주기마다만 (tick 마다 쌓으면 하루 수십 번)
+                trends = track_history(self.cfg, self.history, pname, issues, record=post)
+                report_issues(self.cfg, profile, issues, post_slack=post, trends=trends,
+                              partial_sources=[s.name for s in self.sources if s.name in self.degraded])
+            if self.cfg.metrics_dir:
+                METRICS.write(self.cfg.metrics_dir)
+        if post:
+            self.next_slack = time.monotonic() + self.cfg.daemon_slack_interval_s
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            self.tick()
+            wake = min(min(self.next_due.values()), self.next_slack)
+            self._stop.wait(max(1.0, wake - time.monotonic()))
+
+
+def main():
+    cfg = AppConfig()
+    daemon = TrendDaemon(cfg)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    print(f"[INFO] daemon started: intervals={daemon.intervals} slack_every={cfg.daemon_slack_interval_s}s")
+    daemon.run_forever()
+    print("[INFO] daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
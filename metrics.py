@@ -0,0 +1,154 @@
+"""
+실행 단위 계측: 타이밍 span, 카운터, 게이지, 관측값(요약 통계).
+실행이 끝나면 JSON 리포트와 Prometheus textfile(node_exporter textfile collector 용)로 내보낸다.
+
+    from metrics import METRICS
+    with METRICS.span("expand"):
+        ...
+    METRICS.inc("naver_requests", endpoint="news")
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+PROM_PREFIX = "trend_messenger"
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prom_name(name: str) -> str:
+    return PROM_PREFIX + "_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _prom_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    esc = [(k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for k, v in labels]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in esc) + "}"
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """새 실행(데몬의 tick 등)을 위해 비운다."""
+        self.started_at = time.time()
+        self._t0 = time.monotonic()
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[LabelKey, float] = {}
+        self.gauges: Dict[LabelKey, float] = {}
+        self.observations: Dict[LabelKey, List[float]] = {}  # [count, sum, max]
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[None]:
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.monotonic() - t0, start=t0 - self._t0, **labels)
+
+    def record_span(self, name: str, duration_s: float, start: float | None = None, **labels: Any) -> None:
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "labels": {k: str(v) for k, v in labels.items()},
+                "start_s": round(start if start is not None else time.monotonic() - self._t0 - duration_s, 6),
+                "duration_s": round(duration_s, 6),
+            })
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        k = _key(name, labels)
+        with self._lock:
+            self.counters[k] = self.counters.get(k, 0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        k = _key(name, labels)
+        with self._lock:
+            o = self.observations.setdefault(k, [0, 0.0, 0.0])
+            o[0] += 1
+            o[1] += value
+            o[2] = max(o[2], value)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        return self.counters.get(_key(name, labels), 0)
+
+    # -----------------
+    # 내보내기
+    # -----------------
+    def snapshot(self) -> Dict[str, Any]:
+        def rows(d: Dict[LabelKey, Any], conv) -> List[Dict[str, Any]]:
+            return [{"name": n, "labels": dict(lb), **conv(v)} for (n, lb), v in sorted(d.items())]
+
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "elapsed_s": round(time.monotonic() - self._t0, 6),
+                "spans": list(self.spans),
+                "counters": rows(self.counters, lambda v: {"value": v}),
+                "gauges": rows(self.gauges, lambda v: {"value": v}),
+                "observations": rows(self.observations, lambda v: {"count": v[0], "sum": v[1], "max": v[2]}),
+            }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        typed: set = set()
+
+        def emit(name: str, kind: str, labels, value: float) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{_prom_labels(labels)} {float(value)!r}")
+
+        with self._lock:
+            span_tot: Dict[LabelKey, float] = {}
+            for s in self.spans:
+                k = _key(s["name"], s["labels"])
+                span_tot[k] = span_tot.get(k, 0.0) + s["duration_s"]
+            for (n, lb), v in sorted(span_tot.items()):
+                emit(_prom_name("stage_duration_seconds"), "gauge", (("stage", n),) + lb, v)
+            for (n, lb), v in sorted(self.counters.items()):
+                emit(_prom_name(n + "_total"), "counter", lb, v)
+            for (n, lb), v in sorted(self.gauges.items()):
+                emit(_prom_name(n), "gauge", lb, v)
+            for (n, lb), (cnt, tot, mx) in sorted(self.observations.items()):
+                emit(_prom_name(n + "_count"), "gauge", lb, cnt)
+                emit(_prom_name(n + "_sum"), "gauge", lb, tot)
+                emit(_prom_name(n + "_max"), "gauge", lb, mx)
+            emit(_prom_name("run_elapsed_seconds"), "gauge", (), time.monotonic() - self._t0)
+            emit(_prom_name("run_timestamp_seconds"), "gauge", (), time.time())
+        return "\n".join(lines) + "\n"
+
+    def write(self, out_dir: str, name: str = "trend_messenger") -> Tuple[str, str]:
+        """JSON 리포트 + Prometheus textfile 을 out_dir 에 쓴다 (tmp → rename 으로 원자적 교체)."""
+        os.makedirs(out_dir, exist_ok=True)
+        json_path = os.path.join(out_dir, f"{name}.json")
+        prom_path = os.path.join(out_dir, f"{name}.prom")
+        for path, body in (
+            (json_path, json.dumps(self.snapshot(), ensure_ascii=False, indent=2)),
+            (prom_path, self.to_prometheus()),
+        ):
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        return json_path, prom_path
+
+
+# 프로세스 기본 레지스트리
+METRICS = Metrics()
@@ -0,0 +1,34 @@
+import importlib
+import os
+from typing import Dict, List
+
+_PROFILE_DIR = os.path.dirname(os.path.abspath(__file__))
+_NON_PROFILE_MODULES = {"init", "registry"}
+
+
+def available_profiles() -> List[str]:
+    """profiles/ 아래에서 PROFILE 을 정의한 모듈 이름 목록."""
+    names = []
+    for fn in sorted(os.listdir(_PROFILE_DIR)):
+        name, ext = os.path.splitext(fn)
+        if ext != ".py" or name.startswith("_") or name in _NON_PROFILE_MODULES:
+            continue
+        names.append(name)
+    return names
+
+
+def load_profile(name: str):
+    mod = importlib.import_module(f"profiles.{name}")
+    profile = getattr(mod, "PROFILE", None)
+    if profile is None:
+        raise ValueError(f"profiles.{name} 에 PROFILE 이 없습니다.")
+    return profile
+
+
+def load_profiles(names: List[str]) -> Dict[str, object]:
+    """
+    이름 목록 → {이름: BrandProfile}. "*" 가 있으면 profiles/ 아래 전부.
+    """
+    if "*" in names:
+        names = available_profiles()
+    return {n: load_profile(n) for n in dict.fromkeys(names)}
@@ -1,19 +1,114 @@
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Any, Mapping, Optional
 from datetime import datetime
 
-@dataclass
+from .deadline import NO_DEADLINE, Deadline
+
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+
+@lru_cache(maxsize=65536)
+def _shared_meta(items: tuple) -> Mapping[str, Any]:
+    return MappingProxyType({k: v for k, _t, v in items})
+
+
+def shared_meta(**kv: Any) -> Mapping[str, Any]:
+    """
+    같은 내용의 meta 는 하나의 읽기 전용 매핑을 공유한다(문서마다 dict 를 만들지 않음).
+    값 종류가 적은 키(query/endpoint/feed 등)에만 쓴다. 문서마다 다른 값이 섞이면 캐시만 밀어낸다.
+    값이 해시 불가면 공유하지 않고 그대로 감싼다.
+    """
+    if not kv:
+        return _EMPTY_META
+    try:
+        # 1 / 1.0 / True 가 같은 키로 섞이지 않게 타입도 키에 넣는다
+        return _shared_meta(tuple((k, type(v), v) for k, v in kv.items()))
+    except TypeError:
+        return MappingProxyType(kv)
+
+
 class SignalDoc:
-    source: str
-    title: str
-    text: str
-    url: str
-    published_at: datetime | None
-    meta: Dict[str, Any]
+    """
+    수집 문서 1건. 수십만 건을 메모리에 올리므로 __slots__ 로 인스턴스 dict 를 없앴다.
+    - source 는 intern, meta 는 없으면 공용 빈 매핑(읽기 전용)
+    - text 를 주지 않고 description 을 주면 text 는 title + sep + description 으로 필요할 때 만든다
+    """
+    __slots__ = ("source", "title", "_text", "description", "sep", "url", "published_at", "_meta")
+
+    def __init__(
+        self,
+        source: str,
+        title: str,
+        text: Optional[str] = None,
+        url: str = "",
+        published_at: datetime | None = None,
+        meta: Optional[Mapping[str, Any]] = None,
+        description: str = "",
+        sep: str = " ",
+    ):
+        self.source = sys.intern(source)
+        self.title = title
+        self._text = text
+        self.description = description
+        self.sep = sep
+        self.url = url
+        self.published_at = published_at
+        self._meta = meta or None
+
+    @property
+    def text(self) -> str:
+        if self._text is not None:
+            return self._text
+        if self.description:
+            return self.title + self.sep + self.description
+        return self.title
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._text = value
+
+    @property
+    def meta(self) -> Mapping[str, Any]:
+        return self._meta if self._meta is not None else _EMPTY_META
+
+    @meta.setter
+    def meta(self, value: Optional[Mapping[str, Any]]) -> None:
+        self._meta = value or None
+
+    def with_meta(self, meta: Optional[Mapping[str, Any]]) -> "SignalDoc":
+        """meta 만 바꾼 사본. 원본은 다른 곳(상주 모드의 최근 문서 등)과 공유될 수 있어 고치지 않는다."""
+        return SignalDoc(self.source, self.title, self._text, self.url, self.published_at,
+                         meta, self.description, self.sep)
+
+    def _astuple(self) -> tuple:
+        return (self.source, self.title, self.text, self.url, self.published_at, dict(self.meta))
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    __hash__ = None  # dataclass(eq=True) 와 같게
+
+    def __repr__(self) -> str:
+        return (f"SignalDoc(source={self.source!r}, title={self.title!r}, text={self.text!r}, "
+                f"url={self.url!r}, published_at={self.published_at!r}, meta={dict(self.meta)!r})")
+
+    def __reduce__(self):
+        # MappingProxyType 은 pickle 이 안 되므로 dict 로 풀어서 보낸다
+        meta = dict(self._meta) if self._meta is not None else None
+        return (SignalDoc, (self.source, self.title, self._text, self.url, self.published_at,
+                            meta, self.description, self.sep))
+
 
 class SignalSource(ABC):
     name: str
+    # 수집 예산: collector 가 fetch 직전에 넣어 준다. 예산이 끝나면 fetch 는 모은 만큼만 반환하고 truncated=True
+    deadline: Deadline = NO_DEADLINE
+    truncated: bool = False
 
     @abstractmethod
     def fetch(self, queries: List[str], recency_days: int) -> List[SignalDoc]:
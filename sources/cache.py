@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .codec import DEFAULT_CODEC, JsonCodec, decode
+
+
+def normalize_query(q: str) -> str:
+    return " ".join((q or "").split()).lower()
+
+
+class DocCache:
+    """
+    (source, endpoint, 정규화된 query) 단위로 응답을 저장하는 SQLite 캐시.
+    - 엔트리마다 fetched_at 을 기록하고, 읽을 때 소스별 TTL 로 신선도를 판단
+    - 날짜가 바뀌거나 쿼리 하나가 바뀌어도 나머지 엔트리는 그대로 재사용
+    - payload 는 codec 으로 인코딩한 BLOB (기본 zlib JSON). 예전 평문 JSON 행도 그대로 읽힌다
+    """
+    def __init__(self, path: str, codec: JsonCodec = DEFAULT_CODEC):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.path = path
+        self.codec = codec
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS doc_cache ("
+                " source TEXT NOT NULL,"
+                " endpoint TEXT NOT NULL,"
+                " query TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " PRIMARY KEY (source, endpoint, query))"
+            )
+            self._conn.commit()
+
+    def get(self, source: str, endpoint: str, query: str, ttl_s: float) -> Any | None:
+        return self.get_many(source, endpoint, [query], ttl_s).get(query)
+
+    def get_many(self, source: str, endpoint: str, queries: Iterable[str], ttl_s: float) -> Dict[str, Any]:
+        """TTL 안에 있는 엔트리만 {원래 query: payload} 로 반환."""
+        by_norm: Dict[str, List[str]] = {}
+        for q in queries:
+            by_norm.setdefault(normalize_query(q), []).append(q)
+        if not by_norm:
+            return {}
+
+        min_ts = time.time() - ttl_s
+        out: Dict[str, Any] = {}
+        norms = list(by_norm)
+        with self._lock:
+            for i in range(0, len(norms), 500):
+                chunk = norms[i:i + 500]
+                rows = self._conn.execute(
+                    "SELECT query, payload FROM doc_cache"
+                    " WHERE source=? AND endpoint=? AND fetched_at>=?"
+                    f" AND query IN ({','.join('?' * len(chunk))})",
+                    (source, endpoint, min_ts, *chunk),
+                ).fetchall()
+                for nq, payload in rows:
+                    try:
+                        data = decode(payload)
+                    except (ValueError, zlib.error):
+                        continue
+                    for q in by_norm[nq]:
+                        out[q] = data
+        return out
+
+    def put(self, source: str, endpoint: str, query: str, payload: Any) -> None:
+        self.put_many(source, endpoint, {query: payload})
+
+    def put_many(
+        self,
+        source: str,
+        endpoint: str,
+        payloads: Dict[str, Any],
+        fetched_at: Optional[float] = None,
+        replace: bool = True,
+    ) -> None:
+        """replace=False 면 이미 있는 엔트리는 건드리지 않는다(마이그레이션용)."""
+        now = time.time() if fetched_at is None else fetched_at
+        rows = [
+            (source, endpoint, normalize_query(q), now, self.codec.encode(p))
+            for q, p in payloads.items()
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO doc_cache (source, endpoint, query, fetched_at, payload)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def purge(self, older_than_s: float, source: Optional[str] = None) -> int:
+        """source 를 주면 그 소스 엔트리만 (소스마다 TTL 이 달라 같은 파일을 쓰는 다른 소스는 건드리지 않는다)."""
+        cutoff = time.time() - older_than_s
+        with self._lock:
+            if source is None:
+                cur = self._conn.execute("DELETE FROM doc_cache WHERE fetched_at<?", (cutoff,))
+            else:
+                cur = self._conn.execute("DELETE FROM doc_cache WHERE source=? AND fetched_at<?", (source, cutoff))
+            self._conn.commit()
+            return cur.rowcount
+
+
+def iter_legacy_json(cache_dir: str, pattern: str) -> Iterator[Tuple[re.Match, Any, float]]:
+    """
+    예전 일자별 JSON 캐시 파일(파일명이 pattern 에 맞는 것)을 (match, 내용, mtime) 으로 넘겨주고,
+    소비가 끝나면 *.migrated 로 이름을 바꿔 다시 읽지 않게 한다. 깨진 파일은 그냥 치운다.
+    """
+    rx = re.compile(pattern)
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return
+    for fn in sorted(names):
+        m = rx.fullmatch(fn)
+        if not m:
+            continue
+        path = os.path.join(cache_dir, fn)
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if data is not None:
+            yield m, data, mtime
+        try:
+            os.replace(path, path + ".migrated")
+        except OSError:
+            pass
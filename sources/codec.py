@@ -0,0 +1,124 @@
+"""
+캐시 직렬화 코덱 + 레코드 파일 포맷.
+
+- 코덱: 객체 ↔ bytes. 첫 바이트가 코덱 태그라 섞여 있어도 알아서 디코드한다.
+    b"j" JSON(압축 없음), b"z" zlib 압축 JSON(기본)
+- 레코드 파일: MAGIC + [4바이트 길이(big-endian) + 코덱 bytes] * N
+  mmap 으로 열어 레코드 단위로 스트리밍 디코드, 쓰기는 tmp → fsync → rename 으로 원자적 교체.
+  중간에 잘린 파일은 마지막 온전한 레코드까지만 읽는다.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Any, Dict, Iterable, Iterator
+
+MAGIC = b"TMREC1\n"
+_LEN = struct.Struct(">I")
+
+
+class JsonCodec:
+    tag = b"j"
+
+    def encode(self, obj: Any) -> bytes:
+        return self.tag + json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def decode_body(self, body: bytes) -> Any:
+        return json.loads(body)
+
+
+class ZlibJsonCodec(JsonCodec):
+    tag = b"z"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def encode(self, obj: Any) -> bytes:
+        raw = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return self.tag + zlib.compress(raw, self.level)
+
+    def decode_body(self, body: bytes) -> Any:
+        return json.loads(zlib.decompress(body))
+
+
+JSON = JsonCodec()
+ZLIB_JSON = ZlibJsonCodec()
+DEFAULT_CODEC = ZLIB_JSON
+
+_BY_TAG: Dict[bytes, JsonCodec] = {JSON.tag: JSON, ZLIB_JSON.tag: ZLIB_JSON}
+
+
+def decode(data: bytes | str) -> Any:
+    """태그를 보고 디코드. 태그 없는 str 은 예전 평문 JSON 으로 본다."""
+    if isinstance(data, str):
+        return json.loads(data)
+    codec = _BY_TAG.get(bytes(data[:1]))
+    if codec is None:
+        return json.loads(data)
+    return codec.decode_body(bytes(data[1:]))
+
+
+# -----------------
+# 원자적 쓰기
+# -----------------
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    d = os.path.dirname(path) or "."
+    os.makedirs(d, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=d)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# -----------------
+# 레코드 파일
+# -----------------
+def dump_records(path: str, records: Iterable[Any], codec: JsonCodec = DEFAULT_CODEC) -> int:
+    parts = [MAGIC]
+    n = 0
+    for r in records:
+        body = codec.encode(r)
+        parts.append(_LEN.pack(len(body)))
+        parts.append(body)
+        n += 1
+    atomic_write_bytes(path, b"".join(parts))
+    return n
+
+
+def iter_records(path: str) -> Iterator[Any]:
+    """레코드를 하나씩 디코드. 파일이 없거나 포맷이 다르면 빈 이터레이터."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size < len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                return
+            pos = len(MAGIC)
+            while pos + _LEN.size <= size:
+                (n,) = _LEN.unpack_from(mm, pos)
+                pos += _LEN.size
+                if pos + n > size:
+                    break  # 잘린 꼬리
+                try:
+                    yield decode(mm[pos:pos + n])
+                except (ValueError, zlib.error):
+                    break
+                pos += n
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from metrics import METRICS
+
+from .base import SignalSource, SignalDoc
+from .deadline import Deadline
+
+
+@dataclass
+class SourceResult:
+    name: str
+    docs: List[SignalDoc] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    error: Optional[str] = None
+    timed_out: bool = False
+    truncated: bool = False  # 예산이 끝나 모은 만큼만 반환
+
+
+def _source_name(src: SignalSource) -> str:
+    return getattr(src, "name", None) or type(src).__name__
+
+
+def collect_concurrently(
+    sources: List[SignalSource],
+    queries: List[str],
+    recency_days: int,
+    timeout_s: float = 600.0,
+    timeouts: Dict[str, float] | None = None,
+    run_deadline: Optional[Deadline] = None,
+    grace_s: float = 30.0,
+) -> tuple[List[SignalDoc], List[SourceResult]]:
+    """
+    모든 소스를 동시에 fetch 하고, 끝나는 순서대로 문서를 합친다.
+    - 소스별 예산(timeouts[name], 없으면 timeout_s), run_deadline 이 있으면 그보다 늦지 않게
+    - 소스는 예산(src.deadline)을 보고 스스로 멈춰 모은 만큼 반환 → truncated
+    - 그래도 예산 + grace_s 안에 안 끝나면 기다리지 않고 timed_out (그 소스 결과는 버림)
+    - 한 소스의 예외/지연이 다른 소스에 영향 주지 않음
+    타임아웃 난 소스의 스레드는 daemon 이라 프로세스 종료를 막지 않는다.
+    """
+    timeouts = timeouts or {}
+    done_q: "queue.Queue[SourceResult]" = queue.Queue()
+
+    def _run(src: SignalSource, name: str) -> None:
+        t0 = time.monotonic()
+        res = SourceResult(name=name)
+        try:
+            res.docs = list(src.fetch(queries, recency_days) or [])
+        except Exception as e:
+            res.error = f"{type(e).__name__}: {e}"
+        res.truncated = bool(getattr(src, "truncated", False))
+        res.elapsed_s = time.monotonic() - t0
+        METRICS.record_span("source", res.elapsed_s, source=name)
+        done_q.put(res)
+
+    started = time.monotonic()
+    deadlines: Dict[str, float] = {}
+    for src in sources:
+        name = _source_name(src)
+        budget_at = started + float(timeouts.get(name, timeout_s))
+        if run_deadline is not None and run_deadline.at is not None:
+            budget_at = min(budget_at, run_deadline.at)
+        src.deadline = Deadline(budget_at)
+        src.truncated = False
+        deadlines[name] = budget_at + grace_s
+        threading.Thread(target=_run, args=(src, name), name=f"fetch-{name}", daemon=True).start()
+
+    docs: List[SignalDoc] = []
+    results: Dict[str, SourceResult] = {}
+    pending = set(deadlines)
+
+    while pending:
+        wait_s = max(0.0, min(deadlines[n] for n in pending) - time.monotonic())
+        try:
+            res = done_q.get(timeout=wait_s)
+        except queue.Empty:
+            res = None
+
+        if res is not None:
+            if res.name not in pending:
+                # 이미 타임아웃 처리된 소스가 뒤늦게 끝난 경우 버린다.
+                continue
+            pending.discard(res.name)
+            results[res.name] = res
+            docs.extend(res.docs)
+            continue
+
+        now = time.monotonic()
+        for n in [n for n in pending if deadlines[n] <= now]:
+            pending.discard(n)
+            results[n] = SourceResult(name=n, elapsed_s=now - started, timed_out=True)
+
+    ordered = [results[_source_name(s)] for s in sources]
+    for res in ordered:
+        METRICS.set("source_docs", len(res.docs), source=res.name)
+        METRICS.set("source_seconds", res.elapsed_s, source=res.name)
+        if res.error:
+            METRICS.inc("source_errors", source=res.name)
+        if res.timed_out:
+            METRICS.inc("source_timeouts", source=res.name)
+        if res.truncated:
+            METRICS.inc("source_truncated", source=res.name)
+    return docs, ordered
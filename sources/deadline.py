@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    monotonic 기준 마감 시각. fetch 루프/재시도 sleep 이 이걸 보고 예산 안에서만 돈다.
+    Deadline(None) 은 마감 없음.
+    """
+    __slots__ = ("at",)
+
+    def __init__(self, at: Optional[float]):
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> "Deadline":
+        return cls(None if seconds is None else time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        if self.at is None:
+            return float("inf")
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() >= self.at
+
+    def sleep(self, seconds: float) -> bool:
+        """남은 예산까지만 잔다. 다 자고도 예산이 남아 있으면 True."""
+        rem = self.remaining()
+        if seconds < rem:
+            time.sleep(seconds)
+            return True
+        time.sleep(rem)
+        return False
+
+    def cap(self, timeout: float) -> float:
+        """요청 타임아웃을 남은 예산으로 자른다(최소 0.1초)."""
+        return max(0.1, min(timeout, self.remaining()))
+
+
+NO_DEADLINE = Deadline(None)
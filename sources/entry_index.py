@@ -0,0 +1,75 @@
+"""
+RSS 엔트리 인덱스: 엔트리 키(link → guid → title) 해시 → (내용 해시, 처음/마지막 본 시각).
+증분 수집에서 '새 엔트리 / 내용이 바뀐 엔트리'만 골라내는 데 쓴다.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Set, Tuple
+
+
+def _h64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def entry_key(e: Dict[str, Any]) -> int:
+    # link 우선: guid 를 저장하기 전의 피드 상태로 만든 키와도 같게
+    return _h64(e.get("link") or e.get("id") or e.get("title", ""))
+
+
+def entry_content(e: Dict[str, Any]) -> int:
+    return _h64("\x00".join((e.get("title", ""), e.get("summary", ""), e.get("published") or "")))
+
+
+class EntryIndex:
+    def __init__(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rss_entries ("
+                " h INTEGER PRIMARY KEY,"
+                " content INTEGER NOT NULL,"
+                " first_seen REAL NOT NULL,"
+                " last_seen REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def changed(self, items: Iterable[Tuple[int, int]]) -> Set[int]:
+        """(키, 내용 해시) 중 처음 보거나 내용이 바뀐 키."""
+        items = dict(items)
+        keys = list(items)
+        known: Dict[int, int] = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT h, content FROM rss_entries WHERE h IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                known.update(rows)
+        return {h for h, c in items.items() if known.get(h) != c}
+
+    def mark(self, items: Iterable[Tuple[int, int]]) -> None:
+        now = time.time()
+        rows = [(h, c, now, now) for h, c in dict(items).items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO rss_entries (h, content, first_seen, last_seen) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(h) DO UPDATE SET content=excluded.content, last_seen=excluded.last_seen",
+                rows,
+            )
+            self._conn.commit()
+
+    def purge(self, older_than_s: float) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM rss_entries WHERE last_seen<?", (time.time() - older_than_s,))
+            self._conn.commit()
+            return cur.rowcount
@@ -1,46 +1,48 @@
 from __future__ import annotations
 
-import json
 import os
 import random
-import time
-from datetime import datetime
-from typing import List, Dict, Any
+from collections import deque
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional
 
-from pytrends.request import TrendReq
-from pytrends import exceptions as pytrends_ex
+from metrics import METRICS
 
 from .base import SignalSource, SignalDoc
+from .cache import DocCache, iter_legacy_json
+from .transport import CircuitOpenError, HttpTransport, get_transport
+
+TRENDS_HOST = "trends.google.com"
 
 
 class GoogleTrendsSource(SignalSource):
     name = "google_trends"
 
-    def __init__(self, hl: str = "ko-KR", tz: int = 540, cache_dir: str = ".cache"):
+    def __init__(self, hl: str = "ko-KR", tz: int = 540, cache_dir: str = ".cache",
+                 cache_ttl_s: float = 24 * 3600, batch_size: int = 5,
+                 transport: Optional[HttpTransport] = None):
         self.hl = hl
         self.tz = tz
-        self.pytrends = TrendReq(hl=hl, tz=tz)
+        # TrendReq 는 생성 시 구글에 쿠키 요청을 보내고 pytrends/pandas import 도 무겁다.
+        # 캐시로 끝나는 실행에서는 만들지 않도록 실제 호출 직전까지 미룬다.
+        self._pytrends = None
         self.cache_dir = cache_dir
+        self.cache_ttl_s = cache_ttl_s
+        self.transport = transport or get_transport()
+        # pytrends payload 는 최대 5개 키워드까지
+        self.batch_size = max(1, min(int(batch_size), 5))
         os.makedirs(self.cache_dir, exist_ok=True)
-
-    def _cache_path(self, timeframe: str) -> str:
-        day = datetime.now().strftime("%Y-%m-%d")
-        return os.path.join(self.cache_dir, f"trends_related_{day}_{timeframe}.json")
-
-    def _load_cache(self, timeframe: str) -> Dict[str, Any] | None:
-        p = self._cache_path(timeframe)
-        if os.path.exists(p):
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                return None
-        return None
-
-    def _save_cache(self, timeframe: str, data: Dict[str, Any]) -> None:
-        p = self._cache_path(timeframe)
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # (timeframe, seed) 단위 캐시
+        self.cache = DocCache(os.path.join(self.cache_dir, "doc_cache.sqlite3"))
+        self._migrate_legacy_cache()
+        # 만료된 Trends 엔트리 정리
+        self.cache.purge(self.cache_ttl_s, source=self.name)
+
+    def _migrate_legacy_cache(self) -> None:
+        """예전 trends_related_{day}_{timeframe}.json 파일을 (timeframe, seed) 캐시로 옮긴다."""
+        for m, data, mtime in iter_legacy_json(self.cache_dir, r"trends_related_\d{4}-\d{2}-\d{2}_(.+)\.json"):
+            if isinstance(data, dict):
+                self.cache.put_many(self.name, m.group(1), data, fetched_at=mtime, replace=False)
 
     def _docs_from_cached(self, cached: Dict[str, Any], timeframe: str) -> List[SignalDoc]:
         docs: List[SignalDoc] = []
@@ -56,68 +58,109 @@ class GoogleTrendsSource(SignalSource):
                         text=kw,
                         url="",
                         published_at=None,
-                        meta={"seed": seed, "kind": kind, "value": item.get("value"), "timeframe": timeframe}
+                        # value 는 항목마다 달라 공유(intern)해 봐야 해시 비용만 든다 → 문서별 읽기 전용 매핑
+                        meta=MappingProxyType({"seed": seed, "kind": kind, "value": item.get("value"),
+                                               "timeframe": timeframe}),
                     ))
         return docs
 
-    def fetch(self, queries: List[str], recency_days: int) -> List[SignalDoc]:
-        timeframe = "today 1-m" if recency_days <= 30 else "today 3-m"
+    @property
+    def pytrends(self):
+        if self._pytrends is None:
+            from pytrends.request import TrendReq
+            self._pytrends = TrendReq(hl=self.hl, tz=self.tz)
+        return self._pytrends
 
-        cached = self._load_cache(timeframe)
-        if cached is not None:
-            return self._docs_from_cached(cached, timeframe)
+    def _related_for_batch(self, batch: List[str], timeframe: str) -> Dict[str, Any]:
+        self.pytrends.build_payload(batch, cat=0, timeframe=timeframe, geo="KR", gprop="")
+        related = self.pytrends.related_queries() or {}
 
-        docs: List[SignalDoc] = []
         collected: Dict[str, Any] = {}
+        for q in batch:
+            pack = related.get(q) or {}
+            out = {"top": [], "rising": []}
+            for kind in ("top", "rising"):
+                df = pack.get(kind)
+                if df is None or df.empty:
+                    continue
+                for _, row in df.head(10).iterrows():
+                    kw = str(row.get("query", "")).strip()
+                    val = row.get("value", None)
+                    if kw:
+                        out[kind].append({"query": kw, "value": val})
+            collected[q] = out
+        return collected
+
+    def fetch(self, queries: List[str], recency_days: int) -> List[SignalDoc]:
+        timeframe = "today 1-m" if recency_days <= 30 else "today 3-m"
 
         safe_queries = queries[:40]
-        batch_size = 1
 
-        for i in range(0, len(safe_queries), batch_size):
-            batch = safe_queries[i:i + batch_size]
+        # 캐시에 있는(TTL 이내) seed 는 재사용하고, 나머지 seed 만 호출
+        # → 중간에 끊긴 실행은 다음 실행에서 남은 seed 부터 이어서 수집
+        cached = self.cache.get_many(self.name, timeframe, safe_queries, self.cache_ttl_s)
+        docs: List[SignalDoc] = self._docs_from_cached(
+            {q: cached[q] for q in safe_queries if q in cached}, timeframe
+        )
+
+        pending = [q for q in safe_queries if q not in cached]
+        METRICS.inc("cache_hits", len(safe_queries) - len(pending), source=self.name, endpoint=timeframe)
+        METRICS.inc("cache_misses", len(pending), source=self.name, endpoint=timeframe)
+        if not pending:
+            return docs
+
+        from pytrends import exceptions as pytrends_ex
+
+        batches = deque(pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size))
+
+        while batches:
+            if self.deadline.expired():
+                # 예산 끝: 남은 seed 는 다음 실행에서 (받은 seed 는 이미 캐시에 있음)
+                self.truncated = True
+                break
+            batch = batches.popleft()
+            got: Dict[str, Any] | None = None
+            throttled = False
 
             max_retry = 5
             for attempt in range(max_retry):
+                METRICS.inc("trends_requests", batch_size=len(batch))
                 try:
-                    self.pytrends.build_payload(batch, cat=0, timeframe=timeframe, geo="KR", gprop="")
-                    related = self.pytrends.related_queries()
-
-                    for q in batch:
-                        pack = related.get(q, {})
-                        out = {"top": [], "rising": []}
-                        for kind in ("top", "rising"):
-                            df = pack.get(kind)
-                            if df is None or df.empty:
-                                continue
-                            for _, row in df.head(10).iterrows():
-                                kw = str(row.get("query", "")).strip()
-                                val = row.get("value", None)
-                                if kw:
-                                    out[kind].append({"query": kw, "value": val})
-                        collected[q] = out
-
-                        for kind in ("top", "rising"):
-                            for item in out[kind]:
-                                docs.append(SignalDoc(
-                                    source=self.name,
-                                    title=f"[{q}] related_{kind}: {item['query']}",
-                                    text=item["query"],
-                                    url="",
-                                    published_at=None,
-                                    meta={"seed": q, "kind": kind, "value": item.get("value"), "timeframe": timeframe}
-                                ))
-
+                    # pytrends 는 자체 세션을 쓰지만 호스트 동시성/속도 한도와 브레이커는 공용 transport 로
+                    with self.transport.slot(TRENDS_HOST), METRICS.span("trends_request"):
+                        got = self._related_for_batch(batch, timeframe)
+                    self.transport.record(TRENDS_HOST, ok=True)
+                    break
+                except CircuitOpenError:
+                    throttled = True
                     break
-
                 except pytrends_ex.TooManyRequestsError:
-                    sleep_s = (2 ** attempt) + random.uniform(0.5, 1.5)
-                    time.sleep(sleep_s)
+                    METRICS.inc("trends_retries", reason=429)
                     if attempt == max_retry - 1:
-                        return []
+                        throttled = True
+                        break
+                    if not self.deadline.sleep((2 ** attempt) + random.uniform(0.5, 1.5)):
+                        self.truncated = throttled = True
+                        break
                 except Exception:
-                    return []
+                    METRICS.inc("trends_failures", batch_size=len(batch))
+                    self.transport.record(TRENDS_HOST, ok=False)
+                    # 여러 키워드 묶음이 실패하면 1개씩 다시 시도, 단일 키워드면 건너뜀
+                    if len(batch) > 1:
+                        batches.extendleft([q] for q in reversed(batch))
+                    break
+
+            if throttled:
+                # 계속 429(또는 브레이커 차단)면 이번 실행은 여기까지. 이미 받은 seed 는 캐시에 남아 있다.
+                break
+
+            if got:
+                # seed 단위 체크포인트
+                self.cache.put_many(self.name, timeframe, got)
+                docs.extend(self._docs_from_cached(got, timeframe))
 
-            time.sleep(random.uniform(1.0, 2.0))
+            if batches and not self.deadline.sleep(random.uniform(1.0, 2.0)):
+                self.truncated = True
+                break
 
-        self._save_cache(timeframe, collected)
         return docs
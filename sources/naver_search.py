@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-import json
 import os
 import random
 import re
-import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from html import unescape
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
 
-import requests
+from metrics import METRICS
 
-from .base import SignalSource, SignalDoc
+from .base import SignalSource, SignalDoc, shared_meta
+from .cache import DocCache, iter_legacy_json
+from .transport import HttpTransport, get_transport
+
+API_BASE = "https://openapi.naver.com/v1/search"
+
+ENDPOINTS: List[Tuple[str, str]] = [
+    ("cafearticle", "naver_cafearticle"),
+    ("news", "naver_news"),
+    ("blog", "naver_blog"),
+]
 
 
 def _strip_tags(s: str) -> str:
@@ -33,6 +44,21 @@ def _parse_naver_pubdate(s: str) -> Optional[datetime]:
         return None
 
 
+@lru_cache(maxsize=1024)
+def _parse_naver_postdate(s: str) -> Optional[datetime]:
+    # 블로그 검색 결과는 pubDate 대신 postdate(예: "20191203")만 준다. 날짜 단위라 종류가 적어 캐시
+    if not s:
+        return None
+    try:
+        return datetime.strptime(s, "%Y%m%d").replace(tzinfo=timezone(timedelta(hours=9))).astimezone()
+    except Exception:
+        return None
+
+
+def _item_published(it: Dict[str, Any]) -> Optional[datetime]:
+    return _parse_naver_pubdate(it.get("pubDate", "")) or _parse_naver_postdate(it.get("postdate", ""))
+
+
 class NaverSearchSource(SignalSource):
     """
     네이버 검색 API 기반 (비로그인)
@@ -40,6 +66,8 @@ class NaverSearchSource(SignalSource):
     - 뉴스:   /v1/search/news.json
     - 블로그: /v1/search/blog.json
     """
+    name = "naver_search"
+
     def __init__(
         self,
         client_id: str,
@@ -48,67 +76,82 @@ class NaverSearchSource(SignalSource):
         cache_dir: str = ".cache",
         max_queries: int = 25,
         sleep_range: tuple[float, float] = (0.25, 0.55),
+        workers: int = 8,
+        qps: float = 10.0,
+        cache_ttl_s: float = 6 * 3600,
+        max_pages: int = 5,
+        planner=None,
+        transport: Optional[HttpTransport] = None,
+        api_base: str = API_BASE,
     ):
+        """
+        workers > 1 이면 쿼리×엔드포인트 그리드를 스레드 풀로 동시에 호출한다.
+        이때 호출 간 sleep 대신 transport 의 호스트 단위 한도(동시 workers, 초당 qps)로 속도를 맞춘다.
+        workers <= 1 이면 기존처럼 순차 호출 + sleep_range.
+        캐시는 (엔드포인트, 쿼리) 단위이며 cache_ttl_s 가 지난 쿼리만 다시 호출한다.
+        페이지는 recency_days 안의 결과가 이어지는 동안만 start 를 넘기며 최대 max_pages 까지 본다.
+        planner(analysis.planner.QueryPlanner)를 주면 max_queries 개를 쿼리별 수확 기록으로 고른다.
+        """
         self.client_id = client_id
         self.client_secret = client_secret
         self.display = max(1, min(display, 100))
         self.cache_dir = cache_dir
         self.max_queries = max_queries
         self.sleep_range = sleep_range
+        self.workers = max(1, int(workers))
+        self.cache_ttl_s = cache_ttl_s
+        self.max_pages = max(1, int(max_pages))
+        self.planner = planner
         os.makedirs(self.cache_dir, exist_ok=True)
+        self.cache = DocCache(os.path.join(self.cache_dir, "doc_cache.sqlite3"))
+        self._migrate_legacy_cache()
+        # TTL 이 지난 엔트리는 다시 읽히지 않으므로 열 때 정리(상주/cron 모드에서 파일이 계속 커지지 않게)
+        self.cache.purge(self.cache_ttl_s, source=self.name)
 
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.api_base = api_base.rstrip("/")
+        self.transport = transport or get_transport()
+        # 동시 호출 수/QPS 는 호스트 단위 한도로 (다른 컴포넌트와 커넥션 풀 공유)
+        self.transport.configure_host(urlsplit(self.api_base).hostname or "", concurrency=self.workers, qps=qps)
+        self._headers = {
             "X-Naver-Client-Id": self.client_id,
             "X-Naver-Client-Secret": self.client_secret,
-            "User-Agent": "trend-messenger/1.0"
-        })
-
-    def _cache_path(self, kind: str, recency_days: int) -> str:
-        day = datetime.now().strftime("%Y-%m-%d")
-        return os.path.join(self.cache_dir, f"naver_{kind}_{day}_{recency_days}.json")
-
-    def _load_cache(self, kind: str, recency_days: int) -> Any | None:
-        p = self._cache_path(kind, recency_days)
-        if os.path.exists(p):
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                return None
-        return None
+        }
+
+    @staticmethod
+    def _cache_endpoint(endpoint: str, recency_days: int) -> str:
+        return f"{endpoint}:{recency_days}d"
 
-    def _save_cache(self, kind: str, recency_days: int, data: Any) -> None:
-        p = self._cache_path(kind, recency_days)
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def _migrate_legacy_cache(self) -> None:
+        """예전 naver_{source}_{day}_{recency}.json 파일을 (엔드포인트, 쿼리) 캐시로 옮긴다."""
+        legacy = iter_legacy_json(self.cache_dir, r"naver_naver_(cafearticle|news|blog)_\d{4}-\d{2}-\d{2}_(\d+)\.json")
+        for m, items, mtime in legacy:
+            endpoint, recency_days = m.group(1), int(m.group(2))
+            by_query: Dict[str, List[Dict[str, Any]]] = {}
+            for it in items if isinstance(items, list) else []:
+                if isinstance(it, dict):
+                    by_query.setdefault(it.get("query", ""), []).append({**it, "endpoint": endpoint})
+            self.cache.put_many(self.name, self._cache_endpoint(endpoint, recency_days), by_query,
+                                fetched_at=mtime, replace=False)
 
-    def _call(self, endpoint: str, query: str, sort: str = "date") -> Dict[str, Any] | None:
-        url = f"https://openapi.naver.com/v1/search/{endpoint}.json"
+    def _call(self, endpoint: str, query: str, sort: str = "date", start: int = 1) -> Dict[str, Any] | None:
+        url = f"{self.api_base}/{endpoint}.json"
         params = {
             "query": query,
             "display": self.display,
-            "start": 1,
+            "start": start,
             "sort": sort,  # date|sim
         }
 
-        max_retry = 5
-        for attempt in range(max_retry):
-            try:
-                r = self.session.get(url, params=params, timeout=10)
-                if r.status_code == 200:
-                    return r.json()
-
-                # 과호출/서버오류 대응
-                if r.status_code in (429, 500, 502, 503, 504):
-                    time.sleep((2 ** attempt) + random.uniform(0.2, 0.8))
-                    continue
-
-                # 그 외는 실패로 처리
-                return None
-
-            except requests.RequestException:
-                time.sleep((2 ** attempt) + random.uniform(0.2, 0.8))
+        # 재시도/백오프/호스트 동시성·QPS/브레이커는 공용 transport 가 요청 단위로 처리
+        r = self.transport.request("GET", url, params=params, headers=self._headers, timeout=10,
+                                   deadline=self.deadline)
+        if r is None:
+            METRICS.inc("naver_failures", endpoint=endpoint)
+            return None
+        METRICS.inc("naver_requests", endpoint=endpoint, status=r.status_code)
+        if r.status_code == 200:
+            return r.json()
+        METRICS.inc("naver_failures", endpoint=endpoint)
         return None
 
     def fetch(self, queries: List[str], recency_days: int) -> List[SignalDoc]:
@@ -118,74 +161,178 @@ class NaverSearchSource(SignalSource):
         """
         # 단순히 앞에서부터 자르되, 너무 짧은 쿼리는 뒤로 밀기
         qs = sorted(queries, key=lambda x: (len(x) < 6, -len(x)))
-        qs = qs[: self.max_queries]
+        if self.planner is not None:
+            # 수확 기록이 있으면 예산(max_queries) 안에서 수확 좋은 쿼리 위주 + 일부 탐색
+            qs = self.planner.plan(self.name, qs, self.max_queries)
+        else:
+            qs = qs[: self.max_queries]
 
-        docs: List[SignalDoc] = []
+        # (엔드포인트, 쿼리) 단위 캐시: 없거나 TTL 지난 쿼리만 호출
+        cached: Dict[str, Dict[str, Any]] = {}
+        grid: List[Tuple[str, str]] = []
+        for endpoint, _ in ENDPOINTS:
+            ck = self._cache_endpoint(endpoint, recency_days)
+            cached[endpoint] = self.cache.get_many(self.name, ck, qs, self.cache_ttl_s)
+            grid.extend((endpoint, q) for q in qs if q not in cached[endpoint])
+            METRICS.inc("cache_hits", len(cached[endpoint]), source=self.name, endpoint=endpoint)
+            METRICS.inc("cache_misses", len(qs) - len(cached[endpoint]), source=self.name, endpoint=endpoint)
 
-        # 카페글 / 뉴스 / 블로그 각각 캐시 사용
-        for endpoint, source_name in [
-            ("cafearticle", "naver_cafearticle"),
-            ("news", "naver_news"),
-            ("blog", "naver_blog"),
-        ]:
-            cached = self._load_cache(source_name, recency_days)
-            if cached is not None:
-                docs.extend(self._docs_from_cached(source_name, cached))
-                continue
+        cutoff = datetime.now(timezone.utc) - timedelta(days=recency_days)
+        results = self._call_grid(grid, cutoff) if grid else {}
 
-            collected = []
+        docs: List[SignalDoc] = []
+        called: Dict[str, Tuple[int, List[str]]] = {}  # 쿼리 → (호출 수, 받은 링크)
+        failed = set()  # 호출이 하나라도 실패한(오류/브레이커 차단) 쿼리
+        for endpoint, source_name in ENDPOINTS:
+            fresh: Dict[str, Any] = {}
             for q in qs:
-                data = self._call(endpoint, q, sort="date")
-                time.sleep(random.uniform(*self.sleep_range))
+                if q in cached[endpoint]:
+                    records = cached[endpoint][q]
+                elif (endpoint, q) not in results:
+                    continue
+                else:
+                    data = results[(endpoint, q)]
+                    calls, links = called.get(q, (0, []))
+                    if data is None:
+                        # 호출 실패는 캐시하지 않는다(다음 실행에서 재시도)
+                        called[q] = (calls + 1, links)
+                        failed.add(q)
+                        continue
+                    records = self._records_from_items(endpoint, q, data.get("items", []))
+                    fresh[q] = records
+                    called[q] = (calls + data.get("pages", 1), links + [r["link"] for r in records])
+                docs.extend(self._docs_from_cached(source_name, records, cutoff))
+
+            self.cache.put_many(self.name, self._cache_endpoint(endpoint, recency_days), fresh)
 
-                if not data or "items" not in data:
+        if self.planner is not None:
+            # 실패/예산 초과로 덜 받은 결과는 쿼리 수확이 아니라 장애 탓이므로 기록하지 않는다(EWMA 그대로)
+            skipped = set(called) if self.truncated else failed
+            for q, (calls, links) in called.items():
+                if q in skipped:
                     continue
+                new = self.planner.observe(self.name, q, calls, links)
+                METRICS.inc("planner_new_docs", new, source=self.name)
+            METRICS.inc("planner_skipped", len(skipped), source=self.name)
+            METRICS.inc("planner_calls", sum(c for c, _ in called.values()), source=self.name)
+        return docs
 
-                for it in data.get("items", []):
-                    title = _strip_tags(it.get("title", ""))
-                    desc = _strip_tags(it.get("description", ""))
-                    link = it.get("link", "") or it.get("originallink", "")
-                    pub = _parse_naver_pubdate(it.get("pubDate", ""))
+    def _search_recent(self, endpoint: str, query: str, cutoff: datetime) -> Dict[str, Any] | None:
+        """
+        date 정렬 결과를 start 를 넘기며 모은다.
+        - 페이지에 cutoff 보다 오래된 항목이 나오면 그 페이지까지만 (오래된 항목은 버림)
+        - 날짜가 없는 엔드포인트(카페글)는 최신성 판단이 안 되므로 첫 페이지만
+        - 네이버 제한: start <= 1000
+        """
+        items: List[Dict[str, Any]] = []
+        start = 1
+        for page in range(self.max_pages):
+            if start > 1000:
+                break
+            if page > 0 and self.workers <= 1:
+                # 순차 모드는 페이지 사이에도 기존처럼 쉬어 준다(동시 모드는 토큰 버킷이 담당)
+                self.deadline.sleep(random.uniform(*self.sleep_range))
+            if self.deadline.expired():
+                # 예산 끝: 여기까지 모은 페이지만 (첫 페이지 전이면 호출 안 한 것으로)
+                self.truncated = True
+                return {"items": items, "pages": page} if page > 0 else None
+            data = self._call(endpoint, query, sort="date", start=start)
+            if data is None:
+                # 첫 페이지 실패는 호출 실패로, 이후 페이지 실패는 여기까지 모은 것으로
+                return {"items": items, "pages": page + 1} if page > 0 else None
+            METRICS.inc("naver_pages", endpoint=endpoint)
 
-                    if not title and not desc:
+            page_items = data.get("items", []) or []
+            crossed = False
+            dated = 0
+            for it in page_items:
+                pub = _item_published(it)
+                if pub is not None:
+                    dated += 1
+                    if pub < cutoff:
+                        crossed = True
+                        METRICS.inc("naver_items_too_old", endpoint=endpoint)
                         continue
+                items.append(it)
 
-                    collected.append({
-                        "query": q,
-                        "title": title,
-                        "description": desc,
-                        "link": link,
-                        "pubDate": it.get("pubDate", ""),
-                    })
-
-                    docs.append(SignalDoc(
-                        source=source_name,
-                        title=title or q,
-                        text=(title + " " + desc).strip(),
-                        url=link,
-                        published_at=pub,
-                        meta={"query": q, "endpoint": endpoint}
-                    ))
-
-            self._save_cache(source_name, recency_days, collected)
+            total = int(data.get("total", 0) or 0)
+            start += self.display
+            if crossed or not dated or len(page_items) < self.display or start > total:
+                break
 
-        return docs
+        return {"items": items, "pages": page + 1}
+
+    def _call_grid(
+        self, grid: List[Tuple[str, str]], cutoff: datetime
+    ) -> Dict[Tuple[str, str], Dict[str, Any] | None]:
+        out: Dict[Tuple[str, str], Dict[str, Any] | None] = {}
+        if self.workers <= 1:
+            for endpoint, q in grid:
+                if self.deadline.expired():
+                    self.truncated = True
+                    break
+                out[(endpoint, q)] = self._search_recent(endpoint, q, cutoff)
+                self.deadline.sleep(random.uniform(*self.sleep_range))
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="naver") as ex:
+                futures = {key: ex.submit(self._search_recent, key[0], key[1], cutoff) for key in grid}
+                out = {key: fut.result() for key, fut in futures.items()}
+        if self.deadline.expired():
+            # 예산 때문에 못 부른 호출은 실패가 아니라 '안 부름'으로 (플래너 감점/재시도 판단에서 빠지게)
+            out = {key: data for key, data in out.items() if data is not None}
+        return out
+
+    def _records_from_items(self, endpoint: str, q: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        records = []
+        for it in items:
+            title = _strip_tags(it.get("title", ""))
+            desc = _strip_tags(it.get("description", ""))
+            link = it.get("link", "") or it.get("originallink", "")
+
+            if not title and not desc:
+                continue
 
-    def _docs_from_cached(self, source_name: str, cached_items: List[Dict[str, Any]]) -> List[SignalDoc]:
+            records.append({
+                "query": q,
+                "endpoint": endpoint,
+                "title": title,
+                "description": desc,
+                "link": link,
+                "originallink": it.get("originallink", ""),
+                "pubDate": it.get("pubDate", ""),
+                "postdate": it.get("postdate", ""),
+            })
+        return records
+
+    def _docs_from_cached(
+        self,
+        source_name: str,
+        cached_items: List[Dict[str, Any]],
+        cutoff: Optional[datetime] = None,
+    ) -> List[SignalDoc]:
         docs: List[SignalDoc] = []
         for it in cached_items:
             q = it.get("query", "")
             title = it.get("title", "") or q
             desc = it.get("description", "")
             link = it.get("link", "")
-            pub = _parse_naver_pubdate(it.get("pubDate", ""))
+            pub = _item_published(it)
+            # 캐시에 있던 항목도 기간이 지났으면 버린다
+            if cutoff is not None and pub is not None and pub < cutoff:
+                continue
+
+            meta = shared_meta(query=q, endpoint=it.get("endpoint", ""))
+            orig = it.get("originallink", "")
+            if orig and orig != link:
+                # 뉴스 원문 링크는 문서마다 달라 공유하지 않는다 (교차 소스 중복 제거에 사용)
+                meta = {**meta, "originallink": orig}
 
             docs.append(SignalDoc(
                 source=source_name,
                 title=title,
-                text=(title + " " + desc).strip(),
+                description=desc,
                 url=link,
                 published_at=pub,
-                meta={"query": q, "endpoint": it.get("endpoint", "")}
+                meta=meta
             ))
         return docs
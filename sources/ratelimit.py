@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷.
+    - rate: 초당 토큰 보충량(=허용 QPS)
+    - capacity: 순간 최대 버스트
+    """
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = max(float(rate), 1e-6)
+        self.capacity = max(float(capacity if capacity is not None else rate), 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰이 생길 때까지 기다린 뒤 소비. 기다린 시간(초)을 반환."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                need = (tokens - self._tokens) / self.rate
+            time.sleep(need)
+            waited += need
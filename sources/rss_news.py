@@ -1,33 +1,189 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List
-import feedparser
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional
 
-from .base import SignalSource, SignalDoc
+from metrics import METRICS
+
+from .base import SignalSource, SignalDoc, shared_meta
+from .cache import iter_legacy_json
+from .codec import dump_records, iter_records
+from .entry_index import EntryIndex, entry_content, entry_key
+from .transport import HttpTransport, RetryPolicy, get_transport
+
+# 피드는 다음 주기에 다시 받으면 되므로 짧게만 재시도
+RSS_RETRY = RetryPolicy(max_attempts=2, backoff_base_s=0.5, backoff_max_s=2.0)
 
 class RssNewsSource(SignalSource):
     name = "rss_news"
 
-    def __init__(self, feeds: List[str]):
+    def __init__(self, feeds: List[str], cache_dir: str = ".cache", workers: int = 8,
+                 transport: Optional[HttpTransport] = None, incremental: bool = False,
+                 index_keep_days: float = 90):
+        """
+        피드는 bounded 스레드 풀로 병렬 수집한다(요청은 공용 transport: 커넥션 재사용, 호스트별 한도/브레이커).
+        피드별 ETag/Last-Modified 를 cache_dir 에 저장해 다음 실행에서 조건부 요청을 보내고,
+        304(변경 없음)면 다운로드/파싱 없이 저장해 둔 엔트리를 그대로 쓴다.
+        incremental 이면 엔트리 인덱스로 새 엔트리/내용이 바뀐 엔트리만 내보낸다.
+        이때 이전 엔트리의 기여는 호출 쪽(analysis.running.IssueState)이 보관하고,
+        결과를 반영한 뒤 commit_seen() 으로 이번 엔트리들을 '본 것'으로 기록한다.
+        """
         self.feeds = feeds
+        self.cache_dir = cache_dir
+        self.workers = max(1, int(workers))
+        self.transport = transport or get_transport()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index: Optional[EntryIndex] = None
+        if incremental:
+            self.index = EntryIndex(os.path.join(self.cache_dir, "rss_entries.sqlite3"))
+            self.index.purge(index_keep_days * 86400)
+        self._pending: Dict[int, int] = {}
+
+    def _state_path(self) -> str:
+        return os.path.join(self.cache_dir, "rss_feeds_state.rec")
+
+    def _load_state(self) -> Dict[str, Any]:
+        """피드별 상태 레코드 파일(codec.dump_records). 예전 JSON 상태 파일이 있으면 한 번 옮겨 온다."""
+        state: Dict[str, Any] = {}
+        for rec in iter_records(self._state_path()):
+            if isinstance(rec, dict) and "url" in rec:
+                state[rec.pop("url")] = rec
+        if not state:
+            for _m, legacy, _mtime in iter_legacy_json(self.cache_dir, r"rss_feeds_state\.json"):
+                if isinstance(legacy, dict):
+                    state = legacy
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        dump_records(self._state_path(), ({"url": u, **st} for u, st in state.items()))
+
+    def _fetch_feed(self, feed_url: str, prev: Dict[str, Any] | None) -> Dict[str, Any] | None:
+        prev = prev or {}
+        headers = {}
+        if prev.get("etag"):
+            headers["If-None-Match"] = prev["etag"]
+        if prev.get("modified"):
+            headers["If-Modified-Since"] = prev["modified"]
+
+        r = self.transport.request("GET", feed_url, retry=RSS_RETRY, headers=headers, timeout=20,
+                                   deadline=self.deadline)
+
+        # 304: 변경 없음 → 이전 엔트리 재사용
+        if r is not None and r.status_code == 304 and "entries" in prev:
+            METRICS.inc("rss_feeds", status=304)
+            return prev
+
+        st = None
+        if r is not None and r.status_code < 400:
+            st = self._parse_feed(r.content, etag=r.headers.get("ETag"), modified=r.headers.get("Last-Modified"))
+        if st is None:
+            # 네트워크/파싱 실패(브레이커 차단 포함): 이전 상태가 있으면 그걸 유지
+            METRICS.inc("rss_feeds", status="error")
+            return prev or None
+
+        METRICS.inc("rss_feeds", status=r.status_code)
+        return st
+
+    def _parse_feed(self, content: bytes | str, etag: str | None = None, modified: str | None = None) -> Dict[str, Any] | None:
+        # 새 본문(200)을 파싱할 때 로드한다. 모든 피드가 304/실패로 끝나는 실행에서만 import 를 피한다
+        import feedparser
+
+        d = feedparser.parse(content)
+        if getattr(d, "bozo", False) and not d.entries:
+            return None
+
+        entries = []
+        for e in d.entries[:300]:
+            published = None
+            if getattr(e, "published_parsed", None):
+                published = datetime(*e.published_parsed[:6], tzinfo=timezone.utc).isoformat()
+            entries.append({
+                "title": getattr(e, "title", ""),
+                "id": getattr(e, "id", ""),
+                "link": getattr(e, "link", ""),
+                "summary": getattr(e, "summary", "") or getattr(e, "description", ""),
+                "published": published,
+            })
+
+        return {
+            "etag": etag,
+            "modified": modified,
+            "entries": entries,
+        }
 
     def fetch(self, queries: List[str], recency_days: int) -> List[SignalDoc]:
-        docs: List[SignalDoc] = []
+        state = self._load_state()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="rss") as ex:
+            futures = [(u, ex.submit(self._fetch_feed, u, state.get(u))) for u in self.feeds]
+            results = {}
+            for feed_url, fut in futures:
+                try:
+                    results[feed_url] = fut.result()
+                except Exception:
+                    results[feed_url] = state.get(feed_url)
+        # 예산이 끝나 못 받은 피드는 이전 상태로 대신했다
+        self.truncated = self.deadline.expired()
+
+        new_state: Dict[str, Any] = {}
         for feed_url in self.feeds:
-            d = feedparser.parse(feed_url)
-            for e in d.entries[:300]:
-                title = getattr(e, "title", "")
-                link = getattr(e, "link", "")
-                summary = getattr(e, "summary", "") or getattr(e, "description", "")
-                published = None
-                if getattr(e, "published_parsed", None):
-                    published = datetime(*e.published_parsed[:6], tzinfo=timezone.utc).astimezone()
-
-                docs.append(SignalDoc(
-                    source=self.name,
-                    title=title,
-                    text=f"{title}\n{summary}",
-                    url=link,
-                    published_at=published,
-                    meta={"feed": feed_url}
-                ))
+            st = results.get(feed_url)
+            if st:
+                new_state[feed_url] = st
+        self._save_state(new_state)
+
+        if self.index is None:
+            docs: List[SignalDoc] = []
+            for feed_url, st in new_state.items():
+                docs.extend(self._docs_from_entries(feed_url, st.get("entries", [])))
+            return docs
+        return self._new_docs(new_state)
+
+    def _new_docs(self, feeds_state: Dict[str, Any]) -> List[SignalDoc]:
+        """인덱스에 없거나 내용이 바뀐 엔트리만 문서로 (meta.entry = 엔트리 키)."""
+        keyed = []
+        current: Dict[int, int] = {}
+        for feed_url, st in feeds_state.items():
+            for e in st.get("entries", []):
+                h = entry_key(e)
+                current[h] = entry_content(e)
+                keyed.append((feed_url, h, e))
+        changed = self.index.changed(current.items())
+        # 실행이 중간에 실패해도 기여를 잃지 않도록 '본 것' 기록은 호출 쪽이 반영한 뒤에(commit_seen)
+        self._pending = current
+
+        docs: List[SignalDoc] = []
+        emitted = set()
+        for feed_url, h, e in keyed:
+            if h in changed and h not in emitted:
+                emitted.add(h)
+                docs.extend(self._docs_from_entries(feed_url, [e], entry=h))
+        METRICS.set("rss_entries", len(current))
+        METRICS.set("rss_entries_new", len(emitted))
+        return docs
+
+    def commit_seen(self) -> None:
+        if self.index is not None and self._pending:
+            self.index.mark(self._pending.items())
+        self._pending = {}
+
+    def _docs_from_entries(self, feed_url: str, entries: List[Dict[str, Any]], entry: Optional[int] = None) -> List[SignalDoc]:
+        docs: List[SignalDoc] = []
+        for e in entries:
+            title = e.get("title", "")
+            published = None
+            if e.get("published"):
+                published = datetime.fromisoformat(e["published"]).astimezone()
+
+            docs.append(SignalDoc(
+                source=self.name,
+                title=title,
+                description=e.get("summary", ""),
+                sep="\n",
+                url=e.get("link", ""),
+                published_at=published,
+                # 엔트리 키는 문서마다 달라 공유 캐시에 넣지 않는다
+                meta=shared_meta(feed=feed_url) if entry is None else MappingProxyType({"feed": feed_url, "entry": entry})
+            ))
         return docs
@@ -0,0 +1,240 @@
+"""
+공용 HTTP 전송 계층. Naver / RSS / Slack(그리고 가능한 범위에서 Trends)이 같은 인스턴스를 쓴다.
+- requests.Session 하나 + keep-alive 커넥션 풀
+- 호스트별 동시 요청 상한(세마포어) + 초당 요청 상한(토큰 버킷)
+- 공통 재시도/백오프 정책 (429/5xx/네트워크 오류)
+- 호스트별 서킷 브레이커: 연속 실패가 임계치를 넘으면 그 호스트는 이번 실행 동안 호출하지 않는다
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import METRICS
+
+from .deadline import NO_DEADLINE, Deadline
+from .ratelimit import TokenBucket
+
+USER_AGENT = "trend-messenger/1.0"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """브레이커가 열린 호스트로의 호출."""
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 5
+    backoff_base_s: float = 1.0
+    backoff_max_s: float = 30.0
+    jitter_s: Tuple[float, float] = (0.2, 0.8)
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int) -> float:
+        return min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt)) + random.uniform(*self.jitter_s)
+
+
+class _Host:
+    def __init__(self, concurrency: int, qps: Optional[float], breaker_threshold: int, breaker_cooldown_s: float):
+        self.slots = threading.BoundedSemaphore(max(1, int(concurrency)))
+        self.limiter = TokenBucket(rate=qps, capacity=max(1.0, qps)) if qps else None
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown_s = breaker_cooldown_s
+        self.failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+
+    def failure(self) -> bool:
+        """연속 실패 +1. 이번에 브레이커가 열렸으면 True."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.breaker_threshold and not self.is_open():
+                self.open_until = time.monotonic() + self.breaker_cooldown_s
+                return True
+        return False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+
+
+class HttpTransport:
+    def __init__(
+        self,
+        pool_size: int = 32,
+        default_concurrency: int = 4,
+        host_concurrency: Optional[Dict[str, int]] = None,
+        host_qps: Optional[Dict[str, float]] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker_threshold: int = 5,
+        breaker_cooldown_s: float = float("inf"),
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        breaker_cooldown_s 기본값(inf)은 '이번 실행 동안' 차단. 상주 모드에서는 reset_breakers() 로 푼다.
+        """
+        self.default_concurrency = default_concurrency
+        self.host_concurrency = dict(host_concurrency or {})
+        self.host_qps = dict(host_qps or {})
+        self.retry = retry or RetryPolicy()
+        self.breaker_threshold = max(1, int(breaker_threshold))
+        self.breaker_cooldown_s = breaker_cooldown_s
+        self.sleep = sleep
+        self._hosts: Dict[str, _Host] = {}
+        self._hosts_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(1, int(pool_size)))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT})
+
+    # -----------------
+    # 호스트 상태
+    # -----------------
+    def configure_host(self, host: str, concurrency: Optional[int] = None, qps: Optional[float] = None) -> None:
+        """호스트별 한도 지정 (첫 요청 전에 불러야 적용)."""
+        with self._hosts_lock:
+            if concurrency is not None:
+                self.host_concurrency[host] = concurrency
+            if qps is not None:
+                self.host_qps[host] = qps
+            self._hosts.pop(host, None)
+
+    def _host(self, host: str) -> _Host:
+        h = self._hosts.get(host)
+        if h is None:
+            with self._hosts_lock:
+                h = self._hosts.get(host)
+                if h is None:
+                    h = self._hosts[host] = _Host(
+                        self.host_concurrency.get(host, self.default_concurrency),
+                        self.host_qps.get(host),
+                        self.breaker_threshold,
+                        self.breaker_cooldown_s,
+                    )
+        return h
+
+    def is_open(self, host: str) -> bool:
+        return self._host(host).is_open()
+
+    def reset_breakers(self) -> None:
+        with self._hosts_lock:
+            hosts = list(self._hosts.values())
+        for h in hosts:
+            h.reset()
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        """호스트 동시성/속도 한도 안에서 실행. 브레이커가 열려 있으면 CircuitOpenError."""
+        h = self._host(host)
+        if h.is_open():
+            METRICS.inc("http_short_circuits", host=host)
+            raise CircuitOpenError(f"circuit open: {host}")
+        with h.slots:
+            if h.limiter is not None:
+                h.limiter.acquire()
+            yield
+
+    def record(self, host: str, ok: bool) -> None:
+        """transport 밖에서 한 호출(pytrends 등)의 성공/실패를 브레이커에 반영."""
+        h = self._host(host)
+        if ok:
+            h.success()
+        elif h.failure():
+            METRICS.inc("http_breaker_trips", host=host)
+            print(f"[WARN] circuit open: {host} (연속 실패 {h.failures}회)")
+
+    # -----------------
+    # 요청
+    # -----------------
+    def request(
+        self,
+        method: str,
+        url: str,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float = 10.0,
+        deadline: Optional[Deadline] = None,
+        **kwargs: Any,
+    ) -> Optional[requests.Response]:
+        """
+        재시도 정책대로 요청. 재시도 대상이 아닌 응답은 그대로 돌려주고,
+        재시도를 다 써도 안 되면 마지막 응답(없으면 None). 브레이커가 열려 있으면 None.
+        deadline 이 있으면 요청 타임아웃/백오프 대기를 남은 예산으로 자르고, 예산이 끝나면 그만둔다.
+        """
+        policy = retry or self.retry
+        deadline = deadline or NO_DEADLINE
+        host = urlsplit(url).hostname or ""
+        resp: Optional[requests.Response] = None
+
+        for attempt in range(policy.max_attempts):
+            if deadline.expired():
+                METRICS.inc("http_deadline_stops", host=host)
+                return resp
+            resp = None
+            t0 = time.monotonic()
+            try:
+                with self.slot(host):
+                    t0 = time.monotonic()
+                    resp = self.session.request(method, url, timeout=deadline.cap(timeout), **kwargs)
+            except CircuitOpenError:
+                return None
+            except requests.RequestException:
+                METRICS.inc("http_requests", host=host, status="error")
+                self.record(host, ok=False)
+                reason: Any = "error"
+            else:
+                METRICS.observe("http_request_seconds", time.monotonic() - t0, host=host)
+                METRICS.inc("http_requests", host=host, status=resp.status_code)
+                if resp.status_code not in policy.retry_statuses:
+                    self.record(host, ok=True)
+                    return resp
+                # 429 는 호스트 장애가 아니라 속도 제한이므로 브레이커에 세지 않는다
+                if resp.status_code >= 500:
+                    self.record(host, ok=False)
+                reason = resp.status_code
+
+            if attempt + 1 < policy.max_attempts:
+                delay = policy.delay(attempt)
+                if delay >= deadline.remaining():
+                    METRICS.inc("http_deadline_stops", host=host)
+                    return resp
+                METRICS.inc("http_retries", host=host, reason=reason)
+                self.sleep(delay)
+        return resp
+
+
+_DEFAULT: Optional[HttpTransport] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """프로세스 공용 기본 인스턴스 (따로 주입하지 않은 컴포넌트용)."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None:
+                _DEFAULT = HttpTransport()
+    return _DEFAULT
+
+
+def set_transport(transport: HttpTransport) -> None:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        _DEFAULT = transport
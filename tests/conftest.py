@@ -0,0 +1,95 @@
+"""
+공용 픽스처: 127.0.0.1 에 띄우는 HTTP 스텁 서버.
+경로별로 응답 목록을 순서대로 돌려주고(마지막 응답은 반복), 받은 요청과 동시 처리 수를 기록한다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# (status, headers, body) 또는 요청 헤더를 받아 그걸 돌려주는 함수
+Reply = Union[Tuple[int, Dict[str, str], bytes], Callable[[Dict[str, str]], Tuple[int, Dict[str, str], bytes]]]
+
+
+class StubServer:
+    def __init__(self):
+        self.routes: Dict[str, List[Reply]] = {}
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self.delay_s = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def route(self, path: str, *replies: Reply) -> str:
+        self.routes[path] = list(replies)
+        return self.url(path)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}{path}"
+
+    def hits(self, path: str) -> int:
+        return sum(1 for _, p, _ in self.requests if p == path)
+
+    def _reply(self, method: str, path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        with self._lock:
+            self.requests.append((method, path, headers))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            replies = self.routes.get(path)
+            reply: Reply = (404, {}, b"") if not replies else (replies.pop(0) if len(replies) > 1 else replies[0])
+        try:
+            if self.delay_s:
+                time.sleep(self.delay_s)
+            return reply(headers) if callable(reply) else reply
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def start(self) -> "StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                n = int(self.headers.get("Content-Length") or 0)
+                if n:
+                    self.rfile.read(n)
+                # 라우팅/기록은 쿼리스트링을 뗀 경로로
+                path = self.path.split("?", 1)[0]
+                status, headers, body = stub._reply(self.command, path, dict(self.headers))
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer().start()
+    yield server
+    server.stop()
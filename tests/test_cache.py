@@ -0,0 +1,24 @@
+"""sources.cache.DocCache: 소스를 열 때 그 소스의 만료 엔트리만 정리."""
+from __future__ import annotations
+
+import os
+import time
+
+from sources.cache import DocCache
+from sources.naver_search import NaverSearchSource
+from sources.transport import HttpTransport
+
+
+def test_naver_source_purges_only_its_expired_entries(tmp_path):
+    path = os.path.join(str(tmp_path), "doc_cache.sqlite3")
+    old = time.time() - 10 * 3600
+    cache = DocCache(path)
+    cache.put_many("naver_search", "blog:7d", {"오래된 쿼리": []}, fetched_at=old)
+    cache.put_many("naver_search", "blog:7d", {"새 쿼리": []})
+    cache.put_many("google_trends", "now 7-d", {"시드": {}}, fetched_at=old)
+
+    NaverSearchSource("id", "secret", cache_dir=str(tmp_path), cache_ttl_s=6 * 3600, transport=HttpTransport())
+
+    assert list(cache.get_many("naver_search", "blog:7d", ["오래된 쿼리", "새 쿼리"], 1e9)) == ["새 쿼리"]
+    # TTL 이 다른 소스(Trends 24h)의 엔트리는 그대로
+    assert list(cache.get_many("google_trends", "now 7-d", ["시드"], 1e9)) == ["시드"]
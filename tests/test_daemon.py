@@ -0,0 +1,37 @@
+"""daemon.TrendDaemon: 시작 직후 첫 tick 에서 Slack 리포트를 보내는지."""
+from __future__ import annotations
+
+import pytest
+
+import daemon
+from config import AppConfig
+
+
+@pytest.fixture
+def posts(monkeypatch):
+    # 네트워크 소스 없이 tick 흐름만: 소스 0개, 리포트는 post_slack 여부만 기록
+    sent = []
+    monkeypatch.setattr(daemon, "build_sources", lambda cfg, transport=None: [])
+    monkeypatch.setattr(daemon, "report_issues", lambda cfg, profile, issues, post_slack=False, **kw: sent.append(post_slack))
+    return sent
+
+
+def make_cfg(**kwargs) -> AppConfig:
+    return AppConfig(dedup_index_path=None, history_path=None, issue_state_path=None,
+                     query_planner_path=None, metrics_dir=None, **kwargs)
+
+
+def test_first_tick_posts(posts):
+    d = daemon.TrendDaemon(make_cfg())
+    d.tick()
+    assert posts and all(posts)
+
+    posts.clear()
+    d.tick()
+    assert posts == []
+
+
+def test_slack_on_start_can_be_disabled(posts):
+    d = daemon.TrendDaemon(make_cfg(daemon_slack_on_start=False))
+    d.tick()
+    assert posts == []
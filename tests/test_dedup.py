@@ -0,0 +1,39 @@
+"""analysis.dedup: 뉴스 사본은 묶고, 같은 제목의 서로 다른 카페/블로그 글은 그대로."""
+from __future__ import annotations
+
+from analysis.dedup import dedup_docs
+from sources.base import SignalDoc
+
+SW = {"naver_cafearticle": 1.35, "naver_blog": 1.10, "naver_news": 1.05, "rss_news": 0.70}
+TITLE = "산만한 아이 집중력 훈련 방법 정리해봤어요"
+
+
+def test_same_title_community_posts_survive():
+    docs = [
+        SignalDoc("naver_cafearticle", TITLE, url="https://cafe.naver.com/momsA/101", description="우리 아이는"),
+        SignalDoc("naver_cafearticle", TITLE, url="https://cafe.naver.com/momsB/202", description="저희 애도"),
+        SignalDoc("naver_blog", TITLE, url="https://blog.naver.com/someone/303", description="블로그 후기"),
+    ]
+
+    assert dedup_docs(docs, SW) == docs
+
+
+def test_same_url_community_post_is_merged():
+    docs = [
+        SignalDoc("naver_cafearticle", TITLE, url="https://cafe.naver.com/momsA/101"),
+        SignalDoc("naver_cafearticle", TITLE, url="https://m.cafe.naver.com/momsA/101"),
+    ]
+
+    assert len(dedup_docs(docs, SW)) == 1
+
+
+def test_syndicated_news_is_merged_by_title():
+    docs = [
+        SignalDoc("naver_news", TITLE, url="https://news.example.com/a/1"),
+        SignalDoc("rss_news", TITLE, url="https://other.example.com/x"),
+    ]
+
+    out = dedup_docs(docs, SW)
+
+    assert [d.source for d in out] == ["naver_news"]
+    assert out[0].meta["dup_sources"] == ("naver_news", "rss_news")
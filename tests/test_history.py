@@ -0,0 +1,40 @@
+"""analysis.history: 직전 윈도에 없다가 다시 나온 phrase 는 비율 없이 returning."""
+from __future__ import annotations
+
+import math
+
+from analysis.history import NEW, RETURNING, RISING, IssueHistory
+from analysis.scorer import IssueItem
+from app import rising_outside_top, trend_mark
+
+DAY = 86400.0
+NOW = 1_790_000_000.0
+
+
+def item(phrase: str, score: float) -> IssueItem:
+    return IssueItem(phrase, "기타", score, [])
+
+
+def test_reemerging_phrase_is_returning_not_infinitely_rising(tmp_path):
+    h = IssueHistory(str(tmp_path / "history.sqlite3"))
+    # 30일 전: 히스토리 시작 + 재등장할 phrase 가 처음 나옴
+    h.record("p", [item("다시 나온 고민", 5.0), item("꾸준한 고민", 1.0)], ts=NOW - 30 * DAY)
+    # 직전 윈도(7~13일 전): 상승 이슈만 조금
+    h.record("p", [item("꾸준한 고민", 1.0)], ts=NOW - 10 * DAY)
+    # 최근 윈도
+    h.record("p", [item("꾸준한 고민", 3.0), item("다시 나온 고민", 4.0), item("처음 나온 고민", 2.0)], ts=NOW - DAY)
+
+    trends = h.trends("p", window_days=7, now=NOW)
+
+    back = trends["다시 나온 고민"]
+    assert back.status == RETURNING
+    assert back.previous == 0 and math.isfinite(back.velocity)
+    assert trends["꾸준한 고민"].status == RISING
+    assert trends["처음 나온 고민"].status == NEW
+
+    assert trend_mark(back) == " 🔁"
+    assert "inf" not in trend_mark(back)
+    assert [t.phrase for t in h.rising("p", now=NOW)] == ["처음 나온 고민", "꾸준한 고민", "다시 나온 고민"]
+
+    issues = [item("top", 9.0), item("다시 나온 고민", 4.0), item("꾸준한 고민", 3.0), item("처음 나온 고민", 2.0)]
+    assert [it.phrase for it in rising_outside_top(issues, trends, 1)] == ["처음 나온 고민", "꾸준한 고민", "다시 나온 고민"]
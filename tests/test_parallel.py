@@ -0,0 +1,90 @@
+"""analysis.parallel 샤딩 결과가 직렬(stream_top_issues)과 같은지: 실제로 워커 2개에 샤드를 나눠 보낸다."""
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import analysis.parallel as parallel
+from analysis.normalize import normalize_kw
+from analysis.phrases import mine_phrases
+from analysis.scorer import phrase_text, stream_top_issues
+from profiles.registry import load_profiles
+from sources.base import SignalDoc
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench", "fixtures",
+                       "naver_search.json")
+SUFFIXES = ["", "후기", "질문", "고민", "경험", "조언", "정리", "공유"]
+SOURCE_WEIGHTS = {"naver_cafearticle": 1.35, "naver_blog": 1.10, "naver_news": 1.05,
+                  "google_trends": 0.85, "rss_news": 0.70}
+NOW = datetime(2026, 1, 15, tzinfo=timezone.utc).timestamp()
+
+
+def make_docs(n: int):
+    with open(FIXTURE, encoding="utf-8") as f:
+        fx = json.load(f)
+    items = [(f"naver_{ep}", it) for ep, v in fx.items() for it in v["items"]]
+    base = datetime.fromtimestamp(NOW, timezone.utc)
+    docs = []
+    for i in range(n):
+        src, it = items[i % len(items)]
+        suffix = SUFFIXES[(i // len(items)) % len(SUFFIXES)]
+        title = f"{it['title']} {suffix}".strip()
+        published = None if i % 7 == 0 else base - timedelta(hours=i % 96)
+        if i % 11 == 0:
+            # 키워드는 같은 것끼리 모이도록 제목 전체 대신 정리된 텍스트
+            docs.append(SignalDoc("google_trends", title, text=normalize_kw(title), published_at=published,
+                                  meta={"kind": ("rising", "top")[i % 2], "value": i % 120}))
+        else:
+            docs.append(SignalDoc(src, title, url=f"{it['link']}?{i}", published_at=published,
+                                  description=it.get("description", "")))
+    return docs
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    docs = make_docs(600)
+    carry = [(normalize_kw(phrase_text(d)), "", 0.5 + (i % 5) * 0.1, f"https://carry/{i}")
+             for i, d in enumerate(docs[:40])]
+    carry += [("carry only phrase", "", 2.0, "https://carry/only")]
+    return docs, carry, next(iter(load_profiles(["*"]).values())).taxonomy_boost
+
+
+def as_tuples(issues):
+    return [(it.phrase, it.category, it.score, list(it.evidence)) for it in issues]
+
+
+@pytest.mark.parametrize("half_life_hours", [None, 24.0])
+@pytest.mark.parametrize("near_dup_threshold", [None, 0.6])
+@pytest.mark.parametrize("ngram", [False, True])
+def test_parallel_matches_serial(monkeypatch, corpus, half_life_hours, near_dup_threshold, ngram):
+    docs, carry, boost = corpus
+    monkeypatch.setattr(parallel, "MIN_SHARD_DOCS", 50)
+    assert len(parallel.shard_bounds(len(docs), 2)) > 1
+
+    phrase_of = None
+    if ngram:
+        texts = [normalize_kw(phrase_text(d)) for d in docs] + [row[0] for row in carry]
+        phrase_of = mine_phrases(texts).phrase_of
+
+    kwargs = dict(top_k=50, evidence_cap=5, near_dup_threshold=near_dup_threshold,
+                  half_life_hours=half_life_hours, phrase_of=phrase_of, carry=carry, now=NOW)
+    serial = stream_top_issues(docs, boost, SOURCE_WEIGHTS, **kwargs)
+    sharded = parallel.build_issues_parallel(docs, boost, SOURCE_WEIGHTS, workers=2, **kwargs)
+
+    assert serial
+    assert as_tuples(sharded) == as_tuples(serial)
+
+
+def test_carry_is_merged(monkeypatch, corpus):
+    docs, carry, boost = corpus
+    monkeypatch.setattr(parallel, "MIN_SHARD_DOCS", 50)
+
+    with_carry = parallel.build_issues_parallel(docs, boost, SOURCE_WEIGHTS, workers=2, top_k=1000,
+                                                carry=carry, now=NOW)
+    without = parallel.build_issues_parallel(docs, boost, SOURCE_WEIGHTS, workers=2, top_k=1000, now=NOW)
+
+    assert "carry only phrase" in {it.phrase for it in with_carry}
+    assert "carry only phrase" not in {it.phrase for it in without}
@@ -0,0 +1,50 @@
+"""QueryPlanner 수확 기록: 호출 실패/예산 초과로 덜 받은 쿼리는 EWMA 를 건드리지 않는다."""
+from __future__ import annotations
+
+import json
+
+from analysis.planner import QueryPlanner
+from sources.naver_search import NaverSearchSource
+from sources.transport import HttpTransport, RetryPolicy
+
+QUERY = "아이 집중력 훈련"
+
+
+def page(n: int) -> bytes:
+    items = [{"title": f"글 {i}", "link": f"https://cafe.naver.com/c/{i}", "description": "d"} for i in range(n)]
+    return json.dumps({"total": n, "items": items}).encode("utf-8")
+
+
+def make_source(stub, tmp_path, planner):
+    t = HttpTransport(retry=RetryPolicy(max_attempts=1), breaker_threshold=100, sleep=lambda s: None)
+    return NaverSearchSource("id", "secret", cache_dir=str(tmp_path / "cache"), max_queries=1, workers=2,
+                             planner=planner, transport=t, api_base=stub.url("/v1/search"))
+
+
+def route_all(stub, cafe):
+    stub.route("/v1/search/cafearticle.json", cafe)
+    stub.route("/v1/search/news.json", (200, {}, page(0)))
+    stub.route("/v1/search/blog.json", (200, {}, page(0)))
+
+
+def test_failed_query_is_not_observed(stub, tmp_path):
+    planner = QueryPlanner(str(tmp_path / "planner.sqlite3"))
+    planner.observe("naver_search", QUERY, 1, [f"https://cafe.naver.com/c/{i}" for i in range(5)])
+    before = planner.stats("naver_search")[QUERY]
+
+    route_all(stub, (503, {}, b""))
+    make_source(stub, tmp_path, planner).fetch([QUERY], 7)
+
+    after = planner.stats("naver_search")[QUERY]
+    assert (after.runs, after.ewma_new) == (before.runs, before.ewma_new)
+
+
+def test_successful_query_is_observed(stub, tmp_path):
+    planner = QueryPlanner(str(tmp_path / "planner.sqlite3"))
+
+    route_all(stub, (200, {}, page(3)))
+    docs = make_source(stub, tmp_path, planner).fetch([QUERY], 7)
+
+    assert len(docs) == 3
+    st = planner.stats("naver_search")[QUERY]
+    assert st.runs == 1 and st.new_docs == 3
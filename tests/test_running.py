@@ -0,0 +1,32 @@
+"""analysis.running: 중복 제거로 다른 문서에 묶인 증분 엔트리의 기여 보관."""
+from __future__ import annotations
+
+from types import MappingProxyType
+
+from analysis.dedup import dedup_docs
+from analysis.running import IssueState
+from sources.base import SignalDoc
+
+SW = {"naver_news": 1.05, "rss_news": 0.7}
+TITLE = "산만한 아이 집중력 훈련 방법 정리해봤어요"
+
+
+def rss(url: str, entry: int) -> SignalDoc:
+    return SignalDoc("rss_news", TITLE, url=url, meta=MappingProxyType({"feed": "f", "entry": entry}))
+
+
+def test_dup_entries_keep_contribution_once(tmp_path):
+    naver = SignalDoc("naver_news", TITLE, url="https://news.example.com/a/1")
+    docs = dedup_docs([naver, rss("https://news.example.com/a/1?utm_source=rss", 1),
+                       rss("https://other.example.com/x", 2)], SW)
+
+    assert [d.source for d in docs] == ["naver_news"]
+    assert docs[0].meta["dup_entries"] == (1, 2)
+
+    state = IssueState(str(tmp_path / "state.sqlite3"))
+    assert state.absorb(docs, SW) == 2
+
+    # 다음 실행: 네이버 쪽 사본이 안 들어오고 엔트리도 그대로(새로 안 나옴) → 한 번만 이어받는다
+    rows = state.carry(7 * 86400)
+    assert len(rows) == 1
+    assert rows[0][3] == "https://news.example.com/a/1"
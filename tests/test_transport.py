@@ -0,0 +1,164 @@
+"""sources.transport 재시도/브레이커/호스트 한도와 이를 쓰는 RSS 조건부 요청, Slack 재시도."""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sources.rss_news import RssNewsSource
+from sources.transport import HttpTransport, RetryPolicy
+
+HOST = "127.0.0.1"
+OK = (200, {}, b"ok")
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>first</title><link>http://example.com/1</link><guid>1</guid></item>
+<item><title>second</title><link>http://example.com/2</link><guid>2</guid></item>
+</channel></rss>"""
+
+
+def make_transport(**kwargs) -> HttpTransport:
+    """백오프 대기는 실제로 자지 않고 기록만."""
+    sleeps = []
+    kwargs.setdefault("retry", RetryPolicy(max_attempts=4, jitter_s=(0.0, 0.0)))
+    t = HttpTransport(sleep=sleeps.append, **kwargs)
+    t.sleeps = sleeps
+    return t
+
+
+def test_retries_429_and_5xx_with_backoff(stub):
+    url = stub.route("/r", (429, {}, b""), (503, {}, b""), OK)
+    t = make_transport()
+
+    r = t.request("GET", url)
+
+    assert r.status_code == 200
+    assert stub.hits("/r") == 3
+    assert t.sleeps == [1.0, 2.0]
+
+
+def test_gives_up_after_max_attempts_with_last_response(stub):
+    url = stub.route("/r", (502, {}, b""))
+    t = make_transport(retry=RetryPolicy(max_attempts=3, jitter_s=(0.0, 0.0)), breaker_threshold=100)
+
+    r = t.request("GET", url)
+
+    assert r.status_code == 502
+    assert stub.hits("/r") == 3
+    assert len(t.sleeps) == 2
+
+
+def test_non_retry_status_is_returned_immediately(stub):
+    url = stub.route("/r", (404, {}, b""))
+    t = make_transport()
+
+    assert t.request("GET", url).status_code == 404
+    assert stub.hits("/r") == 1
+    assert t.sleeps == []
+
+
+def test_breaker_trips_then_short_circuits(stub):
+    url = stub.route("/r", (500, {}, b""))
+    t = make_transport(retry=RetryPolicy(max_attempts=1), breaker_threshold=2)
+
+    assert t.request("GET", url).status_code == 500
+    assert not t.is_open(HOST)
+    assert t.request("GET", url).status_code == 500
+    assert t.is_open(HOST)
+
+    # 열린 뒤에는 서버까지 가지 않는다
+    assert t.request("GET", url) is None
+    assert stub.hits("/r") == 2
+
+    stub.route("/r", OK)
+    t.reset_breakers()
+    assert t.request("GET", url).status_code == 200
+
+
+def test_429_does_not_trip_breaker(stub):
+    url = stub.route("/r", (429, {}, b""))
+    t = make_transport(retry=RetryPolicy(max_attempts=1), breaker_threshold=1)
+
+    for _ in range(3):
+        assert t.request("GET", url).status_code == 429
+    assert not t.is_open(HOST)
+    assert stub.hits("/r") == 3
+
+
+def test_success_resets_failure_count(stub):
+    url = stub.route("/r", (500, {}, b""), OK, (500, {}, b""), OK)
+    t = make_transport(retry=RetryPolicy(max_attempts=1), breaker_threshold=2)
+
+    for _ in range(4):
+        t.request("GET", url)
+    assert not t.is_open(HOST)
+
+
+def test_per_host_concurrency_limit(stub):
+    url = stub.route("/r", OK)
+    stub.delay_s = 0.1
+    t = make_transport()
+    t.configure_host(HOST, concurrency=2)
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        codes = list(ex.map(lambda _: t.request("GET", url).status_code, range(8)))
+
+    assert codes == [200] * 8
+    assert stub.max_in_flight == 2
+
+
+def test_per_host_qps_limit(stub):
+    url = stub.route("/r", OK)
+    t = make_transport()
+    # 버스트 5 를 쓰고 나면 이후 5건은 0.2초 간격
+    t.configure_host(HOST, qps=5)
+
+    t0 = time.monotonic()
+    for _ in range(10):
+        assert t.request("GET", url).status_code == 200
+    elapsed = time.monotonic() - t0
+
+    assert elapsed >= 0.8
+    assert stub.hits("/r") == 10
+
+
+def test_rss_conditional_get_reuses_entries_on_304(stub, tmp_path):
+    def feed(headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return 200, {"ETag": '"v1"', "Content-Type": "application/rss+xml"}, RSS
+
+    url = stub.route("/feed", feed)
+    src = RssNewsSource([url], cache_dir=str(tmp_path), workers=1, transport=make_transport())
+
+    first = [d.title for d in src.fetch([], 7)]
+    second = [d.title for d in src.fetch([], 7)]
+
+    assert first == ["first", "second"]
+    assert second == first
+    (_, _, h1), (_, _, h2) = stub.requests
+    assert "If-None-Match" not in h1
+    assert h2.get("If-None-Match") == '"v1"'
+
+
+def test_slack_post_retries_with_slack_policy(stub):
+    import app
+
+    url = stub.route("/hook", (503, {}, b""), (200, {}, b"ok"))
+    t = make_transport()
+
+    assert app.post_to_slack(url, "hello", transport=t) is True
+    assert stub.hits("/hook") == 2
+    # SLACK_RETRY 의 백오프(기본 정책이 아니라)
+    assert len(t.sleeps) == 1
+    assert app.SLACK_RETRY.backoff_base_s <= t.sleeps[0] <= app.SLACK_RETRY.backoff_max_s
+
+
+def test_slack_post_gives_up_after_slack_attempts(stub):
+    import app
+
+    url = stub.route("/hook", (500, {}, b""))
+    t = make_transport(breaker_threshold=100)
+
+    assert app.post_to_slack(url, "hello", transport=t) is False
+    assert stub.hits("/hook") == app.SLACK_RETRY.max_attempts